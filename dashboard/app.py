@@ -108,8 +108,9 @@ def render_sidebar():
     
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 📅 สถานะระบบ")
-    st.sidebar.markdown(f"**วันที่:** {datetime.now().strftime('%d/%m/%Y')}")
-    st.sidebar.markdown(f"**เวลา:** {datetime.now().strftime('%H:%M:%S')}")
+    now = datetime.now()
+    st.sidebar.markdown(f"**วันที่:** {now.strftime('%d/%m/%Y')}")
+    st.sidebar.markdown(f"**เวลา:** {now.strftime('%H:%M:%S')}")
     
     return page
 
@@ -133,23 +134,23 @@ def render_home_page():
         col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
-            total_videos = video_repo.count()
+            total_videos = video_repo.count_estimate()
             st.metric("📹 วิดีโอทั้งหมด", total_videos)
         
         with col2:
-            total_metrics = metric_repo.count()
+            total_metrics = metric_repo.count_estimate()
             st.metric("📊 Daily Metrics", f"{total_metrics:,}")
         
         with col3:
-            total_ideas = idea_repo.count()
+            total_ideas = idea_repo.count_estimate()
             st.metric("💡 ไอเดียทั้งหมด", total_ideas)
         
         with col4:
-            total_research = research_repo.count()
+            total_research = research_repo.count_estimate()
             st.metric("🔬 Research Items", total_research)
         
         with col5:
-            total_rules = rule_repo.count()
+            total_rules = rule_repo.count_estimate()
             st.metric("📖 Playbook Rules", total_rules)
         
         st.markdown("---")
@@ -211,8 +212,8 @@ def render_youtube_analytics_page():
         metric_repo = DailyMetricRepository(session)
         
         # ตรวจสอบว่ามีข้อมูลหรือไม่
-        total_videos = video_repo.count()
-        total_metrics = metric_repo.count()
+        total_videos = video_repo.count_estimate()
+        total_metrics = metric_repo.count_estimate()
         
         if total_videos == 0:
             st.warning("⚠️ ยังไม่มีข้อมูลวิดีโอ")
@@ -324,7 +325,7 @@ def render_youtube_analytics_page():
         st.subheader("🏆 Top Videos")
         
         # ดึงข้อมูลวิดีโอ
-        videos = video_repo.get_all(limit=1000)
+        videos = video_repo.list_summaries(limit=1000)
         video_dict = {v.id: v for v in videos}
         
         # Aggregate by video
@@ -438,7 +439,7 @@ def render_trends_page():
         metric_repo = DailyMetricRepository(session)
         
         # ตรวจสอบว่ามีข้อมูลหรือไม่
-        total_metrics = metric_repo.count()
+        total_metrics = metric_repo.count_estimate()
         
         if total_metrics == 0:
             st.warning("⚠️ ยังไม่มีข้อมูล metrics")
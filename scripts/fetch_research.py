@@ -188,33 +188,35 @@ def fetch_anilist_data(
         trending = client.get_trending_anime(limit=min(limit, 20))
         progress.update(task, completed=True)
         
-        for anime in trending:
-            if not dry_run:
-                # Check if already exists
-                existing = repo.get_by_source_url(f"https://anilist.co/anime/{anime.anilist_id}")
-                if existing:
-                    continue
+        # flush ครั้งเดียวต่อแหล่ง แทน flush ทุกแถวใน repo.create()
+        with repo.batch():
+            for anime in trending:
+                if not dry_run:
+                    # Check if already exists
+                    existing = repo.get_by_source_url(f"https://anilist.co/anime/{anime.anilist_id}")
+                    if existing:
+                        continue
                 
-                repo.create(
-                    title=anime.get_best_title(),
-                    source="anilist_trending",
-                    source_url=anime.site_url,
-                    summary=anime.description[:500] if anime.description else None,
-                    content=anime.description,
-                    keywords={"genres": anime.genres, "tags": [t["name"] for t in anime.tags]},
-                    entities={"anime_titles": [anime.title_romaji, anime.title_english, anime.title_native]},
-                    linked_series=anime.to_dict(),
-                    category="anime",
-                    item_type="trending",
-                    trend_score=anime.trending / 1000 if anime.trending else 0.5,
-                    reliability_score=1.0,
-                    anilist_id=anime.anilist_id,
-                    mal_id=anime.mal_id,
-                    is_actionable=True,
-                    is_linked=True,
-                    published_at=datetime.now(),
-                )
-                items_saved += 1
+                    repo.create(
+                        title=anime.get_best_title(),
+                        source="anilist_trending",
+                        source_url=anime.site_url,
+                        summary=anime.description[:500] if anime.description else None,
+                        content=anime.description,
+                        keywords={"genres": anime.genres, "tags": [t["name"] for t in anime.tags]},
+                        entities={"anime_titles": [anime.title_romaji, anime.title_english, anime.title_native]},
+                        linked_series=anime.to_dict(),
+                        category="anime",
+                        item_type="trending",
+                        trend_score=anime.trending / 1000 if anime.trending else 0.5,
+                        reliability_score=1.0,
+                        anilist_id=anime.anilist_id,
+                        mal_id=anime.mal_id,
+                        is_actionable=True,
+                        is_linked=True,
+                        published_at=datetime.now(),
+                    )
+                    items_saved += 1
         
         console.print(f"  [green]✅ Trending: {len(trending)} รายการ[/green]")
         
@@ -223,32 +225,33 @@ def fetch_anilist_data(
         seasonal = client.get_seasonal_anime(year, season, limit=min(limit, 30))
         progress.update(task, completed=True)
         
-        for anime in seasonal:
-            if not dry_run:
-                existing = repo.get_by_source_url(f"https://anilist.co/anime/{anime.anilist_id}")
-                if existing:
-                    continue
+        with repo.batch():
+            for anime in seasonal:
+                if not dry_run:
+                    existing = repo.get_by_source_url(f"https://anilist.co/anime/{anime.anilist_id}")
+                    if existing:
+                        continue
                 
-                repo.create(
-                    title=anime.get_best_title(),
-                    source="anilist_seasonal",
-                    source_url=anime.site_url,
-                    summary=anime.description[:500] if anime.description else None,
-                    content=anime.description,
-                    keywords={"genres": anime.genres, "season": season, "year": year},
-                    entities={"anime_titles": [anime.title_romaji, anime.title_english, anime.title_native]},
-                    linked_series=anime.to_dict(),
-                    category="anime",
-                    item_type="seasonal",
-                    trend_score=anime.popularity / 100000 if anime.popularity else 0.3,
-                    reliability_score=1.0,
-                    anilist_id=anime.anilist_id,
-                    mal_id=anime.mal_id,
-                    is_actionable=True,
-                    is_linked=True,
-                    published_at=datetime.now(),
-                )
-                items_saved += 1
+                    repo.create(
+                        title=anime.get_best_title(),
+                        source="anilist_seasonal",
+                        source_url=anime.site_url,
+                        summary=anime.description[:500] if anime.description else None,
+                        content=anime.description,
+                        keywords={"genres": anime.genres, "season": season, "year": year},
+                        entities={"anime_titles": [anime.title_romaji, anime.title_english, anime.title_native]},
+                        linked_series=anime.to_dict(),
+                        category="anime",
+                        item_type="seasonal",
+                        trend_score=anime.popularity / 100000 if anime.popularity else 0.3,
+                        reliability_score=1.0,
+                        anilist_id=anime.anilist_id,
+                        mal_id=anime.mal_id,
+                        is_actionable=True,
+                        is_linked=True,
+                        published_at=datetime.now(),
+                    )
+                    items_saved += 1
         
         console.print(f"  [green]✅ Seasonal ({season} {year}): {len(seasonal)} รายการ[/green]")
         
@@ -257,32 +260,33 @@ def fetch_anilist_data(
         top_anime = client.get_top_anime(sort_by="SCORE_DESC", limit=min(limit, 20))
         progress.update(task, completed=True)
         
-        for anime in top_anime:
-            if not dry_run:
-                existing = repo.get_by_source_url(f"https://anilist.co/anime/{anime.anilist_id}")
-                if existing:
-                    continue
+        with repo.batch():
+            for anime in top_anime:
+                if not dry_run:
+                    existing = repo.get_by_source_url(f"https://anilist.co/anime/{anime.anilist_id}")
+                    if existing:
+                        continue
                 
-                repo.create(
-                    title=anime.get_best_title(),
-                    source="anilist_top",
-                    source_url=anime.site_url,
-                    summary=anime.description[:500] if anime.description else None,
-                    content=anime.description,
-                    keywords={"genres": anime.genres, "score": anime.average_score},
-                    entities={"anime_titles": [anime.title_romaji, anime.title_english, anime.title_native]},
-                    linked_series=anime.to_dict(),
-                    category="anime",
-                    item_type="top_rated",
-                    trend_score=anime.average_score / 100 if anime.average_score else 0.5,
-                    reliability_score=1.0,
-                    anilist_id=anime.anilist_id,
-                    mal_id=anime.mal_id,
-                    is_actionable=True,
-                    is_linked=True,
-                    published_at=datetime.now(),
-                )
-                items_saved += 1
+                    repo.create(
+                        title=anime.get_best_title(),
+                        source="anilist_top",
+                        source_url=anime.site_url,
+                        summary=anime.description[:500] if anime.description else None,
+                        content=anime.description,
+                        keywords={"genres": anime.genres, "score": anime.average_score},
+                        entities={"anime_titles": [anime.title_romaji, anime.title_english, anime.title_native]},
+                        linked_series=anime.to_dict(),
+                        category="anime",
+                        item_type="top_rated",
+                        trend_score=anime.average_score / 100 if anime.average_score else 0.5,
+                        reliability_score=1.0,
+                        anilist_id=anime.anilist_id,
+                        mal_id=anime.mal_id,
+                        is_actionable=True,
+                        is_linked=True,
+                        published_at=datetime.now(),
+                    )
+                    items_saved += 1
         
         console.print(f"  [green]✅ Top Anime: {len(top_anime)} รายการ[/green]")
     
@@ -302,9 +306,11 @@ def fetch_rss_data(
     verbose: bool = False
 ) -> int:
     """ดึงข้อมูลจาก RSS feeds"""
+    from src.db.models import ResearchItem
+    
     console.print("\n[bold cyan]📰 กำลังดึงข้อมูลจาก RSS feeds...[/bold cyan]")
     
-    parser = RSSFeedParser()
+    parser = RSSFeedParser(verbose=verbose)
     repo = ResearchItemRepository(session)
     linker = EntityLinker() if link_entities else None
     items_saved = 0
@@ -323,18 +329,23 @@ def fetch_rss_data(
         return 0
     
     # Fetch from each source
+    rows = []
+    seen_urls = set()
     for source_key in source_keys:
         source_info = available_sources[source_key]
         console.print(f"\n  [cyan]📡 {source_info['name']}...[/cyan]")
         
         items = parser.fetch_source(source_key, days=days, limit=limit)
+        if not dry_run:
+            # URL ที่มีอยู่แล้วใน DB - เช็คครั้งเดียวต่อแหล่ง
+            seen_urls |= repo.get_existing_source_urls(item.link for item in items)
         
         for item in items:
             if not dry_run:
-                # Check if already exists by URL
-                existing = repo.get_by_source_url(item.link)
-                if existing:
+                # Check if already exists by URL (ใน DB หรือใน batch นี้)
+                if item.link in seen_urls:
                     continue
+                seen_urls.add(item.link)
                 
                 # Extract entities if requested
                 entities = None
@@ -348,28 +359,29 @@ def fetch_rss_data(
                         linked_series = [e.to_dict() for e in linked if e.anilist_id]
                         is_linked = bool(linked_series)
                 
-                repo.create(
-                    title=item.title,
-                    source=f"rss_{source_key}",
-                    source_url=item.link,
-                    summary=item.description,
-                    content=item.raw_text,
-                    keywords={"categories": item.categories},
-                    entities=entities,
-                    linked_series=linked_series,
-                    category="news",
-                    item_type="news",
-                    trend_score=0.5,
-                    reliability_score=item.reliability_score,
-                    is_actionable=True,
-                    is_linked=is_linked,
-                    published_at=item.published_at,
-                )
-                items_saved += 1
+                rows.append({
+                    "title": item.title,
+                    "source": f"rss_{source_key}",
+                    "source_url": item.link,
+                    "summary": item.description,
+                    "content": item.raw_text,
+                    "keywords": {"categories": item.categories},
+                    "entities": entities,
+                    "linked_series": linked_series,
+                    "category": "news",
+                    "item_type": "news",
+                    "trend_score": 0.5,
+                    "reliability_score": item.reliability_score,
+                    "is_actionable": True,
+                    "is_linked": is_linked,
+                    "published_at": item.published_at,
+                })
         
         console.print(f"    [green]✅ {len(items)} รายการ[/green]")
     
-    if not dry_run:
+    if not dry_run and rows:
+        # insert ทั้งหมดในครั้งเดียว แทนการ add ทีละ object
+        items_saved = ResearchItem.bulk_insert(session, rows)
         session.commit()
     
     return items_saved
@@ -32,6 +32,7 @@ from src.db.models import (
     RunLog,
     get_all_models,
 )
+from src.db.repository import VideoRepository
 from src.utils.config import load_config
 from src.utils.logger import setup_logger, print_banner, print_success, print_error, print_info
 
@@ -105,27 +106,30 @@ def seed_sample_data(session) -> dict:
         session.add(video)
         counts["videos"] += 1
     
-    session.flush()
+    # normalize tags ลง video_tags (get_by_tag ค้นจากตารางนี้)
+    VideoRepository(session).sync_tags({
+        video_data["youtube_id"]: video_data["tags"]["tags"] for video_data in sample_videos
+    })
     
     # Sample Daily Metrics
     videos = session.query(Video).all()
+    metric_rows = []
     for video in videos:
         for days_ago in range(30):
-            metric = DailyMetric(
-                video_id=video.id,
-                date=datetime.now().date() - timedelta(days=days_ago),
-                views=random.randint(100, 1000),
-                likes=random.randint(10, 100),
-                comments=random.randint(1, 20),
-                watch_time_minutes=random.uniform(100, 500),
-                average_view_duration=random.uniform(120, 300),
-                average_view_percentage=random.uniform(30, 70),
-                subscribers_gained=random.randint(0, 10),
-                impressions=random.randint(500, 5000),
-                impressions_ctr=random.uniform(2.0, 10.0),  # CTR เป็นเปอร์เซ็นต์
-            )
-            session.add(metric)
-            counts["daily_metrics"] += 1
+            metric_rows.append({
+                "video_id": video.id,
+                "date": datetime.now().date() - timedelta(days=days_ago),
+                "views": random.randint(100, 1000),
+                "likes": random.randint(10, 100),
+                "comments": random.randint(1, 20),
+                "watch_time_minutes": random.uniform(100, 500),
+                "average_view_duration": random.uniform(120, 300),
+                "average_view_percentage": random.uniform(30, 70),
+                "subscribers_gained": random.randint(0, 10),
+                "impressions": random.randint(500, 5000),
+                "impressions_ctr": random.uniform(2.0, 10.0),  # CTR เป็นเปอร์เซ็นต์
+            })
+    counts["daily_metrics"] += DailyMetric.bulk_insert(session, metric_rows)
     
     # Sample Research Items
     sample_research = [
@@ -269,7 +273,6 @@ def seed_sample_data(session) -> dict:
     # Sample Run Logs
     sample_runs = [
         {
-            "run_id": "daily_metrics_20240101_120000_abc123",
             "run_type": "daily_metrics_collection",
             "status": "completed",
             "started_at": datetime.now() - timedelta(hours=6),
@@ -281,7 +284,6 @@ def seed_sample_data(session) -> dict:
             "triggered_by": "scheduler",
         },
         {
-            "run_id": "weekly_analysis_20240101_090000_def456",
             "run_type": "weekly_analysis",
             "status": "completed",
             "started_at": datetime.now() - timedelta(days=1),
@@ -317,6 +319,10 @@ def show_table_info(engine) -> None:
         ("content_ideas", "เก็บไอเดียเนื้อหา", 17),
         ("playbook_rules", "เก็บกฎการปรับปรุงตัวเอง", 16),
         ("runs_log", "เก็บ log การทำงานของระบบ", 15),
+        ("tags", "ชื่อ tag ของวิดีโอ (ไม่ซ้ำกัน)", 3),
+        ("video_tags", "ความสัมพันธ์ videos <-> tags", 2),
+        ("rule_sample_videos", "วิดีโอตัวอย่างของแต่ละ playbook rule", 2),
+        ("run_stats_daily", "ยอดรวม runs_log ต่อประเภทต่อวัน", 7),
     ]
     
     for name, desc, cols in table_info:
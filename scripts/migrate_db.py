@@ -10,12 +10,23 @@ Migrations ที่รองรับ:
 - เพิ่ม impressions (Integer, nullable) ใน daily_metrics
 - เพิ่ม impressions_ctr (Float, nullable) ใน daily_metrics
 - เพิ่ม summary_th (Text, nullable) ใน research_items
+- สร้างตารางใหม่ (rebuild) ให้ timestamp columns มี DEFAULT ฝั่งฐานข้อมูล
+  และเพิ่ม generated columns (เช่น engagement_rate ใน daily_metrics)
+- สร้าง indexes ที่ประกาศใน models แต่ยังไม่มีในฐานข้อมูล และลบ indexes ที่ถูกแทนที่แล้ว
+- สร้างตารางใหม่ที่ยังไม่มี (tags, video_tags) และ backfill จาก videos.tags
+- สร้างตาราง rule_sample_videos และ backfill จาก playbook_rules.sample_videos
+- แปลง runs_log.run_id รูปแบบเดิม (เช่น "daily_metrics_20240101_120000_abc123") เป็น UUIDv7
+- บีบอัด runs_log.error_traceback ที่ยังเก็บเป็น TEXT
+- สร้าง full-text search (FTS5) ของ videos พร้อม triggers และ index ข้อมูลเดิม
+- สร้างตาราง run_stats_daily พร้อม triggers บน runs_log และคำนวณยอดรวมจาก runs_log เดิม
+- รัน ANALYZE เพื่ออัพเดทสถิติของ query planner (ใช้โดย count_estimate() ด้วย)
 """
 
 import sys
 import sqlite3
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional
 
 # เพิ่ม project root ใน path
 project_root = Path(__file__).parent.parent
@@ -48,6 +59,21 @@ def get_table_columns(cursor, table_name: str) -> list:
     return [col[1] for col in columns]
 
 
+def get_generated_columns(cursor, table_name: str) -> set:
+    """
+    ดึงชื่อ generated columns ของตาราง (PRAGMA table_info ไม่แสดง column เหล่านี้)
+    
+    Args:
+        cursor: SQLite cursor
+        table_name: ชื่อตาราง
+        
+    Returns:
+        Set ของชื่อ generated columns (hidden = 2 แบบ VIRTUAL, 3 แบบ STORED)
+    """
+    cursor.execute(f"PRAGMA table_xinfo({table_name})")
+    return {col[1] for col in cursor.fetchall() if col[6] in (2, 3)}
+
+
 def column_exists(cursor, table_name: str, column_name: str) -> bool:
     """
     ตรวจสอบว่า column มีอยู่ในตารางหรือไม่
@@ -95,6 +121,384 @@ def add_column(cursor, table_name: str, column_name: str, column_type: str, defa
         return False
 
 
+def get_column_default(cursor, table_name: str, column_name: str) -> Optional[str]:
+    """
+    ดึงค่า DEFAULT ของ column (None ถ้าไม่มี)
+    
+    Args:
+        cursor: SQLite cursor
+        table_name: ชื่อตาราง
+        column_name: ชื่อ column
+        
+    Returns:
+        DEFAULT expression ตามที่เก็บใน schema
+    """
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    for col in cursor.fetchall():
+        if col[1] == column_name:
+            return col[4]
+    return None
+
+
+def rebuild_table(cursor, table_name: str) -> bool:
+    """
+    สร้างตารางใหม่ตาม schema ใน src/db/models.py แล้วย้ายข้อมูลเดิมไป
+    
+    SQLite แก้ DEFAULT / ชนิดของ column ที่มีอยู่แล้วด้วย ALTER TABLE ไม่ได้
+    จึงต้อง: สร้างตารางใหม่ -> copy ข้อมูล -> ลบตารางเดิม -> rename -> สร้าง indexes
+    (connection ของ sqlite3 ปิด foreign_keys อยู่แล้ว การ DROP จึงไม่ cascade ไปตารางลูก)
+    
+    Args:
+        cursor: SQLite cursor
+        table_name: ชื่อตาราง
+        
+    Returns:
+        True ถ้าสำเร็จ
+    """
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex, CreateTable
+    
+    from src.db.models import Base
+    
+    dialect = sqlite.dialect()
+    table = Base.metadata.tables[table_name]
+    new_name = f"{table_name}__new"
+    create_sql = str(CreateTable(table).compile(dialect=dialect)).replace(
+        f"CREATE TABLE {table_name} (", f"CREATE TABLE {new_name} (", 1
+    )
+    
+    # generated columns คำนวณใหม่เองในตารางใหม่ - copy เฉพาะ column ปกติ
+    old_columns = set(get_table_columns(cursor, table_name))
+    columns = ", ".join(
+        c.name for c in table.columns if c.name in old_columns and c.computed is None
+    )
+    
+    cursor.execute("SAVEPOINT rebuild_table")
+    try:
+        cursor.execute(create_sql)
+        cursor.execute(f"INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {table_name}")
+        cursor.execute(f"DROP TABLE {table_name}")
+        cursor.execute(f"ALTER TABLE {new_name} RENAME TO {table_name}")
+        for index in table.indexes:
+            cursor.execute(str(CreateIndex(index).compile(dialect=dialect)))
+        cursor.execute("RELEASE SAVEPOINT rebuild_table")
+        print_success(f"  ✓ สร้างตาราง '{table_name}' ใหม่ตาม schema ปัจจุบันสำเร็จ")
+        return True
+    except sqlite3.Error as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT rebuild_table")
+        cursor.execute("RELEASE SAVEPOINT rebuild_table")
+        print_error(f"  ✗ ไม่สามารถสร้างตาราง '{table_name}' ใหม่: {e}")
+        return False
+
+
+def tables_needing_rebuild(cursor) -> dict:
+    """
+    หาตารางที่ต้อง rebuild (ALTER TABLE ของ SQLite ทำให้ไม่ได้)
+    - created_at ยังไม่มี DEFAULT ฝั่งฐานข้อมูล (สร้างไว้ก่อนใช้ server_default)
+    - ขาด generated column แบบ STORED (ADD COLUMN รองรับแค่ VIRTUAL)
+    
+    Returns:
+        Dictionary ของ ชื่อตาราง -> เหตุผล
+    """
+    from src.db.models import Base
+    
+    tables = {}
+    for table in Base.metadata.sorted_tables:
+        if not check_table_exists(cursor, table.name):
+            continue
+        
+        if "created_at" in table.columns and get_column_default(cursor, table.name, "created_at") is None:
+            tables[table.name] = "server_default"
+            continue
+        
+        existing = get_generated_columns(cursor, table.name)
+        if any(c.computed is not None and c.name not in existing for c in table.columns):
+            tables[table.name] = "computed_columns"
+    
+    return tables
+
+
+def migrate_rebuild_tables(cursor) -> dict:
+    """
+    Rebuild ตารางที่ schema เก่าเกินกว่าจะแก้ด้วย ALTER TABLE
+    
+    models ไม่ส่งค่า timestamp ตอน INSERT แล้ว ตารางเดิมที่ไม่มี DEFAULT
+    จะ insert ไม่ได้ (NOT NULL) และ generated columns ต้องสร้างพร้อมตาราง
+    
+    Returns:
+        Dictionary ของผลลัพธ์ แยกตามตาราง
+    """
+    console.print("\n[bold cyan]🕒 กำลังตรวจสอบตารางที่ต้องสร้างใหม่...[/bold cyan]")
+    
+    results = {}
+    for table_name, reason in tables_needing_rebuild(cursor).items():
+        results[table_name] = {reason: rebuild_table(cursor, table_name)}
+    
+    if not results:
+        print_info("  ✓ schema ของทุกตารางเป็นปัจจุบันแล้ว")
+    
+    return results
+
+
+def missing_tables(cursor) -> list:
+    """หาตารางที่ประกาศใน models แต่ยังไม่มีในฐานข้อมูล"""
+    from src.db.models import Base
+    
+    return [
+        table
+        for table in Base.metadata.sorted_tables
+        if not check_table_exists(cursor, table.name)
+    ]
+
+
+def migrate_new_tables(cursor) -> dict:
+    """
+    สร้างตารางที่ยังไม่มี (พร้อม indexes) แล้ว backfill ข้อมูลที่ derive ได้
+    
+    Returns:
+        Dictionary ของผลลัพธ์ แยกตามตาราง
+    """
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex, CreateTable
+    
+    console.print("\n[bold cyan]🆕 กำลังสร้างตารางใหม่...[/bold cyan]")
+    
+    dialect = sqlite.dialect()
+    results = {}
+    for table in missing_tables(cursor):
+        try:
+            cursor.execute(str(CreateTable(table).compile(dialect=dialect)))
+            for index in table.indexes:
+                cursor.execute(str(CreateIndex(index).compile(dialect=dialect)))
+            print_success(f"  ✓ สร้างตาราง '{table.name}' สำเร็จ")
+            results[table.name] = {"create_table": True}
+        except sqlite3.Error as e:
+            print_error(f"  ✗ ไม่สามารถสร้างตาราง '{table.name}': {e}")
+            results[table.name] = {"create_table": False}
+    
+    if results.get("video_tags", {}).get("create_table"):
+        results["video_tags"]["backfill"] = backfill_video_tags(cursor)
+    if results.get("rule_sample_videos", {}).get("create_table"):
+        results["rule_sample_videos"]["backfill"] = backfill_rule_sample_videos(cursor)
+    
+    if not results:
+        print_info("  ✓ มีตารางครบทุกตารางแล้ว")
+    
+    return results
+
+
+def backfill_video_tags(cursor) -> bool:
+    """
+    เติม tags / video_tags จาก JSON ใน videos.tags
+    (รองรับทั้งรูปแบบ {"tags": [...]} และ list ตรงๆ)
+    """
+    tag_values = (
+        "SELECT v.id AS video_id, j.value AS name FROM videos v, "
+        "json_each(COALESCE(json_extract(v.tags, '$.tags'), v.tags)) j "
+        "WHERE json_valid(v.tags) AND j.type = 'text' AND j.value != ''"
+    )
+    try:
+        cursor.execute(f"INSERT OR IGNORE INTO tags (name) SELECT DISTINCT name FROM ({tag_values})")
+        cursor.execute(
+            "INSERT OR IGNORE INTO video_tags (video_id, tag_id) "
+            f"SELECT t.video_id, tags.id FROM ({tag_values}) t JOIN tags ON tags.name = t.name"
+        )
+        print_success(f"  ✓ backfill video_tags จาก videos.tags สำเร็จ ({cursor.rowcount} แถว)")
+        return True
+    except sqlite3.Error as e:
+        print_error(f"  ✗ ไม่สามารถ backfill video_tags: {e}")
+        return False
+
+
+def backfill_rule_sample_videos(cursor) -> bool:
+    """เติม rule_sample_videos จาก JSON ใน playbook_rules.sample_videos (ข้าม video ID ที่ไม่มีแล้ว)"""
+    try:
+        cursor.execute(
+            "INSERT OR IGNORE INTO rule_sample_videos (rule_id, video_id) "
+            "SELECT r.id, v.id FROM playbook_rules r, "
+            "json_each(json_extract(r.sample_videos, '$.videos')) j "
+            "JOIN videos v ON v.id = j.value "
+            "WHERE json_valid(r.sample_videos) AND j.type = 'integer'"
+        )
+        print_success(f"  ✓ backfill rule_sample_videos จาก playbook_rules.sample_videos สำเร็จ ({cursor.rowcount} แถว)")
+        return True
+    except sqlite3.Error as e:
+        print_error(f"  ✗ ไม่สามารถ backfill rule_sample_videos: {e}")
+        return False
+
+
+def video_search_missing(cursor) -> bool:
+    """ตรวจว่ายังไม่มีตาราง FTS5 หรือ triggers ของ videos ครบหรือไม่"""
+    from src.db.models import VIDEO_SEARCH_TABLE
+    
+    cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = ? "
+        "OR (type = 'trigger' AND name LIKE ?)",
+        (VIDEO_SEARCH_TABLE, f"{VIDEO_SEARCH_TABLE}_a_"),
+    )
+    return cursor.fetchone()[0] < 4
+
+
+def migrate_video_search(cursor) -> dict:
+    """
+    สร้างตาราง FTS5 ของ videos + triggers ที่ขาดไป (รวมถึง triggers ที่หายไปหลัง rebuild ตาราง)
+    แล้ว index วิดีโอที่มีอยู่ถ้าเพิ่งสร้างตาราง
+    
+    Returns:
+        Dictionary ของผลลัพธ์
+    """
+    from src.db.models import VIDEO_SEARCH_DDL, VIDEO_SEARCH_TABLE
+    
+    console.print("\n[bold cyan]🔎 กำลังตรวจสอบ full-text search ของ videos...[/bold cyan]")
+    
+    if not video_search_missing(cursor):
+        print_info("  ✓ มี full-text search ของ videos แล้ว")
+        return {}
+    
+    try:
+        created = not check_table_exists(cursor, VIDEO_SEARCH_TABLE)
+        for statement in VIDEO_SEARCH_DDL:
+            cursor.execute(statement)
+        if created:
+            cursor.execute(f"INSERT INTO {VIDEO_SEARCH_TABLE}({VIDEO_SEARCH_TABLE}) VALUES ('rebuild')")
+        print_success("  ✓ สร้าง full-text search ของ videos สำเร็จ")
+        return {VIDEO_SEARCH_TABLE: True}
+    except sqlite3.Error as e:
+        print_error(f"  ✗ ไม่สามารถสร้าง full-text search: {e}")
+        return {VIDEO_SEARCH_TABLE: False}
+
+
+def run_stats_missing(cursor) -> bool:
+    """ตรวจว่า triggers ที่ดูแล run_stats_daily ยังไม่ครบหรือไม่"""
+    cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'runs_log_stats_a_'"
+    )
+    return cursor.fetchone()[0] < 3
+
+
+def migrate_run_stats(cursor) -> dict:
+    """
+    คำนวณ run_stats_daily ใหม่จาก runs_log แล้วสร้าง triggers ที่ขาดไป
+    (ตารางที่ไม่มี triggers อาจพลาด runs ที่เขียนไปแล้ว จึงคำนวณใหม่ทั้งหมด)
+    
+    Returns:
+        Dictionary ของผลลัพธ์
+    """
+    from src.db.models import RUN_STATS_DDL
+    
+    console.print("\n[bold cyan]📊 กำลังตรวจสอบ run_stats_daily...[/bold cyan]")
+    
+    if not run_stats_missing(cursor):
+        print_info("  ✓ มี triggers ของ run_stats_daily แล้ว")
+        return {}
+    
+    try:
+        cursor.execute("DELETE FROM run_stats_daily")
+        cursor.execute(
+            "INSERT INTO run_stats_daily "
+            "(run_type, day, total_runs, completed, failed, total_duration, duration_count) "
+            "SELECT run_type, date(started_at), COUNT(*), SUM(status = 'completed'), SUM(status = 'failed'), "
+            "COALESCE(SUM(duration_seconds), 0), COUNT(duration_seconds) "
+            "FROM runs_log GROUP BY run_type, date(started_at)"
+        )
+        rows = cursor.rowcount
+        for statement in RUN_STATS_DDL:
+            cursor.execute(statement)
+        print_success(f"  ✓ สร้าง run_stats_daily จาก runs_log สำเร็จ ({rows} แถว)")
+        return {"run_stats_daily": True}
+    except sqlite3.Error as e:
+        print_error(f"  ✗ ไม่สามารถสร้าง run_stats_daily: {e}")
+        return {"run_stats_daily": False}
+
+
+# indexes ที่เคยประกาศใน models แต่ถูกแทนที่แล้ว (index อื่นครอบคลุม) - ลบทิ้งเพื่อลดต้นทุนการเขียน
+OBSOLETE_INDEXES = (
+    "ix_videos_channel_id",  # แทนด้วย ix_videos_channel_published
+    "ix_daily_metrics_video_date",  # ซ้ำกับ unique index ของ uq_video_date
+)
+
+
+def obsolete_indexes(cursor) -> list:
+    """หา indexes ใน OBSOLETE_INDEXES ที่ยังอยู่ในฐานข้อมูล - list ของ (ชื่อ index, ชื่อตาราง)"""
+    cursor.execute(
+        f"SELECT name, tbl_name FROM sqlite_master WHERE type='index' AND name IN ({', '.join('?' * len(OBSOLETE_INDEXES))})",
+        OBSOLETE_INDEXES,
+    )
+    return cursor.fetchall()
+
+
+def missing_indexes(cursor) -> list:
+    """หา indexes ที่ประกาศใน models แต่ยังไม่มีในฐานข้อมูล (เฉพาะตารางที่มีอยู่แล้ว)"""
+    from src.db.models import Base
+    
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    existing = {row[0] for row in cursor.fetchall()}
+    
+    return [
+        index
+        for table in Base.metadata.sorted_tables
+        if check_table_exists(cursor, table.name)
+        for index in sorted(table.indexes, key=lambda ix: ix.name)
+        if index.name not in existing
+    ]
+
+
+def migrate_indexes(cursor) -> dict:
+    """
+    สร้าง indexes ที่ขาดหายไป (create_all ไม่เพิ่ม index ให้ตารางที่มีอยู่แล้ว)
+    
+    Returns:
+        Dictionary ของผลลัพธ์ แยกตามตาราง
+    """
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex
+    
+    console.print("\n[bold cyan]🗂️ กำลังสร้าง indexes ที่ขาดหายไป...[/bold cyan]")
+    
+    results = {}
+    for index in missing_indexes(cursor):
+        try:
+            cursor.execute(str(CreateIndex(index).compile(dialect=sqlite.dialect())))
+            print_success(f"  ✓ สร้าง index '{index.name}' สำเร็จ")
+            success = True
+        except sqlite3.Error as e:
+            print_error(f"  ✗ ไม่สามารถสร้าง index '{index.name}': {e}")
+            success = False
+        results.setdefault(index.table.name, {})[index.name] = success
+    
+    for name, table_name in obsolete_indexes(cursor):
+        try:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            print_success(f"  ✓ ลบ index '{name}' ที่ไม่ใช้แล้วสำเร็จ")
+            success = True
+        except sqlite3.Error as e:
+            print_error(f"  ✗ ไม่สามารถลบ index '{name}': {e}")
+            success = False
+        results.setdefault(table_name, {})[f"drop {name}"] = success
+    
+    if not results:
+        print_info("  ✓ indexes ครบทุกตารางแล้ว")
+    
+    return results
+
+
+def update_statistics(cursor) -> dict:
+    """
+    เก็บสถิติของตาราง/indexes (ANALYZE) ให้ query planner และ count_estimate() ของ repository
+    
+    Returns:
+        Dictionary ของผลลัพธ์
+    """
+    console.print("\n[bold cyan]📈 กำลังอัพเดทสถิติของฐานข้อมูล (ANALYZE)...[/bold cyan]")
+    try:
+        cursor.execute("ANALYZE")
+        print_success("  ✓ อัพเดทสถิติสำเร็จ")
+        return {"analyze": True}
+    except sqlite3.Error as e:
+        print_error(f"  ✗ ไม่สามารถอัพเดทสถิติ: {e}")
+        return {"analyze": False}
+
+
 def migrate_daily_metrics(cursor) -> dict:
     """
     Migrate ตาราง daily_metrics
@@ -135,6 +539,84 @@ def migrate_research_items(cursor) -> dict:
     return results
 
 
+def legacy_run_ids(cursor) -> list:
+    """หา runs_log ที่ run_id ยังไม่ใช่ UUID (คืนค่า list ของ (id, started_at))"""
+    import uuid
+    
+    cursor.execute("SELECT id, run_id, started_at FROM runs_log")
+    legacy = []
+    for row_id, run_id, started_at in cursor.fetchall():
+        try:
+            uuid.UUID(run_id)
+        except (TypeError, ValueError):
+            legacy.append((row_id, started_at))
+    return legacy
+
+
+def count_uncompressed_tracebacks(cursor) -> int:
+    """นับ runs_log ที่ error_traceback ยังเป็น TEXT (ยังไม่บีบอัด)"""
+    cursor.execute("SELECT COUNT(*) FROM runs_log WHERE typeof(error_traceback) = 'text'")
+    return cursor.fetchone()[0]
+
+
+def migrate_runs_log(cursor) -> dict:
+    """
+    Migrate ตาราง runs_log
+    
+    - แปลง run_id รูปแบบเดิมเป็น UUIDv7 (ใช้ started_at เป็น timestamp เพื่อคงลำดับเวลา)
+    - บีบอัด error_traceback ที่ยังเป็น TEXT
+    
+    Returns:
+        Dictionary ของผลลัพธ์
+    """
+    from src.db.models import uuid7
+    
+    console.print("\n[bold cyan]🆔 กำลัง migrate ตาราง runs_log...[/bold cyan]")
+    
+    rows = []
+    for row_id, started_at in legacy_run_ids(cursor):
+        try:
+            started = datetime.fromisoformat(started_at).replace(tzinfo=timezone.utc)
+            timestamp_ms = int(started.timestamp() * 1000)
+        except (TypeError, ValueError):
+            timestamp_ms = None
+        rows.append((uuid7(timestamp_ms).hex, row_id))
+    
+    results = {}
+    if not rows:
+        print_info("  ✓ run_id เป็น UUID ทั้งหมดแล้ว")
+    else:
+        try:
+            cursor.executemany("UPDATE runs_log SET run_id = ? WHERE id = ?", rows)
+            print_success(f"  ✓ แปลง run_id เป็น UUIDv7 สำเร็จ ({len(rows)} แถว)")
+            results["run_id"] = True
+        except sqlite3.Error as e:
+            print_error(f"  ✗ ไม่สามารถแปลง run_id: {e}")
+            results["run_id"] = False
+    
+    results.update(compress_tracebacks(cursor))
+    return results
+
+
+def compress_tracebacks(cursor) -> dict:
+    """บีบอัด error_traceback ที่ยังเป็น TEXT ให้ตรงกับ CompressedText"""
+    import zlib
+    
+    cursor.execute("SELECT id, error_traceback FROM runs_log WHERE typeof(error_traceback) = 'text'")
+    rows = [(zlib.compress(tb.encode("utf-8"), 6), row_id) for row_id, tb in cursor.fetchall()]
+    if not rows:
+        print_info("  ✓ error_traceback ถูกบีบอัดทั้งหมดแล้ว")
+        return {}
+    
+    try:
+        cursor.executemany("UPDATE runs_log SET error_traceback = ? WHERE id = ?", rows)
+        print_success(f"  ✓ บีบอัด error_traceback สำเร็จ ({len(rows)} แถว)")
+        return {"error_traceback": True}
+    except sqlite3.Error as e:
+        print_error(f"  ✗ ไม่สามารถบีบอัด error_traceback: {e}")
+        return {"error_traceback": False}
+
+
 def show_migration_summary(all_results: dict) -> None:
     """แสดงสรุปผลการ migrate"""
     table = Table(title="📋 สรุปผลการ Migration", show_header=True)
@@ -249,6 +731,32 @@ def main(config: str, dry_run: bool, verbose: bool):
             if "research_items" in tables_to_migrate:
                 all_results["research_items"] = migrate_research_items(cursor)
             
+            if check_table_exists(cursor, "runs_log"):
+                runs_log_results = migrate_runs_log(cursor)
+                if runs_log_results:
+                    all_results["runs_log"] = runs_log_results
+            
+            for table_name, columns in migrate_rebuild_tables(cursor).items():
+                all_results.setdefault(table_name, {}).update(columns)
+            
+            for table_name, columns in migrate_new_tables(cursor).items():
+                all_results.setdefault(table_name, {}).update(columns)
+            
+            if check_table_exists(cursor, "videos"):
+                video_search_results = migrate_video_search(cursor)
+                if video_search_results:
+                    all_results.setdefault("videos", {}).update(video_search_results)
+            
+            if check_table_exists(cursor, "runs_log") and check_table_exists(cursor, "run_stats_daily"):
+                run_stats_results = migrate_run_stats(cursor)
+                if run_stats_results:
+                    all_results.setdefault("runs_log", {}).update(run_stats_results)
+            
+            for table_name, indexes in migrate_indexes(cursor).items():
+                all_results.setdefault(table_name, {}).update(indexes)
+            
+            all_results.setdefault("sqlite_stat1", {}).update(update_statistics(cursor))
+            
             # Commit changes
             conn.commit()
             
@@ -301,6 +809,51 @@ def main(config: str, dry_run: bool, verbose: bool):
                 else:
                     console.print("    • 'summary_th' มีอยู่แล้ว - ข้าม")
             
+            if check_table_exists(cursor, "runs_log"):
+                legacy = len(legacy_run_ids(cursor))
+                uncompressed = count_uncompressed_tracebacks(cursor)
+                if legacy or uncompressed:
+                    console.print("\n  [cyan]runs_log:[/cyan]")
+                if legacy:
+                    console.print(f"    • จะแปลง run_id {legacy} แถวเป็น UUIDv7")
+                if uncompressed:
+                    console.print(f"    • จะบีบอัด error_traceback {uncompressed} แถว")
+            
+            rebuild_tables = tables_needing_rebuild(cursor)
+            if rebuild_tables:
+                console.print("\n  [cyan]rebuild:[/cyan]")
+                for table_name, reason in rebuild_tables.items():
+                    console.print(f"    • จะสร้างตาราง '{table_name}' ใหม่ ({reason})")
+            
+            new_tables = missing_tables(cursor)
+            if new_tables:
+                console.print("\n  [cyan]ตารางใหม่:[/cyan]")
+                for table in new_tables:
+                    console.print(f"    • จะสร้างตาราง '{table.name}'")
+            
+            if check_table_exists(cursor, "videos") and video_search_missing(cursor):
+                console.print("\n  [cyan]full-text search:[/cyan]")
+                console.print("    • จะสร้างตาราง FTS5 'videos_fts' และ triggers ของ videos")
+            
+            if check_table_exists(cursor, "runs_log") and run_stats_missing(cursor):
+                console.print("\n  [cyan]run_stats_daily:[/cyan]")
+                console.print("    • จะคำนวณ run_stats_daily จาก runs_log และสร้าง triggers บน runs_log")
+            
+            new_indexes = missing_indexes(cursor)
+            if new_indexes:
+                console.print("\n  [cyan]indexes:[/cyan]")
+                for index in new_indexes:
+                    console.print(f"    • จะสร้าง index '{index.name}' บน '{index.table.name}'")
+            
+            old_indexes = obsolete_indexes(cursor)
+            if old_indexes:
+                console.print("\n  [cyan]indexes ที่ไม่ใช้แล้ว:[/cyan]")
+                for name, table_name in old_indexes:
+                    console.print(f"    • จะลบ index '{name}' บน '{table_name}'")
+            
+            console.print("\n  [cyan]สถิติ:[/cyan]")
+            console.print("    • จะรัน ANALYZE เพื่ออัพเดทสถิติของ query planner")
+            
             console.print("\n[yellow]รัน command โดยไม่มี --dry-run เพื่อทำจริง[/yellow]")
         
         conn.close()
@@ -53,6 +53,8 @@ logger = setup_logger(__name__)
 def generate_demo_report_data() -> dict:
     """สร้างข้อมูลตัวอย่างสำหรับ demo report"""
     np.random.seed(42)
+    now = datetime.now()
+    week_ago = now - timedelta(days=7)
     
     # Generate video performance data
     videos = []
@@ -64,7 +66,7 @@ def generate_demo_report_data() -> dict:
             'comments': np.random.randint(10, 500),
             'ctr': np.random.uniform(2, 12),
             'avg_view_duration': np.random.uniform(60, 600),
-            'published_at': datetime.now() - timedelta(days=np.random.randint(1, 30)),
+            'published_at': now - timedelta(days=np.random.randint(1, 30)),
         })
     
     # Generate playbook rules
@@ -90,8 +92,8 @@ def generate_demo_report_data() -> dict:
         'rules': rules,
         'research': research,
         'period': {
-            'start': datetime.now() - timedelta(days=7),
-            'end': datetime.now(),
+            'start': week_ago,
+            'end': now,
         },
         'summary': {
             'total_views': sum(v['views'] for v in videos),
@@ -99,7 +101,7 @@ def generate_demo_report_data() -> dict:
             'total_comments': sum(v['comments'] for v in videos),
             'avg_ctr': np.mean([v['ctr'] for v in videos]),
             'avg_view_duration': np.mean([v['avg_view_duration'] for v in videos]),
-            'videos_published': len([v for v in videos if v['published_at'] > datetime.now() - timedelta(days=7)]),
+            'videos_published': len([v for v in videos if v['published_at'] > week_ago]),
         }
     }
 
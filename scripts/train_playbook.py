@@ -24,7 +24,6 @@ import os
 import argparse
 import json
 from datetime import datetime, timedelta
-import uuid
 from pathlib import Path
 
 # Add project root to path
@@ -278,7 +277,6 @@ def log_run(
     with db.get_session() as session:
         log_repo = RunLogRepository(session)
         run_log_data = {
-            'run_id': f'train-playbook-{uuid.uuid4().hex[:8]}',
             'run_type': 'rule_learning',
             'status': status,
             'started_at': datetime.now(),
@@ -11,53 +11,287 @@ RSS Feed Parser - ดึงข่าวสารอนิเมะจาก RSS
 
 import re
 import html
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+import json
+import asyncio
+import socket
+import types
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Iterable, TYPE_CHECKING
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
 from email.utils import parsedate_to_datetime
 
-import requests
-from xml.etree import ElementTree as ET
-from rich.console import Console
+if TYPE_CHECKING:
+    import aiohttp
+    import numpy as np
+    import requests
+    from rich.console import Console
+    from rich.table import Table
 
-console = Console()
+# lxml (optional) - XML parser ที่เขียนด้วย C และ API เข้ากันได้กับ ElementTree
+try:
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:
+    from xml.etree import ElementTree as ET
+    _HAS_LXML = False
+
+# orjson (optional) serialize JSON ใน C ได้เร็วกว่า stdlib json หลายเท่า
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rich console สร้างเมื่อใช้งานครั้งแรก (import RSSItem อย่างเดียวไม่ต้องตรวจ terminal)
+_console: Optional["Console"] = None
+
+
+def _get_console() -> "Console":
+    """คืนค่า Rich console (สร้างครั้งแรกที่เรียกใช้)"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+# HTTP headers ที่ใช้กับทุก request (ขอให้ server ส่งแบบบีบอัด - requests จะ decompress ให้อัตโนมัติ)
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "anime-rss/1.0",
+}
+
+
+# จำนวน host pools / connections ต่อ host ที่ session เก็บไว้ใช้ซ้ำ
+_HTTP_POOL_SIZE = 8
+
+
+def _create_http_session() -> "requests.Session":
+    """
+    สร้าง requests.Session สำหรับดึง RSS (import requests เมื่อใช้งานจริงเท่านั้น)
+    
+    ทุก connection ใน pool ปิด Nagle (TCP_NODELAY) และเปิด keep-alive
+    เพื่อให้ connection (และ DNS ที่ resolve แล้ว) ถูกใช้ซ้ำข้ามรอบการ poll
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+    
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    
+    class _KeepAliveAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs["socket_options"] = socket_options
+            super().init_poolmanager(*args, **kwargs)
+    
+    # XML บีบอัดได้ดี - DEFAULT_HEADERS ขอ gzip เพื่อลด bytes ที่ส่งผ่านเครือข่าย
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = _KeepAliveAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Atom / Dublin Core tags ในรูป Clark notation (คำนวณครั้งเดียว ไม่ต้อง resolve prefix ทุก item)
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ATOM_ENTRY = _ATOM + "entry"
+_ATOM_TITLE = _ATOM + "title"
+_ATOM_LINK = _ATOM + "link"
+_ATOM_CONTENT = _ATOM + "content"
+_ATOM_SUMMARY = _ATOM + "summary"
+_ATOM_UPDATED = _ATOM + "updated"
+_ATOM_PUBLISHED = _ATOM + "published"
+_ATOM_AUTHOR = _ATOM + "author"
+_ATOM_NAME = _ATOM + "name"
+_DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+
+# lxml: ดึงข้อความ <category> ได้ตรงๆ ไม่ต้องสร้าง Element ทีละตัว (smart_strings=False = คืน str ธรรมดา)
+_CATEGORY_TEXT = ET.XPath("category/text()", smart_strings=False) if _HAS_LXML else None
+
+# ขนาด chunk ที่อ่านจาก HTTP response แล้วป้อนเข้า XML parser
+_STREAM_CHUNK_SIZE = 16384
+
+# Regex สำหรับ _clean_html (compile ครั้งเดียวตอน import)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+# whitespace ที่ _WS_RE จะเปลี่ยน: ช่องว่างติดกัน หรือ whitespace ที่ไม่ใช่ " " (\n, \t, \xa0 ...)
+_WS_DIRTY_RE = re.compile(r"\s\s|[^\S ]")
+
+# RFC 2822 pubDate รูปแบบมาตรฐาน เช่น "Mon, 06 Jan 2025 10:00:00 +0000"
+# (รูปแบบอื่น เช่น timezone แบบชื่อ "GMT" จะ fallback ไปใช้ parsedate_to_datetime)
+_RFC2822_RE = re.compile(
+    r"\s*(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})\s+"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?\s+([+-])(\d{2})(\d{2})\s*$"
+)
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# จำนวนรายการขั้นต่ำที่คุ้มจะกรอง/เรียงวันที่ด้วย NumPy (รายการน้อยกว่านี้ใช้ Python loop เร็วกว่า)
+_VECTORIZE_MIN_ITEMS = 256
 
 
 # Whitelisted RSS sources พร้อม reliability score
 # enabled: True = ใช้งานได้, False = ปิดการใช้งาน (เช่น URL ไม่ทำงาน)
-RSS_SOURCES = {
-    "ann": {
+# เป็นแบบอ่านอย่างเดียว - parser ทุกตัวใช้ร่วมกันจนกว่าจะมีการแก้ไข (copy-on-write ใน RSSFeedParser)
+RSS_SOURCES = types.MappingProxyType({
+    "ann": types.MappingProxyType({
         "name": "Anime News Network",
         "url": "https://www.animenewsnetwork.com/all/rss.xml",
         "reliability_score": 0.95,
         "category": "news",
         "enabled": True,
-    },
-    "ann_interest": {
+    }),
+    "ann_interest": types.MappingProxyType({
         "name": "ANN Interest",
         "url": "https://www.animenewsnetwork.com/interest/rss.xml",
         "reliability_score": 0.90,
         "category": "interest",
         "enabled": True,
-    },
-    "crunchyroll": {
+    }),
+    "crunchyroll": types.MappingProxyType({
         "name": "Crunchyroll News",
         "url": "https://www.crunchyroll.com/newsrss",
         "reliability_score": 0.90,
         "category": "news",
         "enabled": False,  # ปิดการใช้งาน: URL ไม่พร้อมใช้งาน (404) ตั้งแต่ 2024
-    },
-    "mal_news": {
+    }),
+    "mal_news": types.MappingProxyType({
         "name": "MyAnimeList News",
         "url": "https://myanimelist.net/rss/news.xml",
         "reliability_score": 0.85,
         "category": "news",
         "enabled": True,
-    },
-}
+    }),
+})
+
+
+def _item_cache_key(source_key: str, guid: Optional[str], link: str) -> str:
+    """key ของข่าวใน cache (ใช้ guid ถ้ามี ไม่เช่นนั้นใช้ link)"""
+    return f"{source_key}:{guid or link}"
+
+
+def _parse_rfc2822_fast(date_str: str) -> Optional[datetime]:
+    """
+    แปลง RFC 2822 รูปแบบมาตรฐานด้วย regex ที่ compile ไว้แล้ว
+    
+    ให้ผลเหมือน parsedate_to_datetime ("-0000" = ไม่ทราบ timezone -> naive datetime)
+    คืนค่า None ถ้าไม่ตรงรูปแบบ
+    """
+    match = _RFC2822_RE.match(date_str)
+    if match is None:
+        return None
+    
+    day, mon, year, hour, minute, second, sign, tz_hour, tz_minute = match.groups()
+    month = _MONTHS.get(mon.lower())
+    if month is None:
+        return None
+    
+    offset_minutes = int(tz_hour) * 60 + int(tz_minute)
+    if offset_minutes == 0 and sign == "-":
+        tzinfo = None
+    else:
+        if sign == "-":
+            offset_minutes = -offset_minutes
+        tzinfo = timezone(timedelta(minutes=offset_minutes))
+    
+    try:
+        return datetime(
+            int(year), month, int(day),
+            int(hour), int(minute), int(second or 0),
+            tzinfo=tzinfo,
+        )
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_cached(date_str: str) -> Optional[datetime]:
+    """
+    แปลงวันที่จาก RSS/Atom (cache ตาม string - ข่าวที่ลงพร้อมกันมักมีวันที่ซ้ำกัน)
+    
+    datetime เป็น immutable จึงคืนค่า object เดียวกันให้หลาย item ได้
+    """
+    # RFC 2822 format (standard RSS) - รูปแบบมาตรฐานใช้ fast path ก่อน
+    parsed = _parse_rfc2822_fast(date_str)
+    if parsed is not None:
+        return parsed
+    
+    try:
+        return parsedate_to_datetime(date_str)
+    except Exception:
+        pass
+    
+    # Try ISO format
+    try:
+        return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    except Exception:
+        pass
+    
+    return None
 
 
-@dataclass
+# sort key ที่คำนวณไว้ตอนสร้าง RSSItem (attrgetter ทำงานใน C ไม่ต้องเรียก lambda ทีละรายการ)
+_sort_key = attrgetter("_published_ts")
+
+
+def _published_timestamps(items: List["RSSItem"]) -> "np.ndarray":
+    """คืนค่า POSIX timestamps ของ published_at (-inf สำหรับรายการที่ไม่มีวันที่)"""
+    import numpy as np
+    
+    return np.fromiter(map(_sort_key, items), dtype=np.float64, count=len(items))
+
+
+def _filter_by_cutoff(
+    items: List["RSSItem"],
+    cutoff_naive: datetime,
+    cutoff_aware: datetime,
+) -> List["RSSItem"]:
+    """
+    กรองรายการที่เผยแพร่หลัง cutoff (รายการที่ไม่มีวันที่จะถูกเก็บไว้)
+    
+    เมื่อมีรายการมากพอจะเปรียบเทียบด้วย NumPy ครั้งเดียวแทน loop ทีละรายการ
+    """
+    if len(items) < _VECTORIZE_MIN_ITEMS:
+        return [
+            item for item in items
+            if item.published_at is None
+            or item.published_at >= (cutoff_aware if item.published_at.tzinfo else cutoff_naive)
+        ]
+    
+    # import เฉพาะเมื่อใช้ (numpy ใช้เวลา import หลายสิบ ms)
+    import numpy as np
+    
+    timestamps = _published_timestamps(items)
+    is_aware = np.fromiter(
+        (item.published_at is not None and item.published_at.tzinfo is not None for item in items),
+        dtype=bool,
+        count=len(items),
+    )
+    cutoffs = np.where(is_aware, cutoff_aware.timestamp(), cutoff_naive.timestamp())
+    mask = np.isneginf(timestamps) | (timestamps >= cutoffs)
+    return [item for item, keep in zip(items, mask.tolist()) if keep]
+
+
+def _sort_newest_first(items: List["RSSItem"]) -> List["RSSItem"]:
+    """เรียงตามวันที่เผยแพร่ (ใหม่สุดก่อน) รายการที่ไม่มีวันที่อยู่ท้ายสุด"""
+    if len(items) < _VECTORIZE_MIN_ITEMS:
+        return sorted(items, key=_sort_key, reverse=True)
+    
+    import numpy as np
+    
+    timestamps = _published_timestamps(items)
+    order = np.argsort(-timestamps, kind="stable")
+    return [items[i] for i in order.tolist()]
+
+
+@dataclass(slots=True)
 class RSSItem:
     """โครงสร้างข้อมูลข่าวจาก RSS"""
     
@@ -72,6 +306,14 @@ class RSSItem:
     author: Optional[str] = None
     guid: Optional[str] = None
     reliability_score: float = 1.0
+    _published_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _published_ts: float = field(default=float("-inf"), init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # แปลงวันที่เป็น ISO string ครั้งเดียวตอนสร้าง (to_dict ถูกเรียกซ้ำหลายครั้ง)
+        self._published_iso = self.published_at.isoformat() if self.published_at else None
+        # timestamp สำหรับเรียง/กรองวันที่ (ไม่มีวันที่ = -inf อยู่ท้ายสุดเสมอ)
+        self._published_ts = self.published_at.timestamp() if self.published_at else float("-inf")
     
     def to_dict(self) -> Dict[str, Any]:
         """แปลงเป็น dictionary"""
@@ -80,7 +322,7 @@ class RSSItem:
             "link": self.link,
             "source": self.source,
             "source_name": self.source_name,
-            "published_at": self.published_at.isoformat() if self.published_at else None,
+            "published_at": self._published_iso,
             "description": self.description,
             "raw_text": self.raw_text,
             "categories": self.categories,
@@ -88,6 +330,106 @@ class RSSItem:
             "guid": self.guid,
             "reliability_score": self.reliability_score,
         }
+    
+    def to_json(self) -> bytes:
+        """แปลงเป็น JSON (UTF-8 bytes) ใช้ orjson ถ้ามี"""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), ensure_ascii=False).encode("utf-8")
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RSSItem":
+        """สร้าง RSSItem จาก dictionary (รูปแบบเดียวกับ to_dict)"""
+        published_at = data.get("published_at")
+        return cls(
+            title=data["title"],
+            link=data["link"],
+            source=data["source"],
+            source_name=data["source_name"],
+            published_at=datetime.fromisoformat(published_at) if published_at else None,
+            description=data.get("description"),
+            raw_text=data.get("raw_text"),
+            categories=list(data.get("categories") or []),
+            author=data.get("author"),
+            guid=data.get("guid"),
+            reliability_score=data.get("reliability_score", 1.0),
+        )
+
+
+class _FeedStream:
+    """
+    ตัวแปลง feed แบบ incremental - ป้อน bytes ทีละ chunk จาก HTTP response ได้โดยตรง
+    
+    แปลงแต่ละ <item>/<entry> ทันทีที่ปิด tag แล้วล้าง element ทิ้ง
+    (ใช้เฉพาะภายใน RSSFeedParser)
+    """
+    
+    def __init__(self, parser: "RSSFeedParser", source_key: str):
+        self._parser = parser
+        self._source_key = source_key
+        # ค่าคงที่ของแหล่งนี้ ดึงครั้งเดียวก่อนวนแปลงทุก item
+        source_info = parser.sources.get(source_key, {})
+        self._source_name = source_info.get("name", source_key)
+        self._reliability_score = source_info.get("reliability_score", 0.5)
+        self._pull = ET.XMLPullParser(events=("end",))
+        self._error: Optional[Exception] = None
+        self.items: List["RSSItem"] = []
+        self.atom_items: List["RSSItem"] = []
+    
+    def feed(self, chunk: bytes):
+        """ป้อนข้อมูล XML ส่วนถัดไป (หลังเกิดข้อผิดพลาดจะข้ามส่วนที่เหลือ)"""
+        if self._error is not None or not chunk:
+            return
+        
+        try:
+            self._pull.feed(chunk)
+            self._drain()
+        except Exception as e:
+            self._error = e
+    
+    def close(self) -> List["RSSItem"]:
+        """
+        จบการ parse และคืนค่ารายการข่าว (RSS ก่อน ถ้าไม่มีจึงใช้ Atom)
+        
+        Raises:
+            ET.ParseError: XML ไม่ถูกต้อง (รวมถึงข้อผิดพลาดที่เกิดระหว่าง feed)
+        """
+        if self._error is None:
+            try:
+                self._pull.close()
+                self._drain()
+            except Exception as e:
+                self._error = e
+        
+        if self._error is not None:
+            raise self._error
+        
+        return self.items or self.atom_items
+    
+    def _drain(self):
+        for _, elem in self._pull.read_events():
+            if elem.tag == "item":
+                # RSS 2.0
+                rss_item = self._parser._build_rss_item(
+                    elem, self._source_key, self._source_name, self._reliability_score
+                )
+                if rss_item is not None:
+                    self.items.append(rss_item)
+            elif elem.tag == _ATOM_ENTRY and not self.items:
+                # Atom (ใช้เฉพาะเมื่อไม่พบ RSS items)
+                rss_item = self._parser._build_atom_item(
+                    elem, self._source_key, self._source_name, self._reliability_score
+                )
+                if rss_item is not None:
+                    self.atom_items.append(rss_item)
+            else:
+                continue
+            
+            elem.clear()
+            if _HAS_LXML:
+                # ลบ sibling ก่อนหน้าที่แปลงแล้วออกจาก parent ด้วย
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
 
 
 class RSSFeedParser:
@@ -104,24 +446,168 @@ class RSSFeedParser:
         ann_news = parser.fetch_source("ann", days=7)
     """
     
-    def __init__(self, timeout: int = 30, custom_sources: Optional[Dict] = None):
+    def __init__(
+        self,
+        timeout: int = 30,
+        custom_sources: Optional[Dict] = None,
+        cache_dir: Optional[Path] = None,
+        cache_ttl_days: int = 7,
+        verbose: bool = False,
+    ):
         """
         สร้าง RSS parser
         
         Args:
             timeout: timeout สำหรับ HTTP requests (วินาที)
             custom_sources: แหล่ง RSS เพิ่มเติม (ต้องระบุ reliability_score)
+            cache_dir: โฟลเดอร์สำหรับเก็บ cache ของข่าวที่แปลงแล้ว (default: data/rss_cache)
+            cache_ttl_days: อายุของ cache (วัน)
+            verbose: แสดงสถานะทีละแหล่ง (ปกติจะสรุปเป็นตารางเดียวตอนจบ fetch_all_sources)
         """
         self.timeout = timeout
-        self.sources = RSS_SOURCES.copy()
+        self.verbose = verbose
+        self.sources = RSS_SOURCES
+        
+        # Session กลางสำหรับทุกแหล่ง (สร้างเมื่อ fetch ครั้งแรก)
+        self._session: Optional["requests.Session"] = None
+        
+        # Cache ของข่าวที่แปลงแล้ว (key = source:guid) - ข่าวที่เคยเห็นไม่ต้อง clean HTML/parse วันที่ซ้ำ
+        if cache_dir:
+            self.cache_dir = Path(cache_dir)
+        else:
+            self.cache_dir = Path(__file__).parent.parent.parent / "data" / "rss_cache"
+        
+        # โฟลเดอร์ cache จะถูกสร้างตอนบันทึกครั้งแรก (_save_cache)
+        self.cache_file = self.cache_dir / "rss_item_cache.json"
+        self.http_cache_file = self.cache_dir / "rss_http_cache.json"
+        self.cache_ttl = timedelta(days=cache_ttl_days)
+        
+        self._item_cache: Dict[str, Dict] = {}
+        # Conditional GET: url -> {"etag", "last_modified", "item_keys"}
+        self._http_cache: Dict[str, Dict] = {}
+        self._cache_dirty = False
+        self._load_cache()
         
         if custom_sources:
             for key, source in custom_sources.items():
                 if self._validate_source(source):
-                    self.sources[key] = source
-                    console.print(f"[green]✅ เพิ่มแหล่ง RSS: {source.get('name', key)}[/green]")
+                    self._mutable_sources()[key] = source
+                    _get_console().print(f"[green]✅ เพิ่มแหล่ง RSS: {source.get('name', key)}[/green]")
                 else:
-                    console.print(f"[yellow]⚠️ แหล่ง RSS ไม่ถูกต้อง: {key}[/yellow]")
+                    _get_console().print(f"[yellow]⚠️ แหล่ง RSS ไม่ถูกต้อง: {key}[/yellow]")
+    
+    def close(self):
+        """ปิด HTTP session (คืน connections ใน pool)"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _load_cache(self):
+        """โหลด cache จากไฟล์ (ตัดรายการที่หมดอายุทิ้ง)"""
+        if not self.cache_file.exists():
+            return
+        
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            
+            now = datetime.now()
+            for key, entry in data.items():
+                cached_at = datetime.fromisoformat(entry.get("cached_at", "2000-01-01"))
+                if now - cached_at < self.cache_ttl:
+                    self._item_cache[key] = entry
+                else:
+                    self._cache_dirty = True
+            
+            if self.http_cache_file.exists():
+                with open(self.http_cache_file, "r", encoding="utf-8") as f:
+                    http_data = json.load(f)
+                
+                # ใช้ validators ได้เฉพาะเมื่อข่าวทุกรายการของ feed ยังอยู่ใน cache
+                for url, entry in http_data.items():
+                    if all(key in self._item_cache for key in entry.get("item_keys", [])):
+                        self._http_cache[url] = entry
+                    else:
+                        self._cache_dirty = True
+        except Exception as e:
+            _get_console().print(f"[yellow]⚠️ ไม่สามารถโหลด RSS cache: {e}[/yellow]")
+    
+    def _save_cache(self):
+        """บันทึก cache ลงไฟล์ (เฉพาะเมื่อมีการเปลี่ยนแปลง)"""
+        if not self._cache_dirty:
+            return
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump(self._item_cache, f, ensure_ascii=False)
+            with open(self.http_cache_file, "w", encoding="utf-8") as f:
+                json.dump(self._http_cache, f, ensure_ascii=False)
+            self._cache_dirty = False
+        except Exception as e:
+            _get_console().print(f"[yellow]⚠️ ไม่สามารถบันทึก RSS cache: {e}[/yellow]")
+    
+    def _get_cached_item(self, cache_key: str) -> Optional[RSSItem]:
+        """คืนค่า RSSItem จาก cache (ถ้ามี)"""
+        entry = self._item_cache.get(cache_key)
+        if entry is None:
+            return None
+        return RSSItem.from_dict(entry["item"])
+    
+    def _add_to_cache(self, cache_key: str, item: RSSItem):
+        """เพิ่มข่าวที่แปลงแล้วลง cache"""
+        self._item_cache[cache_key] = {
+            "item": item.to_dict(),
+            "cached_at": datetime.now().isoformat(),
+        }
+        self._cache_dirty = True
+    
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """สร้าง headers If-None-Match / If-Modified-Since จาก response ครั้งก่อน"""
+        entry = self._http_cache.get(url)
+        if not entry:
+            return {}
+        
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    def _get_not_modified_items(self, source_key: str, url: str) -> List[RSSItem]:
+        """คืนค่าข่าวชุดเดิมจาก cache เมื่อ server ตอบ 304 Not Modified"""
+        if self.verbose:
+            _get_console().print(f"[dim]📦 {source_key}: feed ไม่เปลี่ยนแปลง (304) ใช้ข้อมูลจาก cache[/dim]")
+        
+        items = []
+        for key in self._http_cache.get(url, {}).get("item_keys", []):
+            cached = self._get_cached_item(key)
+            if cached is not None:
+                items.append(cached)
+        return items
+    
+    def _remember_feed(self, source_key: str, url: str, items: List[RSSItem], headers) -> List[RSSItem]:
+        """จำ ETag / Last-Modified ของ feed ที่แปลงแล้วไว้สำหรับ conditional GET ครั้งถัดไป"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag or last_modified:
+            self._http_cache[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "item_keys": [_item_cache_key(source_key, item.guid, item.link) for item in items],
+            }
+            self._cache_dirty = True
+        elif self._http_cache.pop(url, None) is not None:
+            self._cache_dirty = True
+        
+        return items
+    
+    def _mutable_sources(self) -> Dict[str, Dict]:
+        """คืนค่า sources ที่แก้ไขได้ (copy ค่าเริ่มต้นเฉพาะครั้งแรกที่มีการแก้ไข)"""
+        if isinstance(self.sources, types.MappingProxyType):
+            self.sources = {key: dict(source) for key, source in self.sources.items()}
+        return self.sources
     
     def _validate_source(self, source: Dict) -> bool:
         """ตรวจสอบความถูกต้องของแหล่ง RSS"""
@@ -133,114 +619,182 @@ class RSSFeedParser:
         if not text:
             return ""
         
-        # Decode HTML entities
-        text = html.unescape(text)
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        # ข้อความธรรมดา (ไม่มี entity / tag / whitespace แปลกๆ) ไม่ต้องผ่าน 3 ขั้นตอนด้านล่าง
+        if "&" not in text and "<" not in text and not _WS_DIRTY_RE.search(text):
+            return text.strip()
         
-        return text
+        # Decode HTML entities -> remove HTML tags -> clean up whitespace
+        return _WS_RE.sub(" ", _TAG_RE.sub("", html.unescape(text))).strip()
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """แปลงวันที่จาก RSS format"""
         if not date_str:
             return None
         
-        try:
-            # RFC 2822 format (standard RSS)
-            return parsedate_to_datetime(date_str)
-        except Exception:
-            pass
+        return _parse_date_cached(date_str)
+    
+    def _build_rss_item(
+        self,
+        item,
+        source_key: str,
+        source_name: str,
+        reliability_score: float
+    ) -> Optional[RSSItem]:
+        """แปลง element <item> (RSS 2.0) เป็น RSSItem"""
+        title = item.findtext("title", "")
+        link = item.findtext("link", "")
         
-        # Try ISO format
-        try:
-            return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-        except Exception:
-            pass
+        if not title or not link:
+            return None
         
-        return None
+        guid = item.findtext("guid", "")
+        cache_key = _item_cache_key(source_key, guid, link)
+        cached = self._get_cached_item(cache_key)
+        if cached is not None:
+            return cached
+        
+        description = item.findtext("description", "")
+        pub_date = item.findtext("pubDate", "")
+        author = item.findtext("author", "") or item.findtext(_DC_CREATOR, "")
+        
+        # Parse categories
+        if _CATEGORY_TEXT is not None:
+            categories = _CATEGORY_TEXT(item)
+        else:
+            categories = [cat.text for cat in item.findall("category") if cat.text]
+        
+        # clean ครั้งเดียว ใช้ทั้ง description (ตัด 500 ตัวอักษร) และ raw_text
+        cleaned = self._clean_html(description) if description else None
+        
+        rss_item = RSSItem(
+            title=self._clean_html(title),
+            link=link,
+            source=source_key,
+            source_name=source_name,
+            published_at=self._parse_date(pub_date),
+            description=cleaned[:500] if cleaned is not None else None,
+            raw_text=cleaned,
+            categories=categories,
+            author=author,
+            guid=guid,
+            reliability_score=reliability_score,
+        )
+        
+        self._add_to_cache(cache_key, rss_item)
+        return rss_item
     
-    def _parse_feed(self, xml_content: str, source_key: str) -> List[RSSItem]:
-        """แปลง XML เป็นรายการ RSSItem"""
-        items = []
-        source_info = self.sources.get(source_key, {})
+    def _build_atom_item(
+        self,
+        entry,
+        source_key: str,
+        source_name: str,
+        reliability_score: float
+    ) -> Optional[RSSItem]:
+        """แปลง element <entry> (Atom) เป็น RSSItem"""
+        title = entry.findtext(_ATOM_TITLE, "")
+        link_elem = entry.find(_ATOM_LINK)
+        link = link_elem.get("href", "") if link_elem is not None else ""
         
-        try:
-            root = ET.fromstring(xml_content)
-            
-            # Find all items (RSS 2.0)
-            for item in root.findall(".//item"):
-                title = item.findtext("title", "")
-                link = item.findtext("link", "")
-                
-                if not title or not link:
-                    continue
-                
-                description = item.findtext("description", "")
-                pub_date = item.findtext("pubDate", "")
-                author = item.findtext("author", "") or item.findtext("{http://purl.org/dc/elements/1.1/}creator", "")
-                guid = item.findtext("guid", "")
-                
-                # Parse categories
-                categories = [cat.text for cat in item.findall("category") if cat.text]
-                
-                rss_item = RSSItem(
-                    title=self._clean_html(title),
-                    link=link,
-                    source=source_key,
-                    source_name=source_info.get("name", source_key),
-                    published_at=self._parse_date(pub_date),
-                    description=self._clean_html(description)[:500] if description else None,
-                    raw_text=self._clean_html(description) if description else None,
-                    categories=categories,
-                    author=author,
-                    guid=guid,
-                    reliability_score=source_info.get("reliability_score", 0.5),
-                )
-                
-                items.append(rss_item)
-            
-            # Try Atom format if no items found
-            if not items:
-                ns = {"atom": "http://www.w3.org/2005/Atom"}
-                for entry in root.findall(".//atom:entry", ns):
-                    title = entry.findtext("atom:title", "", ns)
-                    link_elem = entry.find("atom:link", ns)
-                    link = link_elem.get("href", "") if link_elem is not None else ""
-                    
-                    if not title or not link:
-                        continue
-                    
-                    content = entry.findtext("atom:content", "", ns) or entry.findtext("atom:summary", "", ns)
-                    updated = entry.findtext("atom:updated", "", ns) or entry.findtext("atom:published", "", ns)
-                    author_elem = entry.find("atom:author/atom:name", ns)
-                    author = author_elem.text if author_elem is not None else ""
-                    
-                    rss_item = RSSItem(
-                        title=self._clean_html(title),
-                        link=link,
-                        source=source_key,
-                        source_name=source_info.get("name", source_key),
-                        published_at=self._parse_date(updated),
-                        description=self._clean_html(content)[:500] if content else None,
-                        raw_text=self._clean_html(content) if content else None,
-                        categories=[],
-                        author=author,
-                        guid=link,
-                        reliability_score=source_info.get("reliability_score", 0.5),
-                    )
-                    
-                    items.append(rss_item)
+        if not title or not link:
+            return None
         
-        except ET.ParseError as e:
-            console.print(f"[red]❌ XML Parse Error ({source_key}): {e}[/red]")
-        except Exception as e:
-            console.print(f"[red]❌ Parse Error ({source_key}): {e}[/red]")
+        cache_key = _item_cache_key(source_key, link, link)
+        cached = self._get_cached_item(cache_key)
+        if cached is not None:
+            return cached
         
-        return items
+        content = entry.findtext(_ATOM_CONTENT, "") or entry.findtext(_ATOM_SUMMARY, "")
+        updated = entry.findtext(_ATOM_UPDATED, "") or entry.findtext(_ATOM_PUBLISHED, "")
+        # find ทีละชั้นด้วย tag ตรงๆ (ไม่ต้อง tokenize path "author/name")
+        author_elem = entry.find(_ATOM_AUTHOR)
+        name_elem = author_elem.find(_ATOM_NAME) if author_elem is not None else None
+        author = name_elem.text if name_elem is not None else ""
+        
+        cleaned = self._clean_html(content) if content else None
+        
+        rss_item = RSSItem(
+            title=self._clean_html(title),
+            link=link,
+            source=source_key,
+            source_name=source_name,
+            published_at=self._parse_date(updated),
+            description=cleaned[:500] if cleaned is not None else None,
+            raw_text=cleaned,
+            categories=[],
+            author=author,
+            guid=link,
+            reliability_score=reliability_score,
+        )
+        
+        self._add_to_cache(cache_key, rss_item)
+        return rss_item
+    
+    def _parse_feed(self, xml_content: str | bytes | Iterable[bytes], source_key: str) -> List[RSSItem]:
+        """
+        แปลง XML เป็นรายการ RSSItem
+        
+        รับได้ทั้งเอกสารทั้งก้อน (str/bytes) หรือ iterable ของ bytes chunks
+        (เช่น response.iter_content) ซึ่งจะถูกป้อนเข้า parser ทีละส่วนโดยไม่ต้องรวมเป็นก้อนเดียว
+        """
+        if isinstance(xml_content, str):
+            # lxml ไม่รับ str ที่มี encoding declaration
+            xml_content = xml_content.encode("utf-8")
+        if isinstance(xml_content, bytes):
+            xml_content = (xml_content,)
+        
+        stream = _FeedStream(self, source_key)
+        for chunk in xml_content:
+            stream.feed(chunk)
+        return stream.close()
+    
+    def _get_enabled_source(self, source_key: str) -> Optional[Dict]:
+        """คืนค่าข้อมูลแหล่ง RSS ถ้ามีและเปิดใช้งานอยู่ (None ถ้าต้องข้าม)"""
+        if source_key not in self.sources:
+            _get_console().print(f"[red]❌ ไม่พบแหล่ง RSS: {source_key}[/red]")
+            _get_console().print(f"[yellow]แหล่งที่รองรับ: {list(self.sources.keys())}[/yellow]")
+            return None
+        
+        source = self.sources[source_key]
+        
+        # ตรวจสอบว่าแหล่งนี้เปิดใช้งานหรือไม่
+        if not source.get("enabled", True):
+            if self.verbose:
+                _get_console().print(f"[yellow]⚠️ ข้าม {source['name']}: แหล่งนี้ถูกปิดการใช้งาน (disabled)[/yellow]")
+            return None
+        
+        if self.verbose:
+            _get_console().print(f"[cyan]📰 กำลังดึงข่าวจาก {source['name']}...[/cyan]")
+        
+        return source
+    
+    def _process_feed(
+        self,
+        source_key: str,
+        items: List[RSSItem],
+        days: int,
+        limit: Optional[int]
+    ) -> List[RSSItem]:
+        """กรองข่าวของแหล่งตามวันที่ และตัดตาม limit"""
+        # Filter by date
+        cutoff_date = datetime.now() - timedelta(days=days)
+        filtered_items = _filter_by_cutoff(
+            items,
+            cutoff_naive=cutoff_date,
+            cutoff_aware=cutoff_date.replace(tzinfo=timezone.utc),
+        )
+        
+        # Apply limit
+        if limit:
+            filtered_items = filtered_items[:limit]
+        
+        if self.verbose:
+            _get_console().print(f"[green]✅ ดึงข่าวจาก {self.sources[source_key]['name']} สำเร็จ: {len(filtered_items)} รายการ[/green]")
+        
+        return filtered_items
+    
+    def _warn_skipped(self, reason: str):
+        """แจ้งเตือนว่าแหล่งนี้ถูกข้าม (fail-open)"""
+        _get_console().print(f"[yellow]⚠️ คำเตือน: {reason} - ข้ามแหล่งนี้และดำเนินการต่อ[/yellow]")
     
     def fetch_source(
         self,
@@ -259,88 +813,142 @@ class RSSFeedParser:
         Returns:
             รายการข่าวจากแหล่งที่ระบุ
         """
-        if source_key not in self.sources:
-            console.print(f"[red]❌ ไม่พบแหล่ง RSS: {source_key}[/red]")
-            console.print(f"[yellow]แหล่งที่รองรับ: {list(self.sources.keys())}[/yellow]")
-            return []
-        
-        source = self.sources[source_key]
+        try:
+            return self._fetch_source(source_key, days, limit)
+        finally:
+            self._save_cache()
+    
+    def _fetch_source(self, source_key: str, days: int, limit: Optional[int]) -> List[RSSItem]:
+        """ดึงข่าวจากแหล่งเดียวโดยไม่บันทึก cache ลงไฟล์ (ผู้เรียกบันทึกเองตอนจบ)"""
+        import requests
         
-        # ตรวจสอบว่าแหล่งนี้เปิดใช้งานหรือไม่
-        if not source.get("enabled", True):
-            console.print(f"[yellow]⚠️ ข้าม {source['name']}: แหล่งนี้ถูกปิดการใช้งาน (disabled)[/yellow]")
+        source = self._get_enabled_source(source_key)
+        if source is None:
             return []
         
-        console.print(f"[cyan]📰 กำลังดึงข่าวจาก {source['name']}...[/cyan]")
-        
         try:
-            response = requests.get(source["url"], timeout=self.timeout)
-            response.raise_for_status()
-            
-            items = self._parse_feed(response.text, source_key)
+            url = source["url"]
+            if self._session is None:
+                self._session = _create_http_session()
             
-            # Filter by date
-            cutoff_date = datetime.now() - timedelta(days=days)
-            filtered_items = []
-            
-            for item in items:
-                if item.published_at:
-                    # Make cutoff_date timezone-aware if item.published_at is
-                    if item.published_at.tzinfo is not None:
-                        from datetime import timezone
-                        cutoff_aware = cutoff_date.replace(tzinfo=timezone.utc)
-                        if item.published_at >= cutoff_aware:
-                            filtered_items.append(item)
-                    else:
-                        if item.published_at >= cutoff_date:
-                            filtered_items.append(item)
+            with self._session.get(
+                url,
+                timeout=self.timeout,
+                headers=self._conditional_headers(url),
+                stream=True,
+            ) as response:
+                if response.status_code == 304:
+                    items = self._get_not_modified_items(source_key, url)
                 else:
-                    # Include items without date
-                    filtered_items.append(item)
+                    response.raise_for_status()
+                    # ป้อน bytes (decompress แล้ว) เข้า XML parser ทีละ chunk โดยตรง
+                    chunks = response.iter_content(chunk_size=_STREAM_CHUNK_SIZE)
+                    items = self._parse_feed(chunks, source_key)
+                    items = self._remember_feed(source_key, url, items, response.headers)
             
-            # Apply limit
-            if limit:
-                filtered_items = filtered_items[:limit]
-            
-            console.print(f"[green]✅ ดึงข่าวจาก {source['name']} สำเร็จ: {len(filtered_items)} รายการ[/green]")
-            
-            return filtered_items
+            return self._process_feed(source_key, items, days, limit)
             
         except requests.exceptions.Timeout:
-            console.print(f"[yellow]⚠️ คำเตือน: การเชื่อมต่อ {source['name']} หมดเวลา (timeout) - ข้ามแหล่งนี้และดำเนินการต่อ[/yellow]")
+            self._warn_skipped(f"การเชื่อมต่อ {source['name']} หมดเวลา (timeout)")
             return []
         except requests.exceptions.HTTPError as e:
             status_code = e.response.status_code if e.response is not None else 'N/A'
-            console.print(f"[yellow]⚠️ คำเตือน: {source['name']} ตอบกลับ HTTP {status_code} - ข้ามแหล่งนี้และดำเนินการต่อ[/yellow]")
+            self._warn_skipped(f"{source['name']} ตอบกลับ HTTP {status_code}")
             return []
         except requests.exceptions.RequestException as e:
-            console.print(f"[yellow]⚠️ คำเตือน: ไม่สามารถเชื่อมต่อ {source['name']} ได้ ({type(e).__name__}) - ข้ามแหล่งนี้และดำเนินการต่อ[/yellow]")
+            self._warn_skipped(f"ไม่สามารถเชื่อมต่อ {source['name']} ได้ ({type(e).__name__})")
             return []
         except ET.ParseError as e:
-            console.print(f"[yellow]⚠️ คำเตือน: ไม่สามารถแปลง XML จาก {source['name']} ได้ - ข้ามแหล่งนี้และดำเนินการต่อ[/yellow]")
+            self._warn_skipped(f"ไม่สามารถแปลง XML จาก {source['name']} ได้ ({e})")
             return []
         except Exception as e:
-            console.print(f"[yellow]⚠️ คำเตือน: เกิดข้อผิดพลาดกับ {source['name']} ({type(e).__name__}: {e}) - ข้ามแหล่งนี้และดำเนินการต่อ[/yellow]")
+            self._warn_skipped(f"เกิดข้อผิดพลาดกับ {source['name']} ({type(e).__name__}: {e})")
             return []
     
-    def fetch_all_sources(
+    def _create_async_session(self) -> "aiohttp.ClientSession":
+        """สร้าง aiohttp session (connection pool + DNS cache ใช้ร่วมกันทุกแหล่ง)"""
+        import aiohttp
+        
+        connector = aiohttp.TCPConnector(limit=16, ttl_dns_cache=300)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+    
+    async def fetch_source_async(
         self,
+        source_key: str,
         days: int = 7,
-        limit_per_source: Optional[int] = None,
-        sources: Optional[List[str]] = None
-    ) -> tuple[List[RSSItem], Dict[str, Any]]:
+        limit: Optional[int] = None,
+        session: Optional["aiohttp.ClientSession"] = None
+    ) -> List[RSSItem]:
         """
-        ดึงข่าวจากทุกแหล่ง RSS (แบบ fail-open)
+        ดึงข่าวจากแหล่ง RSS เฉพาะ (async)
         
         Args:
+            source_key: key ของแหล่ง RSS
             days: จำนวนวันย้อนหลังที่ต้องการ
-            limit_per_source: จำนวนข่าวสูงสุดต่อแหล่ง
-            sources: รายการแหล่งที่ต้องการ (ถ้าไม่ระบุจะดึงทั้งหมด)
+            limit: จำนวนข่าวสูงสุดที่ต้องการ
+            session: aiohttp session ที่ใช้ร่วมกัน (ถ้าไม่ระบุจะสร้างใหม่)
             
         Returns:
-            tuple: (รายการข่าว, สถิติการดึงข้อมูล)
+            รายการข่าวจากแหล่งที่ระบุ
         """
-        all_items = []
+        try:
+            if session is None:
+                async with self._create_async_session() as own_session:
+                    return await self._fetch_source_async(source_key, days, limit, own_session)
+            return await self._fetch_source_async(source_key, days, limit, session)
+        finally:
+            self._save_cache()
+    
+    async def _fetch_source_async(
+        self,
+        source_key: str,
+        days: int,
+        limit: Optional[int],
+        session: "aiohttp.ClientSession"
+    ) -> List[RSSItem]:
+        """ดึงข่าวจากแหล่งเดียว (async) โดยไม่บันทึก cache ลงไฟล์ (ผู้เรียกบันทึกเองตอนจบ)"""
+        import aiohttp
+        
+        source = self._get_enabled_source(source_key)
+        if source is None:
+            return []
+        
+        try:
+            url = source["url"]
+            async with session.get(url, headers=self._conditional_headers(url)) as response:
+                if response.status == 304:
+                    items = self._get_not_modified_items(source_key, url)
+                else:
+                    response.raise_for_status()
+                    stream = _FeedStream(self, source_key)
+                    async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+                        stream.feed(chunk)
+                    items = self._remember_feed(source_key, url, stream.close(), response.headers)
+            
+            return self._process_feed(source_key, items, days, limit)
+            
+        except asyncio.TimeoutError:
+            self._warn_skipped(f"การเชื่อมต่อ {source['name']} หมดเวลา (timeout)")
+            return []
+        except aiohttp.ClientResponseError as e:
+            self._warn_skipped(f"{source['name']} ตอบกลับ HTTP {e.status}")
+            return []
+        except aiohttp.ClientError as e:
+            self._warn_skipped(f"ไม่สามารถเชื่อมต่อ {source['name']} ได้ ({type(e).__name__})")
+            return []
+        except ET.ParseError as e:
+            self._warn_skipped(f"ไม่สามารถแปลง XML จาก {source['name']} ได้ ({e})")
+            return []
+        except Exception as e:
+            self._warn_skipped(f"เกิดข้อผิดพลาดกับ {source['name']} ({type(e).__name__}: {e})")
+            return []
+    
+    def _init_fetch_stats(self, sources: Optional[List[str]]) -> tuple[List[str], Dict[str, Any]]:
+        """เตรียมสถิติการดึงข้อมูล และคืนค่ารายการแหล่งที่เปิดใช้งาน"""
         source_keys = sources or list(self.sources.keys())
         
         # สถิติการดึงข้อมูล
@@ -360,11 +968,21 @@ class RSSFeedParser:
         for key in disabled_sources:
             stats["source_details"][key] = {"status": "disabled", "items": 0}
         
-        console.print(f"[cyan]📰 กำลังดึงข่าวจาก {len(enabled_sources)} แหล่ง (ข้าม {len(disabled_sources)} แหล่งที่ปิดใช้งาน)...[/cyan]")
+        if self.verbose:
+            _get_console().print(f"[cyan]📰 กำลังดึงข่าวจาก {len(enabled_sources)} แหล่ง (ข้าม {len(disabled_sources)} แหล่งที่ปิดใช้งาน)...[/cyan]")
         
-        for source_key in enabled_sources:
-            items = self.fetch_source(source_key, days=days, limit=limit_per_source)
-            
+        return enabled_sources, stats
+    
+    def _merge_fetch_results(
+        self,
+        enabled_sources: List[str],
+        results: List[List[RSSItem]],
+        stats: Dict[str, Any]
+    ) -> tuple[List[RSSItem], Dict[str, Any]]:
+        """รวมผลลัพธ์จากทุกแหล่ง อัพเดทสถิติ และเรียงตามวันที่"""
+        all_items = []
+        
+        for source_key, items in zip(enabled_sources, results):
             if items:
                 all_items.extend(items)
                 stats["successful_sources"] += 1
@@ -374,25 +992,130 @@ class RSSFeedParser:
                 stats["source_details"][source_key] = {"status": "failed", "items": 0}
         
         # Sort by published date (newest first)
-        all_items.sort(
-            key=lambda x: x.published_at or datetime.min,
-            reverse=True
-        )
+        all_items = _sort_newest_first(all_items)
         
-        # แสดงสรุปผล
+        # แสดงสรุปผล (ตารางเดียวแทนการ print ทีละแหล่ง)
         if stats["successful_sources"] > 0:
-            console.print(f"[green]✅ ดึงข่าวสำเร็จ: {len(all_items)} รายการ จาก {stats['successful_sources']}/{len(enabled_sources)} แหล่ง[/green]")
+            _get_console().print(self._build_summary_table(stats, len(all_items), len(enabled_sources)))
         else:
-            console.print(f"[red]❌ ไม่สามารถดึงข้อมูลจากแหล่งใดได้เลย[/red]")
+            _get_console().print(f"[red]❌ ไม่สามารถดึงข้อมูลจากแหล่งใดได้เลย[/red]")
         
+        return all_items, stats
+    
+    def fetch_all_sources(
+        self,
+        days: int = 7,
+        limit_per_source: Optional[int] = None,
+        sources: Optional[List[str]] = None
+    ) -> tuple[List[RSSItem], Dict[str, Any]]:
+        """
+        ดึงข่าวจากทุกแหล่ง RSS (แบบ fail-open)
+        
+        ดึงทุกแหล่งพร้อมกันผ่าน fetch_all_sources_async หากถูกเรียกจากภายใน
+        event loop ที่กำลังทำงานอยู่ (asyncio.run ซ้อนกันไม่ได้) จะดึงทีละแหล่งแทน
+        
+        Args:
+            days: จำนวนวันย้อนหลังที่ต้องการ
+            limit_per_source: จำนวนข่าวสูงสุดต่อแหล่ง
+            sources: รายการแหล่งที่ต้องการ (ถ้าไม่ระบุจะดึงทั้งหมด)
+            
+        Returns:
+            tuple: (รายการข่าว, สถิติการดึงข้อมูล)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(
+                self.fetch_all_sources_async(
+                    days=days,
+                    limit_per_source=limit_per_source,
+                    sources=sources,
+                )
+            )
+        
+        enabled_sources, stats = self._init_fetch_stats(sources)
+        
+        try:
+            results = [
+                self._fetch_source(source_key, days, limit_per_source)
+                for source_key in enabled_sources
+            ]
+        finally:
+            # บันทึก cache ครั้งเดียวหลังดึงครบทุกแหล่ง
+            self._save_cache()
+        
+        return self._merge_fetch_results(enabled_sources, results, stats)
+    
+    async def fetch_all_sources_async(
+        self,
+        days: int = 7,
+        limit_per_source: Optional[int] = None,
+        sources: Optional[List[str]] = None
+    ) -> tuple[List[RSSItem], Dict[str, Any]]:
+        """
+        ดึงข่าวจากทุกแหล่ง RSS พร้อมกัน (async, fail-open)
+        
+        ทุกแหล่งใช้ aiohttp session เดียวกัน เวลารวมจึงเท่ากับแหล่งที่ช้าที่สุด
+        แทนที่จะเป็นผลรวมของทุกแหล่ง
+        
+        Args:
+            days: จำนวนวันย้อนหลังที่ต้องการ
+            limit_per_source: จำนวนข่าวสูงสุดต่อแหล่ง
+            sources: รายการแหล่งที่ต้องการ (ถ้าไม่ระบุจะดึงทั้งหมด)
+            
+        Returns:
+            tuple: (รายการข่าว, สถิติการดึงข้อมูล)
+        """
+        enabled_sources, stats = self._init_fetch_stats(sources)
+        
+        try:
+            async with self._create_async_session() as session:
+                results = await asyncio.gather(
+                    *(
+                        self._fetch_source_async(source_key, days, limit_per_source, session)
+                        for source_key in enabled_sources
+                    ),
+                    return_exceptions=True,
+                )
+        finally:
+            # บันทึก cache ครั้งเดียวหลังดึงครบทุกแหล่ง
+            self._save_cache()
+        
+        results = [[] if isinstance(r, BaseException) else r for r in results]
+        
+        return self._merge_fetch_results(enabled_sources, results, stats)
+    
+    def _build_summary_table(self, stats: Dict[str, Any], total_items: int, enabled_count: int) -> "Table":
+        """สร้างตารางสรุปผลการดึงข่าวจากทุกแหล่ง"""
+        from rich.table import Table
+        
+        title = f"📰 ดึงข่าวสำเร็จ: {total_items} รายการ จาก {stats['successful_sources']}/{enabled_count} แหล่ง"
         if stats["failed_sources"] > 0:
-            console.print(f"[yellow]⚠️ แหล่งที่ล้มเหลว: {stats['failed_sources']} แหล่ง[/yellow]")
+            title += f" (ล้มเหลว {stats['failed_sources']} แหล่ง)"
         
-        return all_items, stats
+        table = Table(title=title)
+        table.add_column("แหล่ง", style="cyan")
+        table.add_column("สถานะ")
+        table.add_column("รายการ", justify="right")
+        
+        status_styles = {
+            "success": "[green]success[/green]",
+            "failed": "[yellow]failed[/yellow]",
+            "disabled": "[dim]disabled[/dim]",
+        }
+        
+        for key, detail in stats["source_details"].items():
+            table.add_row(
+                self.sources.get(key, {}).get("name", key),
+                status_styles.get(detail["status"], detail["status"]),
+                str(detail["items"]),
+            )
+        
+        return table
     
     def get_available_sources(self) -> Dict[str, Dict]:
         """คืนค่ารายการแหล่ง RSS ที่รองรับ"""
-        return self.sources.copy()
+        return dict(self.sources)
     
     def add_source(
         self,
@@ -416,17 +1139,17 @@ class RSSFeedParser:
             True หากเพิ่มสำเร็จ
         """
         if reliability_score < 0 or reliability_score > 1:
-            console.print("[red]❌ reliability_score ต้องอยู่ระหว่าง 0.0-1.0[/red]")
+            _get_console().print("[red]❌ reliability_score ต้องอยู่ระหว่าง 0.0-1.0[/red]")
             return False
         
-        self.sources[key] = {
+        self._mutable_sources()[key] = {
             "name": name,
             "url": url,
             "reliability_score": reliability_score,
             "category": category,
         }
         
-        console.print(f"[green]✅ เพิ่มแหล่ง RSS: {name}[/green]")
+        _get_console().print(f"[green]✅ เพิ่มแหล่ง RSS: {name}[/green]")
         return True
     
     def remove_source(self, key: str) -> bool:
@@ -440,9 +1163,9 @@ class RSSFeedParser:
             True หากลบสำเร็จ
         """
         if key in self.sources:
-            del self.sources[key]
-            console.print(f"[green]✅ ลบแหล่ง RSS: {key}[/green]")
+            del self._mutable_sources()[key]
+            _get_console().print(f"[green]✅ ลบแหล่ง RSS: {key}[/green]")
             return True
         
-        console.print(f"[yellow]⚠️ ไม่พบแหล่ง RSS: {key}[/yellow]")
+        _get_console().print(f"[yellow]⚠️ ไม่พบแหล่ง RSS: {key}[/yellow]")
         return False
@@ -0,0 +1,91 @@
+"""
+Natural-key Cache - จำ primary key ของแถวที่ค้นด้วย natural key
+(เช่น youtube_id, source_url, anilist_id, (video_id, date)) เพื่อให้การค้นซ้ำใช้ session.get()
+
+session.get() ไม่ยิง SQL ถ้าแถวอยู่ใน identity map แล้ว และเป็น lookup ด้วย primary key ถ้ายังไม่อยู่
+cache เก็บแค่ id (ไม่เก็บ ORM object ข้าม session) และตรวจ natural key ซ้ำทุกครั้งที่ใช้
+ค่าที่ล้าสมัย (แถวถูกลบ / เปลี่ยน key / rollback) จึงถูกทิ้งเองโดยไม่ต้องดัก event
+"""
+
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+
+class NaturalKeyCache:
+    """LRU cache แบบมีอายุ (TTL) สำหรับ mapping natural key -> primary key"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """คืนค่า primary key ที่จำไว้ (None ถ้าไม่มีหรือหมดอายุ)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """จำ primary key ของ natural key"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """ลบ key ออกจาก cache"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """ล้าง cache ทั้งหมด"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Global instance ใช้ร่วมกันทุก repository
+natural_key_cache = NaturalKeyCache()
+
+
+def cached_lookup(model, *attrs: str) -> Callable:
+    """
+    Decorator สำหรับ method ของ repository ที่ค้นแถวเดียวด้วย natural key: method(self, *values)
+    
+    Args:
+        model: ORM model class ที่ method คืนค่า
+        attrs: ชื่อ attribute ที่เป็น natural key (หลายตัวสำหรับ key แบบ composite เช่น video_id + date)
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(self, *values):
+            key = (model.__tablename__, attrs, values)
+            pk = natural_key_cache.get(key)
+            if pk is not None:
+                instance = self.session.get(model, pk)
+                if instance is not None and all(
+                    getattr(instance, attr) == value for attr, value in zip(attrs, values)
+                ):
+                    return instance
+                natural_key_cache.pop(key)
+            
+            instance = fn(self, *values)
+            if instance is not None:
+                natural_key_cache.set(key, instance.id)
+            return instance
+        return wrapper
+    return decorator
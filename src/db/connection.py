@@ -3,17 +3,60 @@ Database Connection Module - จัดการการเชื่อมต่
 รองรับ SQLite และสามารถขยายไปยัง database อื่นได้
 """
 
+import asyncio
 import os
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Callable, Generator, TypeVar, TYPE_CHECKING
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlalchemy.orm import sessionmaker, Session
-from rich.console import Console
 
-console = Console()
+from src.db import query_log as _query_log
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# orjson (optional) encode/decode คอลัมน์ JSON ใน C แทน stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+R = TypeVar("R")
+
+# Rich console สร้างเมื่อใช้งานครั้งแรก (ไม่ต้องตรวจ terminal ตอน import)
+_console: "Console | None" = None
+
+
+def _get_console() -> "Console":
+    """คืนค่า Rich console (สร้างครั้งแรกที่เรียกใช้)"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """ตั้งค่า PRAGMA ให้ทุก connection ใหม่ของ SQLite"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # WAL: อ่านได้พร้อมกับการเขียน, synchronous=NORMAL: ไม่ต้อง fsync ทุก commit
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64MB
+    cursor.close()
+
+
+def _json_serializer(obj) -> str:
+    """serialize ค่า JSON column ด้วย orjson (รองรับ dict key ที่ไม่ใช่ str เหมือน json.dumps)"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
 
 class DatabaseConnection:
     """
@@ -34,25 +77,45 @@ class DatabaseConnection:
         db_dir = Path(db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
 
+        if db_path in (":memory:", ""):
+            # In-memory DB: ทุก session ต้องใช้ connection เดียวกัน (ไม่เช่นนั้นจะเห็นคนละ DB)
+            engine_kwargs = {"poolclass": StaticPool}
+        else:
+            engine_kwargs = {
+                "poolclass": QueuePool,
+                "pool_size": 10,
+                "max_overflow": 20,
+                "pool_recycle": 1800,
+                "pool_reset_on_return": "rollback",
+            }
+
+        if orjson is not None:
+            engine_kwargs["json_serializer"] = _json_serializer
+            engine_kwargs["json_deserializer"] = orjson.loads
+
         DatabaseConnection._engine = create_engine(
             self.db_url,
             echo=self.echo,
             connect_args={"check_same_thread": False},  # สำหรับ SQLite
             pool_pre_ping=True,
+            query_cache_size=1200,  # default 500 - เผื่อ statement templates ของทุก model
+            **engine_kwargs,
         )
 
-        @event.listens_for(DatabaseConnection._engine, "connect")
-        def set_sqlite_pragma(dbapi_connection, connection_record):
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
+        # ลงทะเบียน PRAGMA listener ครั้งเดียวต่อ engine
+        if not event.contains(DatabaseConnection._engine, "connect", _set_sqlite_pragma):
+            event.listen(DatabaseConnection._engine, "connect", _set_sqlite_pragma)
+
+        # ตรวจ N+1 ตอนพัฒนา (เปิดด้วย DB_QUERY_LOG_N1_THRESHOLD)
+        if _query_log.query_log is not None:
+            _query_log.query_log.attach(DatabaseConnection._engine)
 
         DatabaseConnection._SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
             bind=DatabaseConnection._engine,
         )
-        console.print(f"[green]✓[/green] เชื่อมต่อฐานข้อมูลสำเร็จ: {db_path}")
+        _get_console().print(f"[green]✓[/green] เชื่อมต่อฐานข้อมูลสำเร็จ: {db_path}")
 
     def get_engine(self) -> Engine:
         """คืนค่า engine"""
@@ -60,6 +123,10 @@ class DatabaseConnection:
             self._initialize_engine()
         return DatabaseConnection._engine
 
+    def get_pool_stats(self) -> str:
+        """คืนค่าสถานะ connection pool (ขนาด, checked in/out, overflow)"""
+        return self.get_engine().pool.status()
+
     def get_session(self) -> Session:
         """คืนค่า session"""
         if DatabaseConnection._SessionLocal is None:
@@ -68,24 +135,59 @@ class DatabaseConnection:
 
     @contextmanager
     def session_scope(self) -> Generator[Session, None, None]:
-        """Context manager สำหรับจัดการ database session"""
-        session = self.get_session()
-        try:
-            yield session
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            console.print(f"[red]✗[/red] Database error: {e}")
-            raise
-        finally:
-            session.close()
+        """Context manager สำหรับจัดการ database session (หนึ่ง scope ของการตรวจ N+1)"""
+        with _query_log.query_scope("session_scope"):
+            session = self.get_session()
+            try:
+                yield session
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                _get_console().print(f"[red]✗[/red] Database error: {e}")
+                raise
+            finally:
+                session.close()
+
+    async def run_in_session(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """
+        เรียก fn(session, *args, **kwargs) ใน session_scope บน worker thread (สำหรับโค้ด async)
+        
+        event loop ไม่ถูก block ระหว่างรอ query และหลายงานรันพร้อมกันได้ตามขนาด connection pool
+        ค่าที่คืนควรเป็นข้อมูลธรรมดา (ไม่ใช่ ORM object) เพราะ session ถูกปิดหลัง fn จบ
+        
+        ตัวอย่าง:
+            news = await db.run_in_session(
+                lambda s: [item.title for item in ResearchItemRepository(s).get_recent_news()]
+            )
+        """
+        def _run() -> R:
+            with self.session_scope() as session:
+                return fn(session, *args, **kwargs)
+        
+        return await asyncio.to_thread(_run)
+
+    def bulk_insert(self, model, rows: list[dict]) -> int:
+        """
+        Insert หลายแถวใน transaction เดียว (ดู Base.bulk_insert)
+        
+        Args:
+            model: ORM model class เช่น ResearchItem
+            rows: list ของ dict ที่ key ตรงกับชื่อ column
+            
+        Returns:
+            จำนวนแถวที่ insert
+        """
+        if not rows:
+            return 0
+        with self.session_scope() as session:
+            return model.bulk_insert(session, rows)
 
     def create_tables(self):
         """สร้าง tables ทั้งหมด"""
         from src.db.models import Base
         engine = self.get_engine()
         Base.metadata.create_all(bind=engine)
-        console.print("[green]✓[/green] สร้าง tables ทั้งหมดสำเร็จ")
+        _get_console().print("[green]✓[/green] สร้าง tables ทั้งหมดสำเร็จ")
 
     def reset_database(self):
         """ลบและสร้างฐานข้อมูลใหม่"""
@@ -100,11 +202,15 @@ class DatabaseConnection:
         db_file = Path(db_path)
         if db_file.exists():
             db_file.unlink()
-            console.print(f"[yellow]![/yellow] ลบฐานข้อมูลเดิม: {db_path}")
+            _get_console().print(f"[yellow]![/yellow] ลบฐานข้อมูลเดิม: {db_path}")
+        
+        # ไฟล์ WAL / shared-memory ที่อาจค้างอยู่
+        for suffix in ("-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
         
         # สร้างใหม่
         Base.metadata.create_all(bind=engine)
-        console.print("[green]✓[/green] รีเซ็ตฐานข้อมูลสำเร็จ")
+        _get_console().print("[green]✓[/green] รีเซ็ตฐานข้อมูลสำเร็จ")
 
     @staticmethod
     def close_db():
@@ -113,7 +219,7 @@ class DatabaseConnection:
             DatabaseConnection._engine.dispose()
             DatabaseConnection._engine = None
             DatabaseConnection._SessionLocal = None
-            console.print("[green]✓[/green] ปิดการเชื่อมต่อฐานข้อมูลสำเร็จ")
+            _get_console().print("[green]✓[/green] ปิดการเชื่อมต่อฐานข้อมูลสำเร็จ")
 
 
 # Global instance สำหรับใช้งานทั่วไป
@@ -164,6 +270,31 @@ def get_engine() -> Engine:
     return _db_connection.get_engine()
 
 
+def get_pool_stats() -> str:
+    """
+    ดึงสถานะ connection pool ปัจจุบัน
+    
+    Returns:
+        ข้อความสถานะจาก engine.pool.status()
+    """
+    global _db_connection
+    if _db_connection is None:
+        raise RuntimeError("ยังไม่ได้ initialize ฐานข้อมูล - เรียก init_db() ก่อน")
+    return _db_connection.get_pool_stats()
+
+
+def get_query_stats() -> dict | None:
+    """
+    ดึงสถิติ SQL statements และ N+1 ที่ตรวจพบ (ดู src/db/query_log.py)
+    
+    Returns:
+        dict จาก QueryLog.get_stats() หรือ None ถ้าไม่ได้ตั้ง DB_QUERY_LOG_N1_THRESHOLD
+    """
+    if _query_log.query_log is None:
+        return None
+    return _query_log.query_log.get_stats()
+
+
 @contextmanager
 def session_scope() -> Generator[Session, None, None]:
     """
@@ -178,3 +309,14 @@ def session_scope() -> Generator[Session, None, None]:
     
     with _db_connection.session_scope() as session:
         yield session
+
+
+async def run_in_session(fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """
+    เรียก fn(session, ...) บน worker thread ผ่าน global connection (ดู DatabaseConnection.run_in_session)
+    """
+    global _db_connection
+    if _db_connection is None:
+        raise RuntimeError("ยังไม่ได้ initialize ฐานข้อมูล - เรียก init_db() ก่อน")
+    
+    return await _db_connection.run_in_session(fn, *args, **kwargs)
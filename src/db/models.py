@@ -1,14 +1,22 @@
 """
 Database Models - โมเดลฐานข้อมูลทั้งหมด
-รวม tables: videos, daily_metrics, research_items, content_ideas, playbook_rules, runs_log
+รวม tables: videos, daily_metrics, research_items, content_ideas, playbook_rules, runs_log, tags, video_tags,
+rule_sample_videos, run_stats_daily
 """
 
-from datetime import datetime
-from typing import Optional, List
-from enum import Enum
+import os
+import time
+import uuid
+import zlib
+from datetime import date, datetime
+from typing import Optional, List, Tuple, Type
+from enum import StrEnum
 
 from sqlalchemy import (
     Column,
+    BigInteger,
+    Computed,
+    DDL,
     Integer,
     String,
     Text,
@@ -16,17 +24,249 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     Date,
+    Enum as SAEnum,
     ForeignKey,
     JSON,
     Index,
+    LargeBinary,
+    Table,
     UniqueConstraint,
+    Uuid,
+    bindparam,
+    event,
+    insert,
+    select,
+    text,
 )
-from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import DeclarativeBase, Session, relationship, Mapped, mapped_column
+from sqlalchemy.sql.functions import FunctionElement
+
+__all__ = [
+    "Base",
+    "Video",
+    "DailyMetric",
+    "ResearchItem",
+    "ContentIdea",
+    "PlaybookRule",
+    "RunLog",
+    "RunStatsDaily",
+    "Tag",
+    "video_tags",
+    "rule_sample_videos",
+    "VIDEO_SEARCH_TABLE",
+    "VIDEO_SEARCH_DDL",
+    "NEWS_SOURCE_PATTERN",
+    "ANIME_SOURCE_PATTERN",
+    "RUN_STATS_DDL",
+    "VideoStatus",
+    "ResearchStatus",
+    "CompetitionLevel",
+    "IdeaStatus",
+    "Priority",
+    "RunStatus",
+    "utcnow",
+    "seconds_since",
+    "CompressedText",
+    "uuid7",
+    "MODELS",
+    "get_all_models",
+]
+
+
+class utcnow(FunctionElement):
+    """
+    เวลาปัจจุบัน (UTC) คำนวณฝั่งฐานข้อมูล - ใช้เป็น server_default / onupdate
+    ไม่ต้องเรียก datetime.utcnow() และไม่ต้องส่ง parameter ทุกแถวที่ insert
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _compile_utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP ของ SQLite ละเอียดแค่วินาที - ใช้ STRFTIME เพื่อเก็บมิลลิวินาทีด้วย
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))"
+
+
+class seconds_since(FunctionElement):
+    """
+    จำนวนวินาทีตั้งแต่ timestamp ที่กำหนดจนถึงเวลาปัจจุบันของฐานข้อมูล (เช่น duration ของ run)
+    ใช้ในคำสั่งเดียวกับ utcnow() ได้ - "now" ของทั้งสองค่าเป็นเวลาเดียวกันภายใน statement
+    """
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(seconds_since)
+def _compile_seconds_since(element, compiler, **kw):
+    return f"EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - {compiler.process(element.clauses, **kw)}))"
+
+
+@compiles(seconds_since, "sqlite")
+def _compile_seconds_since_sqlite(element, compiler, **kw):
+    return f"((JULIANDAY('now') - JULIANDAY({compiler.process(element.clauses, **kw)})) * 86400.0)"
+
+
+class CompressedText(TypeDecorator):
+    """
+    ข้อความยาวที่ซ้ำกันเยอะ (เช่น traceback) - เก็บเป็น BLOB บีบอัดด้วย zlib
+    ฝั่ง Python ยังเป็น str; แถวเก่าที่เก็บเป็น TEXT อ่านได้ตามเดิม
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), 6)
+    
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return zlib.decompress(value).decode("utf-8")
+
+
+def uuid7(timestamp_ms: Optional[int] = None) -> uuid.UUID:
+    """
+    สร้าง UUID version 7 (RFC 9562): 48-bit unix timestamp (ms) + 74 random bits
+    เรียงตามเวลาที่สร้าง - แถวใหม่ต่อท้าย index แทนการกระจายแบบ uuid4
+    
+    Args:
+        timestamp_ms: เวลา (ms) ที่ใช้เป็น prefix (default = ตอนนี้)
+    """
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76  # version
+    value |= ((rand >> 62) & 0xFFF) << 64  # rand_a (12 bits)
+    value |= 0b10 << 62  # variant
+    value |= rand & ((1 << 62) - 1)  # rand_b (62 bits)
+    return uuid.UUID(int=value)
+
+
+def _new_run_id() -> str:
+    """run_id ใหม่ของ RunLog (UUIDv7 แบบ string)"""
+    return str(uuid7())
+
+
+class VideoStatus(StrEnum):
+    """สถานะของวิดีโอ"""
+    ACTIVE = "active"
+    ARCHIVED = "archived"
+    DELETED = "deleted"
+
+
+class ResearchStatus(StrEnum):
+    """สถานะของ research item"""
+    NEW = "new"
+    REVIEWED = "reviewed"
+    APPLIED = "applied"
+    ARCHIVED = "archived"
+
+
+class CompetitionLevel(StrEnum):
+    """ระดับการแข่งขันของหัวข้อ"""
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+class IdeaStatus(StrEnum):
+    """สถานะของ content idea"""
+    DRAFT = "draft"
+    IN_PROGRESS = "in_progress"
+    SCHEDULED = "scheduled"
+    PUBLISHED = "published"
+    ARCHIVED = "archived"
+
+
+class Priority(StrEnum):
+    """ความสำคัญของ content idea"""
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+class RunStatus(StrEnum):
+    """สถานะของ run"""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+def _enum_type(enum_cls: type, name: str) -> SAEnum:
+    """
+    Column type สำหรับ StrEnum - เก็บ value (เช่น "active") ไม่ใช่ชื่อ member
+    PostgreSQL ได้ native ENUM, SQLite ได้ VARCHAR; ค่าที่ไม่อยู่ใน enum จะถูกปฏิเสธตั้งแต่ฝั่ง Python
+    """
+    return SAEnum(
+        enum_cls,
+        name=name,
+        values_callable=lambda members: [m.value for m in members],
+        validate_strings=True,
+    )
 
 
 class Base(DeclarativeBase):
     """Base class สำหรับ models ทั้งหมด"""
-    pass
+    
+    # ทุก model มี server default (timestamps / computed columns) - ดึงค่ากลับมาพร้อม INSERT/UPDATE
+    # ด้วย RETURNING ในรอบเดียว (dialect ที่ไม่รองรับ RETURNING จะ SELECT ตามเอง)
+    __mapper_args__ = {"eager_defaults": True}
+    
+    @classmethod
+    def bulk_insert(cls, session: Session, rows: List[dict]) -> int:
+        """
+        Insert หลายแถวด้วย INSERT statement เดียวแบบ executemany
+        ไม่สร้าง ORM object และไม่ผ่าน unit-of-work (เร็วกว่า session.add ทีละแถวมาก)
+        
+        Args:
+            session: SQLAlchemy Session (commit เองภายหลัง)
+            rows: list ของ dict ที่ key ตรงกับชื่อ column
+            
+        Returns:
+            จำนวนแถวที่ insert
+        """
+        if not rows:
+            return 0
+        session.execute(insert(cls), rows)
+        return len(rows)
+
+
+# Many-to-many: videos <-> tags (normalize จาก Video.tags JSON เพื่อค้นหาวิดีโอตาม tag ผ่าน index)
+video_tags = Table(
+    "video_tags",
+    Base.metadata,
+    Column("video_id", Integer, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # PK เป็น (video_id, tag_id) - index กลับด้านสำหรับ "วิดีโอที่มี tag X"
+    Index("ix_video_tags_reverse", "tag_id", "video_id"),
+)
+
+
+class Tag(Base):
+    """
+    ตาราง tags - ชื่อ tag ของวิดีโอ (ไม่ซ้ำกัน)
+    
+    ใช้ร่วมกับ video_tags แทนการ scan JSON ของ Video.tags ทุกแถว
+    """
+    __tablename__ = "tags"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    
+    def __repr__(self) -> str:
+        return f"<Tag(id={self.id}, name='{self.name}')>"
 
 
 class Video(Base):
@@ -42,41 +282,110 @@ class Video(Base):
     
     # YouTube Video Info
     youtube_id: Mapped[str] = mapped_column(String(20), unique=True, nullable=False, index=True)
-    title: Mapped[str] = mapped_column(String(500), nullable=False)
-    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    thumbnail_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    title: Mapped[str] = mapped_column(String(100), nullable=False)  # YouTube จำกัด title ที่ 100 ตัวอักษร
+    # description / notes ยาวได้หลาย KB - โหลดเมื่อเข้าถึงเท่านั้น (undefer_group("body") ถ้าต้องใช้ทั้งชุด)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="body")
+    thumbnail_url: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     
     # Video Metadata
-    channel_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True)
+    channel_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # index ผ่าน ix_videos_channel_published
     channel_name: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     category: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     tags: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # List of tags
     
-    # Video Stats (snapshot at creation)
+    # Video Stats (snapshot at creation) - BigInteger: ตัวนับสะสมเกิน 2^31 ได้ (วิดีโอไวรัล / impressions)
     duration_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    view_count: Mapped[int] = mapped_column(Integer, default=0)
-    like_count: Mapped[int] = mapped_column(Integer, default=0)
-    comment_count: Mapped[int] = mapped_column(Integer, default=0)
+    view_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    like_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    comment_count: Mapped[int] = mapped_column(BigInteger, default=0)
     
     # Publishing Info
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     is_published: Mapped[bool] = mapped_column(Boolean, default=True)
     
     # Internal Tracking
-    status: Mapped[str] = mapped_column(String(50), default="active")  # active, archived, deleted
-    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status: Mapped[VideoStatus] = mapped_column(_enum_type(VideoStatus, "video_status"), default=VideoStatus.ACTIVE)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="body")
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
+    
+    # Indexes
+    # (published_at, status): รายการวิดีโอล่าสุด / กรองตาม status ไม่ต้อง scan ทั้งตาราง
+    # postgresql_include มีผลเฉพาะ PostgreSQL (index-only scan) - SQLite ข้ามไป
+    __table_args__ = (
+        Index(
+            "ix_videos_published_status",
+            "published_at",
+            "status",
+            postgresql_include=["title", "view_count"],
+        ),
+        # (channel_id, published_at): WHERE channel_id = ? ORDER BY published_at DESC (get_by_channel)
+        # ใช้แทน index เดี่ยวของ channel_id ได้ด้วย (leading column)
+        Index(
+            "ix_videos_channel_published",
+            "channel_id",
+            "published_at",
+            postgresql_include=["title", "view_count"],
+        ),
+        # (status, view_count): WHERE status = ? ORDER BY view_count (get_top_performing)
+        # ใช้ composite แทน partial index เพราะ SQLite ใช้ partial index กับ bound parameter ไม่ได้
+        Index("ix_videos_status_view_count", "status", "view_count"),
+    )
     
     # Relationships
-    daily_metrics: Mapped[List["DailyMetric"]] = relationship("DailyMetric", back_populates="video", cascade="all, delete-orphan")
+    # lazy="raise": ห้าม lazy-load ทีละวิดีโอ (N+1) - ให้ใช้ selectinload(Video.daily_metrics)
+    # passive_deletes: ให้ ON DELETE CASCADE ของ DB ลบ metrics แทนการโหลดมาลบทีละแถว
+    daily_metrics: Mapped[List["DailyMetric"]] = relationship(
+        "DailyMetric",
+        back_populates="video",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,
+    )
+    # tags แบบ normalize (Video.tags JSON ยังเก็บไว้เป็นข้อมูลดิบจาก API)
+    normalized_tags: Mapped[List["Tag"]] = relationship(
+        "Tag",
+        secondary=video_tags,
+        lazy="raise",
+        passive_deletes=True,
+    )
     
     def __repr__(self) -> str:
         return f"<Video(id={self.id}, youtube_id='{self.youtube_id}', title='{self.title[:30]}...')>"
 
 
+# Statement ที่ใช้ซ้ำใน hot path - สร้างครั้งเดียว ส่งค่าผ่าน bindparam (ใช้ compiled cache ร่วมกัน)
+Video._select_by_youtube_id = select(Video).where(Video.youtube_id == bindparam("youtube_id"))
+
+
+# Full-text search ของ title/description (SQLite FTS5, external content = videos)
+# tokenizer trigram ค้นแบบ substring ได้เหมือน ILIKE '%q%' (รวมภาษาไทยที่ไม่มีช่องว่าง) แต่ใช้ index
+VIDEO_SEARCH_TABLE = "videos_fts"
+VIDEO_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+    "title, description, content='videos', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_ai AFTER INSERT ON videos BEGIN "
+    "INSERT INTO videos_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_ad AFTER DELETE ON videos BEGIN "
+    "INSERT INTO videos_fts(videos_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_au AFTER UPDATE OF title, description ON videos BEGIN "
+    "INSERT INTO videos_fts(videos_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO videos_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
+
+for _statement in VIDEO_SEARCH_DDL:
+    event.listen(Video.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Video.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {VIDEO_SEARCH_TABLE}").execute_if(dialect="sqlite"),
+)
+
+
 class DailyMetric(Base):
     """
     ตาราง daily_metrics - เก็บ metrics รายวันของแต่ละวิดีโอ
@@ -92,26 +401,34 @@ class DailyMetric(Base):
     video_id: Mapped[int] = mapped_column(Integer, ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
     
     # Date
-    date: Mapped[datetime] = mapped_column(Date, nullable=False, index=True)
+    date: Mapped[datetime] = mapped_column(Date, nullable=False)  # index ผ่าน ix_daily_metrics_date_video
     
     # Daily Stats
-    views: Mapped[int] = mapped_column(Integer, default=0)
-    likes: Mapped[int] = mapped_column(Integer, default=0)
-    dislikes: Mapped[int] = mapped_column(Integer, default=0)
-    comments: Mapped[int] = mapped_column(Integer, default=0)
-    shares: Mapped[int] = mapped_column(Integer, default=0)
+    views: Mapped[int] = mapped_column(BigInteger, default=0)
+    likes: Mapped[int] = mapped_column(BigInteger, default=0)
+    dislikes: Mapped[int] = mapped_column(BigInteger, default=0)
+    comments: Mapped[int] = mapped_column(BigInteger, default=0)
+    shares: Mapped[int] = mapped_column(BigInteger, default=0)
     
     # Engagement Metrics
     watch_time_minutes: Mapped[float] = mapped_column(Float, default=0.0)
     average_view_duration: Mapped[float] = mapped_column(Float, default=0.0)
     average_view_percentage: Mapped[float] = mapped_column(Float, default=0.0)
+    # (likes + comments) / views คำนวณโดยฐานข้อมูลตอนเขียน (STORED) - อ่าน/เรียง/index ได้เลย
+    engagement_rate: Mapped[float] = mapped_column(
+        Float,
+        Computed(
+            "CASE WHEN views > 0 THEN CAST(likes + comments AS FLOAT) / views ELSE 0 END",
+            persisted=True,
+        ),
+    )
     
     # Traffic Sources (JSON)
     traffic_sources: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     
     # Subscriber Impact
-    subscribers_gained: Mapped[int] = mapped_column(Integer, default=0)
-    subscribers_lost: Mapped[int] = mapped_column(Integer, default=0)
+    subscribers_gained: Mapped[int] = mapped_column(BigInteger, default=0)
+    subscribers_lost: Mapped[int] = mapped_column(BigInteger, default=0)
     
     # Revenue (if monetized)
     estimated_revenue: Mapped[float] = mapped_column(Float, default=0.0)
@@ -120,25 +437,44 @@ class DailyMetric(Base):
     # Impressions & CTR (จาก YouTube Analytics API)
     # impressions: จำนวนครั้งที่ thumbnail แสดงบน YouTube
     # impressions_ctr: Click-through rate เป็นเปอร์เซ็นต์ (เช่น 5.5 หมายถึง 5.5%)
-    impressions: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    impressions: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     impressions_ctr: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
     
     # Relationships
-    video: Mapped["Video"] = relationship("Video", back_populates="daily_metrics")
+    video: Mapped["Video"] = relationship("Video", back_populates="daily_metrics", lazy="raise")
     
     # Constraints
     __table_args__ = (
+        # unique index ของ (video_id, date) ใช้ทั้ง lookup รายวัน/ช่วงวันของวิดีโอ และเป็น ON CONFLICT target
         UniqueConstraint("video_id", "date", name="uq_video_date"),
-        Index("ix_daily_metrics_video_date", "video_id", "date"),
+        # metrics ช่วงวันที่ของทุกวิดีโอ (dashboard / weekly report)
+        Index(
+            "ix_daily_metrics_date_video",
+            "date",
+            "video_id",
+            postgresql_include=["views", "watch_time_minutes"],
+        ),
+        Index("ix_daily_metrics_engagement", "engagement_rate"),
     )
     
     def __repr__(self) -> str:
         return f"<DailyMetric(video_id={self.video_id}, date={self.date}, views={self.views})>"
 
 
+DailyMetric._select_by_video_date = select(DailyMetric).where(
+    DailyMetric.video_id == bindparam("video_id"),
+    DailyMetric.date == bindparam("date"),
+)
+
+
+# source ของข่าวจาก RSS / ข้อมูลอนิเมะจาก AniList (ใช้ทั้งใน partial index และ query - ต้องตรงกันทุกตัวอักษร)
+NEWS_SOURCE_PATTERN = "rss_%"
+ANIME_SOURCE_PATTERN = "anilist_%"
+
+
 class ResearchItem(Base):
     """
     ตาราง research_items - เก็บข้อมูลการวิจัยและ trends
@@ -154,12 +490,14 @@ class ResearchItem(Base):
     # Research Info
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     source: Mapped[str] = mapped_column(String(200), nullable=False)  # anilist, ann_rss, youtube_trending, google_trends, etc.
-    source_url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    source_url: Mapped[Optional[str]] = mapped_column(String(512), nullable=True, index=True)
     
     # Content
+    # summary (ไม่เกิน ~500 ตัวอักษร) ใช้ในหน้า list จึงโหลดตามปกติ
+    # summary_th / content (raw text) โหลดเมื่อเข้าถึง - undefer_group("content") ถ้าต้องใช้
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # English summary
-    summary_th: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Thai summary
-    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # raw_text
+    summary_th: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="content")  # Thai summary
+    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="content")  # raw_text
     keywords: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # List of keywords
     
     # Entity Linking (Anime specific)
@@ -175,28 +513,71 @@ class ResearchItem(Base):
     relevance_score: Mapped[float] = mapped_column(Float, default=0.0)
     trend_score: Mapped[float] = mapped_column(Float, default=0.0)
     reliability_score: Mapped[float] = mapped_column(Float, default=1.0)  # 0.0 - 1.0, source reliability
-    competition_level: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # low, medium, high
+    competition_level: Mapped[Optional[CompetitionLevel]] = mapped_column(
+        _enum_type(CompetitionLevel, "competition_level"), nullable=True
+    )
     
     # AniList specific fields
     anilist_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
     mal_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # MyAnimeList ID
     
     # Status
-    status: Mapped[str] = mapped_column(String(50), default="new")  # new, reviewed, applied, archived
+    status: Mapped[ResearchStatus] = mapped_column(
+        _enum_type(ResearchStatus, "research_status"), default=ResearchStatus.NEW
+    )
     is_actionable: Mapped[bool] = mapped_column(Boolean, default=False)
     is_linked: Mapped[bool] = mapped_column(Boolean, default=False)  # Entity linking completed
     
     # Timestamps
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # Original publish date
-    researched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    researched_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
+    
+    # Partial indexes: เก็บเฉพาะแถวที่ตรงเงื่อนไขและเรียงตามคอลัมน์ที่ ORDER BY แล้ว - อ่านแค่ LIMIT แถว
+    # SQLite ใช้ partial index ได้เมื่อเงื่อนไขใน query เป็นค่าคงที่ (Boolean == True/False ถูก render เป็น 1/0)
+    __table_args__ = (
+        # get_unlinked: WHERE is_linked = 0 ORDER BY created_at DESC
+        Index(
+            "ix_research_items_unlinked_created",
+            "created_at",
+            sqlite_where=text("is_linked = 0"),
+            postgresql_where=text("is_linked = false"),
+        ),
+        # get_actionable: WHERE is_actionable = 1 ORDER BY relevance_score DESC
+        Index(
+            "ix_research_items_actionable_relevance",
+            "relevance_score",
+            sqlite_where=text("is_actionable = 1"),
+            postgresql_where=text("is_actionable = true"),
+        ),
+        # get_recent_news: WHERE source LIKE 'rss_%' AND published_at >= ? ORDER BY published_at DESC
+        Index(
+            "ix_research_items_news_published",
+            "published_at",
+            sqlite_where=text(f"source LIKE '{NEWS_SOURCE_PATTERN}'"),
+            postgresql_where=text(f"source LIKE '{NEWS_SOURCE_PATTERN}'"),
+        ),
+        # get_trending: WHERE trend_score >= ? ORDER BY trend_score DESC - อ่านตาม index หยุดที่ LIMIT
+        Index("ix_research_items_trend_score", "trend_score"),
+        # get_anime_by_popularity: อนิเมะจาก AniList เรียงตาม trend_score
+        Index(
+            "ix_research_items_anime_trend",
+            "trend_score",
+            sqlite_where=text(f"source LIKE '{ANIME_SOURCE_PATTERN}' AND anilist_id IS NOT NULL"),
+            postgresql_where=text(f"source LIKE '{ANIME_SOURCE_PATTERN}' AND anilist_id IS NOT NULL"),
+        ),
+    )
     
     def __repr__(self) -> str:
         return f"<ResearchItem(id={self.id}, title='{self.title[:30]}...', source='{self.source}')>"
 
 
+ResearchItem._select_by_source_url = select(ResearchItem).where(ResearchItem.source_url == bindparam("source_url"))
+ResearchItem._select_by_anilist_id = select(ResearchItem).where(ResearchItem.anilist_id == bindparam("anilist_id"))
+
+
 class ContentIdea(Base):
     """
     ตาราง content_ideas - เก็บไอเดียเนื้อหา
@@ -218,8 +599,8 @@ class ContentIdea(Base):
     tags: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     
     # Priority & Status
-    priority: Mapped[str] = mapped_column(String(20), default="medium")  # high, medium, low
-    status: Mapped[str] = mapped_column(String(50), default="draft")  # draft, in_progress, scheduled, published, archived
+    priority: Mapped[Priority] = mapped_column(_enum_type(Priority, "idea_priority"), default=Priority.MEDIUM)
+    status: Mapped[IdeaStatus] = mapped_column(_enum_type(IdeaStatus, "idea_status"), default=IdeaStatus.DRAFT)
     
     # Planning
     target_audience: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
@@ -227,8 +608,9 @@ class ContentIdea(Base):
     scheduled_date: Mapped[Optional[datetime]] = mapped_column(Date, nullable=True)
     
     # Content Details
-    outline: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Structured outline
-    scripts: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # outline / scripts ใช้เฉพาะหน้ารายละเอียด - โหลดเมื่อเข้าถึง (undefer_group("body"))
+    outline: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, deferred=True, deferred_group="body")  # Structured outline
+    scripts: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="body")
     thumbnail_ideas: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Scoring
@@ -245,13 +627,23 @@ class ContentIdea(Base):
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     def __repr__(self) -> str:
         return f"<ContentIdea(id={self.id}, title='{self.title[:30]}...', status='{self.status}')>"
 
 
+# Many-to-many: playbook_rules <-> videos (วิดีโอตัวอย่างของกฎ - ตรงกับ PlaybookRule.sample_videos JSON)
+rule_sample_videos = Table(
+    "rule_sample_videos",
+    Base.metadata,
+    Column("rule_id", Integer, ForeignKey("playbook_rules.id", ondelete="CASCADE"), primary_key=True),
+    Column("video_id", Integer, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_rule_sample_videos_video", "video_id", "rule_id"),
+)
+
+
 class PlaybookRule(Base):
     """
     ตาราง playbook_rules - เก็บกฎการปรับปรุงตัวเอง
@@ -284,6 +676,13 @@ class PlaybookRule(Base):
     # Evidence
     supporting_data: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Data that supports this rule
     sample_videos: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Video IDs that demonstrate this rule
+    # วิดีโอเดียวกับ sample_videos ผ่าน rule_sample_videos - โหลดหลายกฎพร้อมกันด้วย selectinload
+    sample_video_list: Mapped[List["Video"]] = relationship(
+        "Video",
+        secondary=rule_sample_videos,
+        lazy="raise",
+        passive_deletes=True,
+    )
     
     # Status
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -294,10 +693,20 @@ class PlaybookRule(Base):
     parent_rule_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("playbook_rules.id", ondelete="SET NULL"), nullable=True)
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
     last_applied_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
+    # get_active_rules / get_high_confidence_rules: WHERE is_active = 1 ORDER BY confidence_score DESC
+    __table_args__ = (
+        Index(
+            "ix_playbook_rules_active_confidence",
+            "confidence_score",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active = true"),
+        ),
+    )
+    
     def __repr__(self) -> str:
         return f"<PlaybookRule(id={self.id}, name='{self.name}', confidence={self.confidence_score:.2f})>"
 
@@ -314,15 +723,16 @@ class RunLog(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     
     # Run Info
-    run_id: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
+    # UUIDv7 - PostgreSQL ได้ native UUID, SQLite เก็บเป็น hex 32 ตัวอักษร
+    run_id: Mapped[str] = mapped_column(Uuid(as_uuid=False), unique=True, nullable=False, index=True, default=_new_run_id)
     run_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     # Types: daily_metrics_collection, weekly_analysis, research_update, content_generation, rule_learning, manual
     
     # Status
-    status: Mapped[str] = mapped_column(String(50), default="running")  # running, completed, failed, cancelled
+    status: Mapped[RunStatus] = mapped_column(_enum_type(RunStatus, "run_status"), default=RunStatus.RUNNING)
     
     # Timing
-    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     duration_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     
@@ -331,13 +741,14 @@ class RunLog(Base):
     result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Output/result data
     
     # Metrics
-    items_processed: Mapped[int] = mapped_column(Integer, default=0)
-    items_succeeded: Mapped[int] = mapped_column(Integer, default=0)
-    items_failed: Mapped[int] = mapped_column(Integer, default=0)
+    items_processed: Mapped[int] = mapped_column(BigInteger, default=0)
+    items_succeeded: Mapped[int] = mapped_column(BigInteger, default=0)
+    items_failed: Mapped[int] = mapped_column(BigInteger, default=0)
     
     # Error Handling
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    error_traceback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # traceback ยาวหลาย KB - บีบอัด และไม่โหลดในหน้า history
+    error_traceback: Mapped[Optional[str]] = mapped_column(CompressedText, nullable=True, deferred=True)
     
     # Context
     triggered_by: Mapped[str] = mapped_column(String(100), default="system")  # system, scheduler, user, api
@@ -348,7 +759,7 @@ class RunLog(Base):
     related_rules: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # List of rule IDs
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
     
     # Indexes
     __table_args__ = (
@@ -360,7 +771,68 @@ class RunLog(Base):
         return f"<RunLog(run_id='{self.run_id}', type='{self.run_type}', status='{self.status}')>"
 
 
+class RunStatsDaily(Base):
+    """
+    ตาราง run_stats_daily - ยอดรวมของ runs_log ต่อ run_type ต่อวัน (ตามวันที่ started_at)
+    
+    อัพเดทโดย triggers บน runs_log - get_run_stats() รวมแค่ไม่กี่แถวแทนการ scan runs_log
+    """
+    __tablename__ = "run_stats_daily"
+    
+    run_type: Mapped[str] = mapped_column(String(100), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_runs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_duration: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    duration_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # runs ที่มี duration_seconds
+    
+    def __repr__(self) -> str:
+        return f"<RunStatsDaily(run_type='{self.run_type}', day={self.day}, total_runs={self.total_runs})>"
+
+
+_RUN_STATS_ADD = (
+    "INSERT INTO run_stats_daily "
+    "(run_type, day, total_runs, completed, failed, total_duration, duration_count) "
+    "VALUES (new.run_type, date(new.started_at), 1, new.status = 'completed', new.status = 'failed', "
+    "COALESCE(new.duration_seconds, 0), new.duration_seconds IS NOT NULL) "
+    "ON CONFLICT (run_type, day) DO UPDATE SET "
+    "total_runs = total_runs + excluded.total_runs, "
+    "completed = completed + excluded.completed, "
+    "failed = failed + excluded.failed, "
+    "total_duration = total_duration + excluded.total_duration, "
+    "duration_count = duration_count + excluded.duration_count;"
+)
+_RUN_STATS_REMOVE = (
+    "UPDATE run_stats_daily SET "
+    "total_runs = total_runs - 1, "
+    "completed = completed - (old.status = 'completed'), "
+    "failed = failed - (old.status = 'failed'), "
+    "total_duration = total_duration - COALESCE(old.duration_seconds, 0), "
+    "duration_count = duration_count - (old.duration_seconds IS NOT NULL) "
+    "WHERE run_type = old.run_type AND day = date(old.started_at);"
+)
+
+# Triggers ของ SQLite ที่รักษา run_stats_daily ให้ตรงกับ runs_log (ทุกทางที่เขียน runs_log)
+RUN_STATS_DDL = (
+    f"CREATE TRIGGER IF NOT EXISTS runs_log_stats_ai AFTER INSERT ON runs_log BEGIN {_RUN_STATS_ADD} END",
+    f"CREATE TRIGGER IF NOT EXISTS runs_log_stats_ad AFTER DELETE ON runs_log BEGIN {_RUN_STATS_REMOVE} END",
+    "CREATE TRIGGER IF NOT EXISTS runs_log_stats_au "
+    "AFTER UPDATE OF run_type, started_at, status, duration_seconds ON runs_log "
+    f"BEGIN {_RUN_STATS_REMOVE} {_RUN_STATS_ADD} END",
+)
+
+for _statement in RUN_STATS_DDL:
+    event.listen(RunLog.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
 # Helper function to get all models
-def get_all_models() -> list:
-    """คืนค่า list ของ models ทั้งหมด"""
-    return [Video, DailyMetric, ResearchItem, ContentIdea, PlaybookRule, RunLog]
+# สร้างครั้งเดียวตอน import - get_all_models() ไม่ต้องสร้าง list ใหม่ทุกครั้ง
+MODELS: Tuple[Type[Base], ...] = (
+    Video, DailyMetric, ResearchItem, ContentIdea, PlaybookRule, RunLog, Tag, RunStatsDaily,
+)
+
+
+def get_all_models() -> Tuple[Type[Base], ...]:
+    """คืนค่า tuple ของ models ทั้งหมด"""
+    return MODELS
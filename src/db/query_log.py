@@ -0,0 +1,149 @@
+"""
+Query Log - นับ SQL statements ต่อ scope (หนึ่ง session_scope / หนึ่งงาน) และเตือนเมื่อพบ N+1
+(statement รูปแบบเดียวกันถูกยิงซ้ำหลายครั้งใน scope เดียว เช่น lazy-load หรือ get_* ใน loop)
+
+สำหรับตอนพัฒนาเท่านั้น - เปิดด้วย environment variable:
+    DB_QUERY_LOG_N1_THRESHOLD=3
+
+ดูสถิติสะสมได้จาก connection.get_query_stats()
+"""
+
+import os
+import re
+import traceback
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from typing import ContextManager, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+N1_THRESHOLD_ENV = "DB_QUERY_LOG_N1_THRESHOLD"
+
+# ค่าคงที่ในคำสั่ง SQL (string / ตัวเลข) และรายการ IN (?, ?, ...) ที่ยาวต่างกัน -> ?
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# frame ที่ไม่ใช่จุดเรียกจริง (SQLAlchemy / โค้ดชั้นฐานข้อมูล) - ข้ามเวลาหาตำแหน่งที่ทำให้เกิด N+1
+_INTERNAL_PATHS = (
+    f"{os.sep}sqlalchemy{os.sep}",
+    "<sqlalchemy",
+    f"{os.sep}src{os.sep}db{os.sep}",
+    f"{os.sep}contextlib.py",
+)
+
+
+def normalize_statement(statement: str) -> str:
+    """แปลง SQL เป็น template (ตัดค่าคงที่ / จำนวน parameter ใน IN) เพื่อจัดกลุ่ม statement ที่เหมือนกัน"""
+    template = _LITERAL_RE.sub("?", statement)
+    template = _IN_LIST_RE.sub("(?)", template)
+    return _WHITESPACE_RE.sub(" ", template).strip()
+
+
+def _caller_location() -> str:
+    """ตำแหน่งในโค้ดของแอปที่ทำให้เกิด statement (frame ล่าสุดที่ไม่ใช่ SQLAlchemy / src/db)"""
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        if not any(path in frame.filename for path in _INTERNAL_PATHS):
+            return f"{frame.filename}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class _Scope:
+    """statements ของ scope หนึ่ง (เช่น หนึ่ง session_scope)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts: Counter = Counter()
+
+
+_current_scope: ContextVar[Optional[_Scope]] = ContextVar("query_log_scope", default=None)
+
+
+class QueryLog:
+    """นับ statements ของ engine และบันทึก N+1 ที่พบ (ใช้ร่วมกันทุก thread)"""
+
+    def __init__(self, threshold: int = 3, history: int = 100):
+        self.threshold = threshold
+        self.total = 0
+        self.templates: Counter = Counter()
+        self.n_plus_one: deque = deque(maxlen=history)
+        self._lock = Lock()
+
+    def attach(self, engine: Engine) -> None:
+        """เริ่มนับ statements ของ engine (ลงทะเบียนครั้งเดียวต่อ engine)"""
+        if not event.contains(engine, "before_cursor_execute", self._on_execute):
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        template = normalize_statement(statement)
+        scope = _current_scope.get()
+        with self._lock:
+            self.total += 1
+            self.templates[template] += 1
+        # N+1 เป็นเรื่องของการอ่าน - INSERT/UPDATE ทีละแถวตอน flush ไม่นับ
+        if scope is None or not template.startswith(("SELECT", "WITH")):
+            return
+
+        scope.counts[template] += 1
+        # เตือนครั้งเดียวต่อ template ต่อ scope (ตอนถึง threshold พอดี)
+        if scope.counts[template] == self.threshold:
+            location = _caller_location()
+            with self._lock:
+                self.n_plus_one.append({
+                    "scope": scope.name,
+                    "statement": template,
+                    "location": location,
+                })
+            from src.utils.logger import get_logger
+            get_logger().warning(
+                f"⚠️ สงสัย N+1: statement เดียวกันถูกเรียก {self.threshold} ครั้งใน '{scope.name}' "
+                f"ที่ {location}\n  {template[:300]}"
+            )
+
+    @contextmanager
+    def scope(self, name: str):
+        """นับ statements ที่เกิดภายใน block เป็นหนึ่ง scope (ซ้อนกันได้ - ใช้ scope ชั้นนอกสุด)"""
+        if _current_scope.get() is not None:
+            yield
+            return
+        token = _current_scope.set(_Scope(name))
+        try:
+            yield
+        finally:
+            _current_scope.reset(token)
+
+    def get_stats(self, top: int = 20) -> Dict:
+        """สถิติสะสม: จำนวน statements, templates ที่ถูกเรียกบ่อยสุด และ N+1 ที่พบล่าสุด"""
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "total_statements": self.total,
+                "top_statements": [
+                    {"statement": template, "count": count}
+                    for template, count in self.templates.most_common(top)
+                ],
+                "n_plus_one": list(self.n_plus_one),
+            }
+
+
+def _from_env() -> Optional[QueryLog]:
+    """สร้าง QueryLog ถ้าตั้ง DB_QUERY_LOG_N1_THRESHOLD ไว้ (ค่า > 0)"""
+    try:
+        threshold = int(os.environ.get(N1_THRESHOLD_ENV, "0"))
+    except ValueError:
+        return None
+    return QueryLog(threshold) if threshold > 0 else None
+
+
+# Global instance (None = ปิดอยู่)
+query_log: Optional[QueryLog] = _from_env()
+
+
+def query_scope(name: str) -> ContextManager:
+    """scope สำหรับตรวจ N+1 - ไม่ทำอะไรถ้าไม่ได้เปิด query log"""
+    if query_log is None:
+        return nullcontext()
+    return query_log.scope(name)
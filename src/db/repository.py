@@ -3,12 +3,16 @@ Repository Module - จัดการ CRUD operations สำหรับทุ
 ใช้ Repository Pattern เพื่อแยก business logic ออกจาก data access
 """
 
-from datetime import datetime, date, timedelta
-from typing import Optional, List, Type, TypeVar, Generic
-from uuid import uuid4
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta, timezone
+from typing import Optional, List, Dict, Iterable, Iterator, Set, Tuple, Type, TypeVar, Generic
 
-from sqlalchemy import select, update, delete, func, and_, or_, desc
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete, func, case, literal, and_, or_, desc, bindparam, cast, text, Float, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.orm import Session, raiseload, selectinload
 
 from src.db.models import (
     Base,
@@ -18,10 +22,72 @@ from src.db.models import (
     ContentIdea,
     PlaybookRule,
     RunLog,
+    RunStatsDaily,
+    Tag,
+    video_tags,
+    rule_sample_videos,
+    utcnow,
+    seconds_since,
+    VIDEO_SEARCH_TABLE,
+    NEWS_SOURCE_PATTERN,
+    ANIME_SOURCE_PATTERN,
 )
+from src.db.cache import cached_lookup
 
 T = TypeVar("T", bound=Base)
 
+# จำนวนแถวต่อ batch ของ iter_* (ดึงทีละ batch แทนการโหลดทั้งหมดเข้าหน่วยความจำ)
+YIELD_PER = 1000
+
+# ตารางที่เล็กกว่านี้ count_estimate() นับจริง (COUNT(*) เร็วพออยู่แล้ว และสถิติอาจเก่า)
+COUNT_ESTIMATE_MIN_ROWS = 100_000
+
+# น้ำหนักของ title เทียบกับ description (1.0) ในการจัดอันดับผลค้นหา videos
+SEARCH_TITLE_WEIGHT = 10.0
+
+def _utc_cutoff(days: int) -> datetime:
+    """เวลา (UTC แบบ naive ตรงกับที่เก็บในฐานข้อมูล) ย้อนหลัง days วันจากตอนนี้"""
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+
+# engine -> ชื่อ table/trigger ที่พบแล้วใน sqlite_master
+# จำเฉพาะผลที่พบ (object ที่ยังไม่มีอาจถูกสร้างภายหลังโดย init_db/migrate) และผูกกับ engine object
+# ไม่ใช่ URL (engine :memory: แต่ละตัวเป็นคนละฐานข้อมูล) - engine ที่ถูกทิ้งจะหลุดจาก dict เอง
+_sqlite_objects_ready: "weakref.WeakKeyDictionary[Engine, Set[str]]" = weakref.WeakKeyDictionary()
+
+
+def _has_sqlite_object(session: Session, name: str) -> bool:
+    """ตรวจว่าฐานข้อมูลเป็น SQLite และมี table/trigger ชื่อนี้ (ผลที่พบถูกจำไว้ต่อ engine)"""
+    bind = session.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    
+    engine = bind.engine
+    found = _sqlite_objects_ready.get(engine)
+    if found is not None and name in found:
+        return True
+    
+    exists = session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}
+    ).first() is not None
+    if exists:
+        _sqlite_objects_ready.setdefault(engine, set()).add(name)
+    return exists
+
+
+def _tag_names(tags) -> List[str]:
+    """ดึงรายชื่อ tag จากค่า Video.tags ({"tags": [...]} จาก API หรือ list ตรงๆ)"""
+    if isinstance(tags, dict):
+        tags = tags.get("tags")
+    return list(tags) if isinstance(tags, list) else []
+
+
+# insert() ที่รองรับ ON CONFLICT ของแต่ละ dialect
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
 
 class BaseRepository(Generic[T]):
     """Base Repository สำหรับ CRUD operations ทั่วไป"""
@@ -34,16 +100,48 @@ class BaseRepository(Generic[T]):
         """ดึงข้อมูลด้วย ID"""
         return self.session.get(self.model, id)
     
+    def get_many_by_id(self, ids: Iterable[int]) -> Dict[int, T]:
+        """ดึงหลายแถวด้วย ID ใน query เดียว (คืนค่า dict id -> object, ID ที่ไม่พบจะไม่อยู่ใน dict)"""
+        ids = list(set(ids))
+        if not ids:
+            return {}
+        stmt = select(self.model).where(self.model.id.in_(ids))
+        return {instance.id: instance for instance in self.session.scalars(stmt)}
+    
     def get_all(self, limit: int = 100, offset: int = 0) -> List[T]:
         """ดึงข้อมูลทั้งหมด พร้อม pagination"""
         stmt = select(self.model).limit(limit).offset(offset)
         return list(self.session.scalars(stmt).all())
     
+    @contextmanager
+    def batch(self) -> Iterator[Session]:
+        """
+        รวมการเขียนหลายครั้งใน block ให้ flush ครั้งเดียวตอนจบ (แทน flush ทุกแถว)
+        
+        ภายใน block: create/update/delete ไม่ flush (แถวใหม่ยังไม่มี id และ query ยังไม่เห็นแถวที่ยังไม่ flush)
+        และปิด autoflush - มีผลกับทุก repository ที่ใช้ session เดียวกัน ซ้อนกันได้
+        ถ้าเกิด exception จะไม่ flush (ให้ผู้เรียก rollback ตามปกติ)
+        """
+        info = self.session.info
+        info["batch_depth"] = info.get("batch_depth", 0) + 1
+        try:
+            with self.session.no_autoflush:
+                yield self.session
+        finally:
+            info["batch_depth"] -= 1
+        if not info["batch_depth"]:
+            self.session.flush()
+    
+    def _flush(self) -> None:
+        """flush ทันที ยกเว้นอยู่ใน batch() - จะ flush ครั้งเดียวตอนจบ batch"""
+        if not self.session.info.get("batch_depth"):
+            self.session.flush()
+    
     def create(self, **kwargs) -> T:
         """สร้างข้อมูลใหม่"""
         instance = self.model(**kwargs)
         self.session.add(instance)
-        self.session.flush()
+        self._flush()
         return instance
     
     def update(self, id: int, **kwargs) -> Optional[T]:
@@ -53,15 +151,28 @@ class BaseRepository(Generic[T]):
             for key, value in kwargs.items():
                 if hasattr(instance, key):
                     setattr(instance, key, value)
-            self.session.flush()
+            self._flush()
         return instance
     
+    def bulk_create(self, rows: List[dict]) -> int:
+        """
+        สร้างหลายแถวด้วย INSERT statement เดียวแบบ executemany (ดู Base.bulk_insert)
+        ใช้แทนการเรียก create() ทีละแถวซึ่ง flush ทุกแถว
+        
+        Args:
+            rows: list ของ dict ที่ key ตรงกับชื่อ column
+            
+        Returns:
+            จำนวนแถวที่ insert
+        """
+        return self.model.bulk_insert(self.session, rows)
+    
     def delete(self, id: int) -> bool:
         """ลบข้อมูล"""
         instance = self.get_by_id(id)
         if instance:
             self.session.delete(instance)
-            self.session.flush()
+            self._flush()
             return True
         return False
     
@@ -69,6 +180,42 @@ class BaseRepository(Generic[T]):
         """นับจำนวนข้อมูลทั้งหมด"""
         stmt = select(func.count()).select_from(self.model)
         return self.session.scalar(stmt) or 0
+    
+    def count_estimate(self) -> int:
+        """
+        จำนวนแถวโดยประมาณจากสถิติของ query planner (ไม่ต้อง scan ตาราง) - สำหรับหน้าแสดงผล
+        
+        PostgreSQL ใช้ pg_class.reltuples, SQLite ใช้ sqlite_stat1 (มีหลัง ANALYZE ใน migrate_db)
+        ถ้าไม่มีสถิติหรือตารางเล็กกว่า COUNT_ESTIMATE_MIN_ROWS จะใช้ count() แบบแม่นยำ
+        ใช้ count() เมื่อต้องการตัวเลขที่แม่นยำ (เช่น pagination)
+        """
+        estimate = self._planner_row_estimate()
+        if estimate is None or estimate < COUNT_ESTIMATE_MIN_ROWS:
+            return self.count()
+        return estimate
+    
+    def _planner_row_estimate(self) -> Optional[int]:
+        """จำนวนแถวจากสถิติของฐานข้อมูล (None ถ้าไม่มี)"""
+        dialect = self.session.get_bind().dialect.name
+        params = {"table": self.model.__tablename__}
+        if dialect == "postgresql":
+            # reltuples = -1 ถ้ายังไม่เคย ANALYZE (PostgreSQL 14+)
+            estimate = self.session.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"), params
+            )
+            return estimate if estimate is not None and estimate >= 0 else None
+        if dialect == "sqlite":
+            has_stats = self.session.scalar(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            )
+            if not has_stats:
+                return None
+            # stat = "<จำนวนแถว> <แถวต่อค่าของแต่ละคอลัมน์ใน index> ..."
+            stat = self.session.scalar(
+                text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table LIMIT 1"), params
+            )
+            return int(stat.split()[0]) if stat else None
+        return None
 
 
 class VideoRepository(BaseRepository[Video]):
@@ -77,10 +224,32 @@ class VideoRepository(BaseRepository[Video]):
     def __init__(self, session: Session):
         super().__init__(session, Video)
     
+    def create(self, **kwargs) -> Video:
+        """สร้างวิดีโอใหม่ (ถ้าระบุ tags จะอัพเดท video_tags ให้ด้วย)"""
+        video = super().create(**kwargs)
+        if "tags" in kwargs:
+            self.sync_tags({video.youtube_id: _tag_names(kwargs["tags"])})
+        return video
+    
+    def update(self, id: int, **kwargs) -> Optional[Video]:
+        """อัพเดทวิดีโอ (ถ้าระบุ tags จะอัพเดท video_tags ให้ด้วย)"""
+        video = super().update(id, **kwargs)
+        if video is not None and "tags" in kwargs:
+            self.sync_tags({video.youtube_id: _tag_names(kwargs["tags"])})
+        return video
+    
+    @cached_lookup(Video, "youtube_id")
     def get_by_youtube_id(self, youtube_id: str) -> Optional[Video]:
         """ดึงวิดีโอด้วย YouTube ID"""
-        stmt = select(Video).where(Video.youtube_id == youtube_id)
-        return self.session.scalar(stmt)
+        return self.session.scalar(Video._select_by_youtube_id, {"youtube_id": youtube_id})
+    
+    def get_by_youtube_ids(self, youtube_ids: Iterable[str]) -> Dict[str, Video]:
+        """ดึงหลายวิดีโอด้วย YouTube ID ใน query เดียว (คืนค่า dict youtube_id -> Video)"""
+        youtube_ids = list(set(youtube_ids))
+        if not youtube_ids:
+            return {}
+        stmt = select(Video).where(Video.youtube_id.in_(youtube_ids))
+        return {video.youtube_id: video for video in self.session.scalars(stmt)}
     
     def get_by_channel(self, channel_id: str, limit: int = 50) -> List[Video]:
         """ดึงวิดีโอทั้งหมดของ channel"""
@@ -94,7 +263,7 @@ class VideoRepository(BaseRepository[Video]):
     
     def get_recent(self, days: int = 30, limit: int = 50) -> List[Video]:
         """ดึงวิดีโอล่าสุด"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        cutoff_date = _utc_cutoff(days)
         stmt = (
             select(Video)
             .where(Video.published_at >= cutoff_date)
@@ -114,8 +283,214 @@ class VideoRepository(BaseRepository[Video]):
         )
         return list(self.session.scalars(stmt).all())
     
+    # คอลัมน์ของ list_summaries - พอสำหรับหน้าสรุป/จัดอันดับ (ไม่มี description / JSON)
+    _SUMMARY_COLUMNS = (
+        Video.id,
+        Video.title,
+        Video.published_at,
+        Video.duration_seconds,
+        Video.view_count,
+        Video.like_count,
+        Video.comment_count,
+    )
+    
+    def list_top_performing(self, metric: str = "view_count", limit: int = 10) -> List[Row]:
+        """
+        เหมือน get_top_performing แต่คืนค่าแค่ (id, title, ค่า metric) เป็น Row แบบอ่านอย่างเดียว
+        ไม่สร้าง ORM object - ใช้กับหน้าแสดงผลที่ไม่ต้องแก้ไขวิดีโอ
+        """
+        order_column = getattr(Video, metric, Video.view_count)
+        stmt = (
+            select(Video.id, Video.title, order_column)
+            .where(Video.status == "active")
+            .order_by(desc(order_column))
+            .limit(limit)
+        )
+        return list(self.session.execute(stmt).all())
+    
+    def list_summaries(
+        self, channel_id: Optional[str] = None, days: Optional[int] = None, limit: int = 1000
+    ) -> List[Row]:
+        """
+        ดึงข้อมูลสรุปของวิดีโอ (_SUMMARY_COLUMNS) เป็น Row แบบอ่านอย่างเดียว เรียงจากล่าสุด
+        
+        Args:
+            channel_id: กรองเฉพาะ channel (ถ้าระบุ)
+            days: กรองเฉพาะวิดีโอที่เผยแพร่ภายใน days วัน (ถ้าระบุ)
+            limit: จำนวนสูงสุด
+        """
+        stmt = self._summaries_stmt(channel_id, days, limit)
+        return list(self.session.execute(stmt).all())
+    
+    def list_posting_engagement(self, days: int, limit: int = 100) -> List[Row]:
+        """
+        (published_at, engagement) ของวิดีโอล่าสุดที่เผยแพร่ภายใน days วันและมี views
+        engagement = (likes + comments) / views คำนวณในฐานข้อมูล - ดึงแค่ 2 คอลัมน์สำหรับวิเคราะห์เวลาโพสต์
+        """
+        engagement = cast(Video.like_count + Video.comment_count, Float) / Video.view_count
+        stmt = (
+            select(Video.published_at, engagement.label("engagement"))
+            .where(
+                and_(
+                    Video.published_at >= _utc_cutoff(days),
+                    Video.view_count > 0,
+                )
+            )
+            .order_by(desc(Video.published_at))
+            .limit(limit)
+        )
+        return list(self.session.execute(stmt).all())
+    
+    def _summaries_stmt(self, channel_id: Optional[str], days: Optional[int], limit: int):
+        """SELECT ของ list_summaries (ใช้เป็น subquery ใน get_summary_stats ด้วย)"""
+        conditions = []
+        if channel_id:
+            conditions.append(Video.channel_id == channel_id)
+        if days is not None:
+            conditions.append(Video.published_at >= _utc_cutoff(days))
+        
+        stmt = select(*self._SUMMARY_COLUMNS)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        return stmt.order_by(desc(Video.published_at)).limit(limit)
+    
+    def get_summary_stats(
+        self, channel_id: Optional[str] = None, limit: int = 1000, top: int = 5
+    ) -> dict:
+        """
+        ผลรวมและอันดับ top ของวิดีโอล่าสุด limit รายการ (ชุดเดียวกับ list_summaries) คำนวณในฐานข้อมูล
+        
+        Returns:
+            dict ที่มี total_videos, total_views, total_likes, total_comments
+            และ top_by_views / top_by_engagement (Row ของ id, title, view_count อย่างละ top รายการ)
+        """
+        recent = self._summaries_stmt(channel_id, None, limit).subquery("recent")
+        totals = self.session.execute(
+            select(
+                func.count().label("total_videos"),
+                func.coalesce(func.sum(recent.c.view_count), 0).label("total_views"),
+                func.coalesce(func.sum(recent.c.like_count), 0).label("total_likes"),
+                func.coalesce(func.sum(recent.c.comment_count), 0).label("total_comments"),
+            )
+        ).one()
+        if not totals.total_videos:
+            return {**totals._asdict(), "top_by_views": [], "top_by_engagement": []}
+        
+        engagement = cast(recent.c.like_count + recent.c.comment_count, Float) / case(
+            (recent.c.view_count > 1, recent.c.view_count), else_=1
+        )
+        
+        def top_by(order_column) -> List[Row]:
+            # ค่าเท่ากันเรียงตามวันเผยแพร่ล่าสุดก่อน (ลำดับเดียวกับ list_summaries)
+            stmt = (
+                select(recent.c.id, recent.c.title, recent.c.view_count)
+                .order_by(desc(order_column), desc(recent.c.published_at))
+                .limit(top)
+            )
+            return list(self.session.execute(stmt).all())
+        
+        return {
+            **totals._asdict(),
+            "top_by_views": top_by(recent.c.view_count),
+            "top_by_engagement": top_by(engagement),
+        }
+    
+    def get_with_metrics(self, ids: List[int]) -> List[Video]:
+        """ดึงวิดีโอพร้อม daily_metrics (2 queries รวม ไม่ว่าจะกี่วิดีโอ)"""
+        stmt = (
+            select(Video)
+            .where(Video.id.in_(ids))
+            .options(selectinload(Video.daily_metrics), raiseload("*"))
+        )
+        return list(self.session.scalars(stmt).all())
+    
+    def get_by_tag(self, tag_name: str, limit: int = 50) -> List[Video]:
+        """ดึงวิดีโอที่มี tag ที่กำหนด (ผ่าน video_tags index แทนการ scan JSON)"""
+        stmt = (
+            select(Video)
+            .join(video_tags, video_tags.c.video_id == Video.id)
+            .join(Tag, Tag.id == video_tags.c.tag_id)
+            .where(Tag.name == tag_name)
+            .order_by(desc(Video.published_at))
+            .limit(limit)
+        )
+        return list(self.session.scalars(stmt).all())
+    
+    def _get_or_create_tag_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """คืนค่า mapping ชื่อ tag -> id (สร้าง tag ที่ยังไม่มีในครั้งเดียว)"""
+        names = set(names)
+        if not names:
+            return {}
+        
+        stmt = select(Tag.name, Tag.id).where(Tag.name.in_(names))
+        tag_ids = dict(self.session.execute(stmt).all())
+        
+        missing = names - tag_ids.keys()
+        if missing:
+            Tag.bulk_insert(self.session, [{"name": name} for name in missing])
+            stmt = select(Tag.name, Tag.id).where(Tag.name.in_(missing))
+            tag_ids.update(self.session.execute(stmt).all())
+        
+        return tag_ids
+    
+    def sync_tags(self, tags_by_youtube_id: Dict[str, List[str]]) -> None:
+        """
+        อัพเดทตาราง video_tags ของหลายวิดีโอพร้อมกัน
+        จำนวน queries คงที่ ไม่ขึ้นกับจำนวนวิดีโอ
+        
+        Args:
+            tags_by_youtube_id: YouTube ID -> list ของชื่อ tag
+        """
+        if not tags_by_youtube_id:
+            return
+        
+        # วิดีโอที่เพิ่ง add ต้อง flush ก่อนถึงจะมี id
+        self.session.flush()
+        stmt = select(Video.youtube_id, Video.id).where(Video.youtube_id.in_(tags_by_youtube_id.keys()))
+        video_ids = dict(self.session.execute(stmt).all())
+        if not video_ids:
+            return
+        
+        tags_by_youtube_id = {
+            youtube_id: [name for name in dict.fromkeys(tags or []) if name]
+            for youtube_id, tags in tags_by_youtube_id.items()
+            if youtube_id in video_ids
+        }
+        tag_ids = self._get_or_create_tag_ids(
+            name for tags in tags_by_youtube_id.values() for name in tags
+        )
+        
+        self.session.execute(delete(video_tags).where(video_tags.c.video_id.in_(video_ids.values())))
+        rows = [
+            {"video_id": video_ids[youtube_id], "tag_id": tag_ids[name]}
+            for youtube_id, tags in tags_by_youtube_id.items()
+            for name in tags
+        ]
+        if rows:
+            self.session.execute(insert(video_tags), rows)
+    
+    def _has_video_search(self) -> bool:
+        """ตรวจว่าฐานข้อมูลมีตาราง FTS5 ของ videos หรือไม่"""
+        return _has_sqlite_object(self.session, VIDEO_SEARCH_TABLE)
+    
     def search(self, query: str, limit: int = 20) -> List[Video]:
         """ค้นหาวิดีโอด้วย title หรือ description"""
+        # trigram ต้องมีอย่างน้อย 3 ตัวอักษร - สั้นกว่านั้นใช้ LIKE ตามเดิม
+        if len(query) >= 3 and self._has_video_search():
+            phrase = '"' + query.replace('"', '""') + '"'
+            # เรียงตาม bm25 (ยิ่งน้อยยิ่งตรง) - คำที่เจอใน title มีน้ำหนักมากกว่า description
+            matches = text(
+                f"SELECT rowid, bm25({VIDEO_SEARCH_TABLE}, {SEARCH_TITLE_WEIGHT}, 1.0) AS rank "
+                f"FROM {VIDEO_SEARCH_TABLE} WHERE {VIDEO_SEARCH_TABLE} MATCH :phrase"
+            ).bindparams(phrase=phrase).columns(rowid=Integer, rank=Float).subquery("matches")
+            stmt = (
+                select(Video)
+                .join(matches, matches.c.rowid == Video.id)
+                .order_by(matches.c.rank)
+                .limit(limit)
+            )
+            return list(self.session.scalars(stmt).all())
+        
         search_pattern = f"%{query}%"
         stmt = (
             select(Video)
@@ -136,15 +511,13 @@ class DailyMetricRepository(BaseRepository[DailyMetric]):
     def __init__(self, session: Session):
         super().__init__(session, DailyMetric)
     
+    @cached_lookup(DailyMetric, "video_id", "date")
     def get_by_video_and_date(self, video_id: int, metric_date: date) -> Optional[DailyMetric]:
         """ดึง metric ของวิดีโอในวันที่กำหนด"""
-        stmt = select(DailyMetric).where(
-            and_(
-                DailyMetric.video_id == video_id,
-                DailyMetric.date == metric_date,
-            )
+        return self.session.scalar(
+            DailyMetric._select_by_video_date,
+            {"video_id": video_id, "date": metric_date},
         )
-        return self.session.scalar(stmt)
     
     def get_video_metrics(
         self, video_id: int, start_date: date, end_date: date
@@ -163,23 +536,181 @@ class DailyMetricRepository(BaseRepository[DailyMetric]):
         )
         return list(self.session.scalars(stmt).all())
     
+    def get_score_aggregates(
+        self, video_id: int, start_date: date, end_date: date
+    ) -> Optional[Row]:
+        """
+        ผลรวม/ค่าเฉลี่ยของ metrics ในช่วงเวลาสำหรับคำนวณ performance score (query เดียว ไม่โหลดทีละแถว)
+        
+        Returns:
+            Row ที่มี days, total_views, total_likes, total_comments, avg_view_percentage,
+            index_weighted_views (ผลรวม ลำดับวัน (1..days) x views - ใช้หาความชันของแนวโน้ม views)
+            หรือ None ถ้าไม่มี metrics ในช่วงนั้น
+        """
+        return self.get_score_aggregates_many([video_id], start_date, end_date).get(video_id)
+    
+    def get_score_aggregates_many(
+        self, video_ids: Iterable[int], start_date: date, end_date: date
+    ) -> Dict[int, Row]:
+        """
+        get_score_aggregates ของหลายวิดีโอใน query เดียว (GROUP BY video_id)
+        
+        Returns:
+            dict ของ video_id -> Row (วิดีโอที่ไม่มี metrics ในช่วงนั้นจะไม่อยู่ใน dict)
+        """
+        ids = list(set(video_ids))
+        if not ids:
+            return {}
+        window = {"partition_by": DailyMetric.video_id}
+        ranked = (
+            select(
+                DailyMetric.video_id,
+                DailyMetric.views,
+                DailyMetric.likes,
+                DailyMetric.comments,
+                DailyMetric.average_view_percentage,
+                func.row_number().over(**window, order_by=DailyMetric.date).label("rn"),
+            )
+            .where(
+                and_(
+                    DailyMetric.video_id.in_(ids),
+                    DailyMetric.date >= start_date,
+                    DailyMetric.date <= end_date,
+                )
+            )
+            .cte("ranked")
+        )
+        stmt = (
+            select(
+                ranked.c.video_id,
+                func.count().label("days"),
+                func.coalesce(func.sum(ranked.c.views), 0).label("total_views"),
+                func.coalesce(func.sum(ranked.c.likes), 0).label("total_likes"),
+                func.coalesce(func.sum(ranked.c.comments), 0).label("total_comments"),
+                func.avg(ranked.c.average_view_percentage).label("avg_view_percentage"),
+                func.coalesce(func.sum(ranked.c.rn * ranked.c.views), 0).label("index_weighted_views"),
+            )
+            .group_by(ranked.c.video_id)
+        )
+        return {row.video_id: row for row in self.session.execute(stmt)}
+    
+    def get_period_sums(
+        self,
+        video_id: int,
+        start_date: date,
+        mid_date: date,
+        end_date: date,
+        columns: Iterable[str],
+    ) -> Row:
+        """
+        ผลรวมของคอลัมน์ใน 2 periods ติดกันใน query เดียว (SUM(CASE ...) แยกตามช่วง)
+        period ก่อนหน้า = [start_date, mid_date], period ปัจจุบัน = [mid_date, end_date] (mid_date นับทั้งสองฝั่ง)
+        
+        Returns:
+            Row ที่มี current_<column> และ previous_<column> ของแต่ละคอลัมน์ (ไม่มีข้อมูล = 0)
+        """
+        sums = []
+        for name in columns:
+            column = getattr(DailyMetric, name)
+            sums.append(
+                func.coalesce(func.sum(case((DailyMetric.date >= mid_date, column))), 0).label(f"current_{name}")
+            )
+            sums.append(
+                func.coalesce(func.sum(case((DailyMetric.date <= mid_date, column))), 0).label(f"previous_{name}")
+            )
+        stmt = select(*sums).where(
+            and_(
+                DailyMetric.video_id == video_id,
+                DailyMetric.date >= start_date,
+                DailyMetric.date <= end_date,
+            )
+        )
+        return self.session.execute(stmt).one()
+    
+    # คอลัมน์ aggregate ที่ใช้ร่วมกันใน get_aggregate_stats / get_aggregate_stats_many
+    _AGGREGATE_COLUMNS = (
+        func.sum(DailyMetric.views).label("total_views"),
+        func.sum(DailyMetric.likes).label("total_likes"),
+        func.sum(DailyMetric.comments).label("total_comments"),
+        func.avg(DailyMetric.average_view_percentage).label("avg_view_percentage"),
+        func.sum(DailyMetric.watch_time_minutes).label("total_watch_time"),
+    )
+    
+    @staticmethod
+    def _aggregate_dict(result) -> dict:
+        """แปลงแถวผลลัพธ์ของ _AGGREGATE_COLUMNS เป็น dict (ไม่มีแถว / NULL -> 0)"""
+        row = result._mapping if result is not None else {}
+        return {
+            "total_views": row.get("total_views") or 0,
+            "total_likes": row.get("total_likes") or 0,
+            "total_comments": row.get("total_comments") or 0,
+            "avg_view_percentage": row.get("avg_view_percentage") or 0.0,
+            "total_watch_time": row.get("total_watch_time") or 0.0,
+        }
+    
     def get_aggregate_stats(self, video_id: int) -> dict:
         """คำนวณ aggregate stats ของวิดีโอ"""
-        stmt = select(
-            func.sum(DailyMetric.views).label("total_views"),
-            func.sum(DailyMetric.likes).label("total_likes"),
-            func.sum(DailyMetric.comments).label("total_comments"),
-            func.avg(DailyMetric.average_view_percentage).label("avg_view_percentage"),
-            func.sum(DailyMetric.watch_time_minutes).label("total_watch_time"),
-        ).where(DailyMetric.video_id == video_id)
+        stmt = select(*self._AGGREGATE_COLUMNS).where(DailyMetric.video_id == video_id)
+        return self._aggregate_dict(self.session.execute(stmt).first())
+    
+    def get_aggregate_stats_many(self, video_ids: Iterable[int]) -> Dict[int, dict]:
+        """
+        คำนวณ aggregate stats ของหลายวิดีโอใน query เดียว (GROUP BY video_id)
+        
+        Returns:
+            dict ของ video_id -> stats (วิดีโอที่ไม่มี metrics ได้ค่า 0 เหมือน get_aggregate_stats)
+        """
+        ids = list(set(video_ids))
+        if not ids:
+            return {}
+        stmt = (
+            select(DailyMetric.video_id, *self._AGGREGATE_COLUMNS)
+            .where(DailyMetric.video_id.in_(ids))
+            .group_by(DailyMetric.video_id)
+        )
+        rows = {row.video_id: row for row in self.session.execute(stmt)}
+        return {video_id: self._aggregate_dict(rows.get(video_id)) for video_id in ids}
+    
+    def get_summary_for_video(self, video_id: int) -> dict:
+        """
+        aggregate stats + metric ล่าสุดของวิดีโอใน query เดียว
+        (window functions คำนวณรวมทุกแถวก่อน LIMIT 1 ของแถวล่าสุด)
+        
+        Returns:
+            dict เดียวกับ get_aggregate_stats() และ key "latest" (DailyMetric หรือ None)
+        """
+        window = {"partition_by": DailyMetric.video_id}
+        stmt = (
+            select(
+                DailyMetric,
+                func.sum(DailyMetric.views).over(**window).label("total_views"),
+                func.sum(DailyMetric.likes).over(**window).label("total_likes"),
+                func.sum(DailyMetric.comments).over(**window).label("total_comments"),
+                func.avg(DailyMetric.average_view_percentage).over(**window).label("avg_view_percentage"),
+                func.sum(DailyMetric.watch_time_minutes).over(**window).label("total_watch_time"),
+            )
+            .where(DailyMetric.video_id == video_id)
+            .order_by(desc(DailyMetric.date))
+            .limit(1)
+        )
         
         result = self.session.execute(stmt).first()
+        if result is None:
+            return {
+                "total_views": 0,
+                "total_likes": 0,
+                "total_comments": 0,
+                "avg_view_percentage": 0.0,
+                "total_watch_time": 0.0,
+                "latest": None,
+            }
         return {
             "total_views": result.total_views or 0,
             "total_likes": result.total_likes or 0,
             "total_comments": result.total_comments or 0,
             "avg_view_percentage": result.avg_view_percentage or 0.0,
             "total_watch_time": result.total_watch_time or 0.0,
+            "latest": result.DailyMetric,
         }
     
     def get_latest_for_video(self, video_id: int) -> Optional[DailyMetric]:
@@ -192,18 +723,27 @@ class DailyMetricRepository(BaseRepository[DailyMetric]):
         )
         return self.session.scalar(stmt)
     
-    def get_all_for_video(self, video_id: int, limit: int = 365) -> List[DailyMetric]:
-        """ดึง metrics ทั้งหมดของวิดีโอ"""
+    def iter_all_for_video(
+        self, video_id: int, limit: int = 365, chunk: int = YIELD_PER
+    ) -> Iterator[DailyMetric]:
+        """วนอ่าน metrics ของวิดีโอทีละ batch (ไม่โหลดทั้งหมดเข้าหน่วยความจำ)"""
         stmt = (
             select(DailyMetric)
             .where(DailyMetric.video_id == video_id)
             .order_by(desc(DailyMetric.date))
             .limit(limit)
+            .execution_options(yield_per=chunk)
         )
-        return list(self.session.scalars(stmt).all())
+        yield from self.session.scalars(stmt)
     
-    def get_metrics_in_range(self, start_date: date, end_date: date) -> List[DailyMetric]:
-        """ดึง metrics ทั้งหมดในช่วงวันที่"""
+    def get_all_for_video(self, video_id: int, limit: int = 365) -> List[DailyMetric]:
+        """ดึง metrics ทั้งหมดของวิดีโอ"""
+        return list(self.iter_all_for_video(video_id, limit=limit))
+    
+    def iter_metrics_in_range(
+        self, start_date: date, end_date: date, chunk: int = YIELD_PER
+    ) -> Iterator[DailyMetric]:
+        """วนอ่าน metrics ในช่วงวันที่ทีละ batch (สำหรับ export / ช่วงเวลายาว)"""
         stmt = (
             select(DailyMetric)
             .where(
@@ -213,20 +753,71 @@ class DailyMetricRepository(BaseRepository[DailyMetric]):
                 )
             )
             .order_by(DailyMetric.date)
+            .execution_options(yield_per=chunk)
+        )
+        yield from self.session.scalars(stmt)
+    
+    def get_metrics_in_range(self, start_date: date, end_date: date) -> List[DailyMetric]:
+        """ดึง metrics ทั้งหมดในช่วงวันที่"""
+        return list(self.iter_metrics_in_range(start_date, end_date))
+    
+    def _upsert_statement(self, columns: Iterable[str]):
+        """
+        INSERT ... ON CONFLICT (video_id, date) DO UPDATE ของ dialect ปัจจุบัน
+        (None ถ้า dialect ไม่รองรับ)
+        """
+        dialect_insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if dialect_insert is None:
+            return None
+        
+        stmt = dialect_insert(DailyMetric)
+        set_ = {
+            key: stmt.excluded[key]
+            for key in columns
+            if key not in ("video_id", "date")
+        }
+        # DO UPDATE ต้องมีอย่างน้อยหนึ่ง column - ไม่มีค่าใหม่ก็เขียนค่าเดิมกลับ
+        return stmt.on_conflict_do_update(
+            index_elements=[DailyMetric.video_id, DailyMetric.date],
+            set_=set_ or {"date": stmt.excluded.date},
         )
-        return list(self.session.scalars(stmt).all())
     
     def upsert(self, video_id: int, metric_date: date, **kwargs) -> DailyMetric:
-        """สร้างหรืออัพเดท metric"""
-        existing = self.get_by_video_and_date(video_id, metric_date)
-        if existing:
-            for key, value in kwargs.items():
-                if hasattr(existing, key):
+        """สร้างหรืออัพเดท metric (statement เดียว คืนค่าแถวด้วย RETURNING)"""
+        kwargs = {key: value for key, value in kwargs.items() if hasattr(DailyMetric, key)}
+        stmt = self._upsert_statement(kwargs)
+        if stmt is None:
+            existing = self.get_by_video_and_date(video_id, metric_date)
+            if existing:
+                for key, value in kwargs.items():
                     setattr(existing, key, value)
-            self.session.flush()
-            return existing
-        else:
+                self._flush()
+                return existing
             return self.create(video_id=video_id, date=metric_date, **kwargs)
+        
+        stmt = stmt.values(video_id=video_id, date=metric_date, **kwargs).returning(DailyMetric)
+        return self.session.scalars(stmt, execution_options={"populate_existing": True}).one()
+    
+    def bulk_upsert(self, rows: List[dict]) -> int:
+        """
+        สร้างหรืออัพเดทหลาย metrics ด้วย statement เดียวแบบ executemany
+        
+        Args:
+            rows: list ของ dict ที่มี video_id, date และ columns อื่น (ทุกแถวใช้ keys ชุดเดียวกัน)
+            
+        Returns:
+            จำนวนแถวที่ส่งไป upsert
+        """
+        if not rows:
+            return 0
+        stmt = self._upsert_statement(rows[0].keys())
+        if stmt is None:
+            for row in rows:
+                row = dict(row)
+                self.upsert(row.pop("video_id"), row.pop("date"), **row)
+            return len(rows)
+        self.session.execute(stmt, rows)
+        return len(rows)
 
 
 class ResearchItemRepository(BaseRepository[ResearchItem]):
@@ -245,16 +836,19 @@ class ResearchItemRepository(BaseRepository[ResearchItem]):
         )
         return list(self.session.scalars(stmt).all())
     
-    def get_actionable(self, limit: int = 20) -> List[ResearchItem]:
-        """ดึง research items ที่ actionable"""
+    def get_actionable(
+        self, limit: int = 20, categories: Optional[List[str]] = None
+    ) -> List[ResearchItem]:
+        """ดึง research items ที่ actionable (กรองเฉพาะ categories ถ้าระบุ)"""
+        conditions = [
+            ResearchItem.is_actionable == True,
+            ResearchItem.status != "archived",
+        ]
+        if categories:
+            conditions.append(ResearchItem.category.in_(categories))
         stmt = (
             select(ResearchItem)
-            .where(
-                and_(
-                    ResearchItem.is_actionable == True,
-                    ResearchItem.status != "archived",
-                )
-            )
+            .where(and_(*conditions))
             .order_by(desc(ResearchItem.relevance_score))
             .limit(limit)
         )
@@ -274,15 +868,39 @@ class ResearchItemRepository(BaseRepository[ResearchItem]):
         """เปลี่ยนสถานะเป็น reviewed"""
         return self.update(id, status="reviewed")
     
+    @cached_lookup(ResearchItem, "source_url")
     def get_by_source_url(self, url: str) -> Optional[ResearchItem]:
         """ดึง research item ตาม source URL"""
-        stmt = select(ResearchItem).where(ResearchItem.source_url == url)
-        return self.session.scalar(stmt)
+        return self.session.scalar(ResearchItem._select_by_source_url, {"source_url": url})
+    
+    def get_existing_source_urls(self, urls: Iterable[str]) -> set:
+        """ดึง source URL ที่มีอยู่แล้วในฐานข้อมูล (query เดียวแทนการเช็คทีละ URL)"""
+        urls = list(set(urls))
+        if not urls:
+            return set()
+        stmt = select(ResearchItem.source_url).where(ResearchItem.source_url.in_(urls))
+        return set(self.session.scalars(stmt))
     
+    @cached_lookup(ResearchItem, "anilist_id")
     def get_by_anilist_id(self, anilist_id: int) -> Optional[ResearchItem]:
         """ดึง research item ตาม AniList ID"""
-        stmt = select(ResearchItem).where(ResearchItem.anilist_id == anilist_id)
-        return self.session.scalar(stmt)
+        return self.session.scalar(ResearchItem._select_by_anilist_id, {"anilist_id": anilist_id})
+    
+    def get_by_anilist_ids(self, anilist_ids: Iterable[int]) -> Dict[int, ResearchItem]:
+        """ดึงหลาย research items ด้วย AniList ID ใน query เดียว (คืนค่า dict anilist_id -> ResearchItem)"""
+        anilist_ids = list(set(anilist_ids))
+        if not anilist_ids:
+            return {}
+        stmt = select(ResearchItem).where(ResearchItem.anilist_id.in_(anilist_ids))
+        return {item.anilist_id: item for item in self.session.scalars(stmt)}
+    
+    def get_existing_anilist_ids(self, anilist_ids: Iterable[int]) -> set:
+        """ดึง AniList ID ที่มีอยู่แล้วในฐานข้อมูล (query เดียวแทนการเช็คทีละ ID)"""
+        anilist_ids = list(set(anilist_ids))
+        if not anilist_ids:
+            return set()
+        stmt = select(ResearchItem.anilist_id).where(ResearchItem.anilist_id.in_(anilist_ids))
+        return set(self.session.scalars(stmt))
     
     def get_unlinked(self, limit: int = 100) -> List[ResearchItem]:
         """ดึง research items ที่ยังไม่ได้ link entities"""
@@ -304,21 +922,29 @@ class ResearchItemRepository(BaseRepository[ResearchItem]):
         )
         return list(self.session.scalars(stmt).all())
     
-    def get_recent_news(self, days: int = 7, limit: int = 50) -> List[ResearchItem]:
-        """ดึงข่าวล่าสุด"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+    def iter_recent_news(
+        self, days: int = 7, limit: int = 50, chunk: int = YIELD_PER
+    ) -> Iterator[ResearchItem]:
+        """วนอ่านข่าวล่าสุดทีละ batch"""
+        cutoff_date = _utc_cutoff(days)
         stmt = (
             select(ResearchItem)
             .where(
                 and_(
-                    ResearchItem.source.like("rss_%"),
+                    # render pattern เป็นค่าคงที่ เพื่อให้ SQLite ใช้ partial index ix_research_items_news_published
+                    ResearchItem.source.like(literal(NEWS_SOURCE_PATTERN, literal_execute=True)),
                     ResearchItem.published_at >= cutoff_date,
                 )
             )
             .order_by(desc(ResearchItem.published_at))
             .limit(limit)
+            .execution_options(yield_per=chunk)
         )
-        return list(self.session.scalars(stmt).all())
+        yield from self.session.scalars(stmt)
+    
+    def get_recent_news(self, days: int = 7, limit: int = 50) -> List[ResearchItem]:
+        """ดึงข่าวล่าสุด"""
+        return list(self.iter_recent_news(days=days, limit=limit))
     
     def get_anime_by_popularity(self, limit: int = 20) -> List[ResearchItem]:
         """ดึงอนิเมะตามความนิยม"""
@@ -326,7 +952,8 @@ class ResearchItemRepository(BaseRepository[ResearchItem]):
             select(ResearchItem)
             .where(
                 and_(
-                    ResearchItem.source.like("anilist_%"),
+                    # ค่าคงที่ให้ตรงกับ partial index ix_research_items_anime_trend
+                    ResearchItem.source.like(literal(ANIME_SOURCE_PATTERN, literal_execute=True)),
                     ResearchItem.anilist_id.isnot(None),
                 )
             )
@@ -386,6 +1013,60 @@ class ContentIdeaRepository(BaseRepository[ContentIdea]):
             .limit(limit)
         )
         return list(self.session.scalars(stmt).all())
+    
+    # คอลัมน์ของ list_for_export (ไม่มี outline / scripts / JSON ที่ไม่ได้ export)
+    _EXPORT_COLUMNS = (
+        ContentIdea.id,
+        ContentIdea.title,
+        ContentIdea.category,
+        ContentIdea.description,
+        ContentIdea.priority,
+        ContentIdea.status,
+        ContentIdea.potential_score,
+        ContentIdea.scheduled_date,
+        ContentIdea.created_at,
+    )
+    
+    def list_for_export(self, status: Optional[str] = None, limit: int = 1000) -> List[Row]:
+        """ดึง ideas (_EXPORT_COLUMNS) เป็น Row แบบอ่านอย่างเดียว เรียงจากใหม่สุด - ไม่สร้าง ORM object"""
+        stmt = select(*self._EXPORT_COLUMNS)
+        if status:
+            stmt = stmt.where(ContentIdea.status == status)
+        stmt = stmt.order_by(desc(ContentIdea.created_at)).limit(limit)
+        return list(self.session.execute(stmt).all())
+    
+    def archive_drafts_before(self, cutoff: datetime) -> int:
+        """
+        เปลี่ยน draft ที่สร้างก่อน cutoff เป็น archived ด้วย UPDATE เดียว (ไม่โหลด ideas มาก่อน)
+        
+        Returns:
+            จำนวน ideas ที่ถูก archive
+        """
+        stmt = (
+            update(ContentIdea)
+            .where(
+                and_(
+                    ContentIdea.status == "draft",
+                    ContentIdea.created_at < cutoff,
+                )
+            )
+            .values(status="archived")
+        )
+        return self.session.execute(stmt).rowcount
+    
+    def get_stat_groups(self) -> List[Row]:
+        """
+        จำนวน ideas และผลรวม potential_score แยกตาม (status, priority, category) ใน query เดียว
+        (ผู้เรียกรวมต่อเป็นยอดของแต่ละมิติเอง - จำนวนกลุ่มเล็กกว่าจำนวน ideas มาก)
+        """
+        stmt = select(
+            ContentIdea.status,
+            ContentIdea.priority,
+            ContentIdea.category,
+            func.count().label("count"),
+            func.coalesce(func.sum(ContentIdea.potential_score), 0.0).label("score_sum"),
+        ).group_by(ContentIdea.status, ContentIdea.priority, ContentIdea.category)
+        return list(self.session.execute(stmt).all())
 
 
 class PlaybookRuleRepository(BaseRepository[PlaybookRule]):
@@ -421,17 +1102,81 @@ class PlaybookRuleRepository(BaseRepository[PlaybookRule]):
         )
         return list(self.session.scalars(stmt).all())
     
+    @staticmethod
+    def _application_values(applied, successful) -> dict:
+        """ค่าที่ SET เมื่อบันทึกการใช้งาน rule (บวกค่าในฐานข้อมูล ไม่ต้องโหลด rule มาก่อน)"""
+        table = PlaybookRule.__table__
+        times_applied = table.c.times_applied + applied
+        times_successful = table.c.times_successful + successful
+        return {
+            "times_applied": times_applied,
+            "times_successful": times_successful,
+            "success_rate": cast(times_successful, Float) / times_applied,
+            "last_applied_at": utcnow(),
+        }
+    
     def record_application(self, id: int, success: bool) -> Optional[PlaybookRule]:
-        """บันทึกการใช้งาน rule"""
-        rule = self.get_by_id(id)
-        if rule:
-            rule.times_applied += 1
-            if success:
-                rule.times_successful += 1
-            rule.success_rate = rule.times_successful / rule.times_applied
-            rule.last_applied_at = datetime.utcnow()
-            self.session.flush()
-        return rule
+        """บันทึกการใช้งาน rule - UPDATE ... RETURNING รอบเดียว คืนค่า rule ที่อัพเดทแล้ว"""
+        stmt = (
+            update(PlaybookRule)
+            .where(PlaybookRule.id == id)
+            .values(**self._application_values(1, int(bool(success))))
+            .returning(PlaybookRule)
+        )
+        return self.session.scalars(stmt, execution_options={"populate_existing": True}).one_or_none()
+    
+    def record_applications(self, results: Iterable[Tuple[int, bool]]) -> int:
+        """
+        บันทึกการใช้งานหลาย rules ในครั้งเดียว
+        รวมยอดต่อ rule ใน Python แล้ว UPDATE ทีละ rule ด้วย executemany statement เดียว
+        (บวกค่าในฐานข้อมูล ไม่ต้องโหลด rule มาก่อน)
+        
+        Args:
+            results: iterable ของ (rule_id, success)
+            
+        Returns:
+            จำนวน rules ที่อัพเดท
+        """
+        deltas: Dict[int, List[int]] = {}
+        for rule_id, success in results:
+            delta = deltas.setdefault(rule_id, [0, 0])
+            delta[0] += 1
+            delta[1] += int(bool(success))
+        if not deltas:
+            return 0
+        
+        table = PlaybookRule.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("rule_id"))
+            .values(**self._application_values(bindparam("applied"), bindparam("successful")))
+        )
+        result = self.session.execute(stmt, [
+            {"rule_id": rule_id, "applied": applied_count, "successful": successful_count}
+            for rule_id, (applied_count, successful_count) in deltas.items()
+        ])
+        
+        # rule ที่โหลดอยู่ใน session ต้องโหลดค่าใหม่
+        for obj in list(self.session.identity_map.values()):
+            if isinstance(obj, PlaybookRule) and obj.id in deltas:
+                self.session.expire(obj)
+        return result.rowcount
+    
+    def get_with_sample_videos(self, ids: List[int]) -> List[PlaybookRule]:
+        """ดึง rules พร้อมวิดีโอตัวอย่าง (2 queries รวม ไม่ว่าจะกี่ rule)"""
+        stmt = (
+            select(PlaybookRule)
+            .where(PlaybookRule.id.in_(ids))
+            .options(selectinload(PlaybookRule.sample_video_list), raiseload("*"))
+        )
+        return list(self.session.scalars(stmt).all())
+    
+    def sync_sample_videos(self, rule_id: int, video_ids: List[int]) -> None:
+        """ตั้งค่า rule_sample_videos ของ rule ให้ตรงกับ list ของ video ID"""
+        self.session.execute(delete(rule_sample_videos).where(rule_sample_videos.c.rule_id == rule_id))
+        rows = [{"rule_id": rule_id, "video_id": video_id} for video_id in dict.fromkeys(video_ids)]
+        if rows:
+            self.session.execute(insert(rule_sample_videos), rows)
     
     def get_auto_generated(self) -> List[PlaybookRule]:
         """ดึง rules ที่ถูกสร้างอัตโนมัติ"""
@@ -451,15 +1196,30 @@ class RunLogRepository(BaseRepository[RunLog]):
     
     def create_run(self, run_type: str, triggered_by: str = "system", **kwargs) -> RunLog:
         """สร้าง run log ใหม่"""
-        run_id = f"{run_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:8]}"
         return self.create(
-            run_id=run_id,
             run_type=run_type,
             triggered_by=triggered_by,
             status="running",
             **kwargs,
         )
     
+    def _finish_run(self, id: int, **values) -> Optional[RunLog]:
+        """
+        ปิด run - UPDATE ... RETURNING รอบเดียว
+        completed_at / duration_seconds คำนวณจากนาฬิกาของฐานข้อมูล (เวลาเดียวกับ started_at)
+        """
+        stmt = (
+            update(RunLog)
+            .where(RunLog.id == id)
+            .values(
+                completed_at=utcnow(),
+                duration_seconds=seconds_since(RunLog.started_at),
+                **values,
+            )
+            .returning(RunLog)
+        )
+        return self.session.scalars(stmt, execution_options={"populate_existing": True}).one_or_none()
+    
     def complete_run(
         self,
         id: int,
@@ -470,29 +1230,23 @@ class RunLogRepository(BaseRepository[RunLog]):
         items_failed: int = 0,
     ) -> Optional[RunLog]:
         """อัพเดท run log เมื่อเสร็จสิ้น"""
-        run = self.get_by_id(id)
-        if run:
-            run.status = status
-            run.completed_at = datetime.utcnow()
-            run.duration_seconds = (run.completed_at - run.started_at).total_seconds()
-            run.result = result
-            run.items_processed = items_processed
-            run.items_succeeded = items_succeeded
-            run.items_failed = items_failed
-            self.session.flush()
-        return run
+        return self._finish_run(
+            id,
+            status=status,
+            result=result,
+            items_processed=items_processed,
+            items_succeeded=items_succeeded,
+            items_failed=items_failed,
+        )
     
     def fail_run(self, id: int, error_message: str, error_traceback: Optional[str] = None) -> Optional[RunLog]:
         """บันทึก error สำหรับ run ที่ล้มเหลว"""
-        run = self.get_by_id(id)
-        if run:
-            run.status = "failed"
-            run.completed_at = datetime.utcnow()
-            run.duration_seconds = (run.completed_at - run.started_at).total_seconds()
-            run.error_message = error_message
-            run.error_traceback = error_traceback
-            self.session.flush()
-        return run
+        return self._finish_run(
+            id,
+            status="failed",
+            error_message=error_message,
+            error_traceback=error_traceback,
+        )
     
     def get_recent_runs(self, run_type: Optional[str] = None, limit: int = 50) -> List[RunLog]:
         """ดึง runs ล่าสุด"""
@@ -521,16 +1275,53 @@ class RunLogRepository(BaseRepository[RunLog]):
         return list(self.session.scalars(stmt).all())
     
     def get_run_stats(self, run_type: Optional[str] = None, days: int = 30) -> dict:
-        """คำนวณ statistics ของ runs"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        """
+        คำนวณ statistics ของ runs
+        
+        บน SQLite รวมจาก run_stats_daily (แถวละ run_type ต่อวัน ดูแลโดย triggers) แทนการ scan runs_log
+        ช่วงเวลานับเป็นวัน: runs ทั้งวันของวันแรกในช่วงถูกนับด้วย
+        
+        ฐานข้อมูลอื่น (เช่น PostgreSQL) ไม่มี triggers ชุดนี้ จึง scan runs_log ตาม started_at
+        เสมอ (_scan_run_stats) - run_stats_daily ไม่ถูกอัพเดทและไม่ได้ใช้
+        """
+        if not _has_sqlite_object(self.session, "runs_log_stats_ai"):
+            return self._scan_run_stats(run_type, days)
+        
+        cutoff_day = _utc_cutoff(days).date()
+        conditions = [RunStatsDaily.day >= cutoff_day]
+        if run_type:
+            conditions.append(RunStatsDaily.run_type == run_type)
+        
+        stmt = select(
+            func.sum(RunStatsDaily.total_runs).label("total_runs"),
+            func.sum(RunStatsDaily.completed).label("completed"),
+            func.sum(RunStatsDaily.failed).label("failed"),
+            func.sum(RunStatsDaily.total_duration).label("total_duration"),
+            func.sum(RunStatsDaily.duration_count).label("duration_count"),
+        ).where(and_(*conditions))
+        
+        result = self.session.execute(stmt).first()
+        total_runs = result.total_runs or 0
+        completed = result.completed or 0
+        return {
+            "total_runs": total_runs,
+            "completed": completed,
+            "failed": result.failed or 0,
+            "avg_duration": (result.total_duration / result.duration_count) if result.duration_count else 0.0,
+            "success_rate": (completed / total_runs * 100) if total_runs else 0.0,
+        }
+    
+    def _scan_run_stats(self, run_type: Optional[str], days: int) -> dict:
+        """คำนวณ statistics จาก runs_log โดยตรง (ฐานข้อมูลที่ไม่มี run_stats_daily)"""
+        cutoff_date = _utc_cutoff(days)
         conditions = [RunLog.started_at >= cutoff_date]
         if run_type:
             conditions.append(RunLog.run_type == run_type)
         
         stmt = select(
             func.count(RunLog.id).label("total_runs"),
-            func.sum(func.case((RunLog.status == "completed", 1), else_=0)).label("completed"),
-            func.sum(func.case((RunLog.status == "failed", 1), else_=0)).label("failed"),
+            func.sum(case((RunLog.status == "completed", 1), else_=0)).label("completed"),
+            func.sum(case((RunLog.status == "failed", 1), else_=0)).label("failed"),
             func.avg(RunLog.duration_seconds).label("avg_duration"),
         ).where(and_(*conditions))
         
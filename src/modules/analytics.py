@@ -3,9 +3,10 @@ Analytics Module - วิเคราะห์ข้อมูลและ metric
 รองรับการคำนวณ trends, performance scores, และ insights
 """
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, NamedTuple
+from dataclasses import dataclass, asdict
 
 import pandas as pd
 import numpy as np
@@ -50,6 +51,41 @@ class TrendAnalysis:
     is_significant: bool
 
 
+@dataclass(slots=True)
+class VideoComparison:
+    """ผลเปรียบเทียบของวิดีโอหนึ่งใน compare_videos"""
+    video_id: int
+    title: str
+    view_count: int
+    like_count: int
+    comment_count: int
+    overall_score: float
+    engagement_score: float
+    total_views: int
+    total_likes: int
+    total_comments: int
+    avg_view_percentage: float
+    total_watch_time: float
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def to_dataframe(comparisons: List[VideoComparison]) -> pd.DataFrame:
+    """แปลงผลของ compare_videos เป็น DataFrame (สำหรับผู้เรียกที่ต้องการตาราง)"""
+    return pd.DataFrame([comparison.to_dict() for comparison in comparisons])
+
+
+class ScoreAggregates(NamedTuple):
+    """ผลรวม/ค่าเฉลี่ยสำหรับคำนวณ score (ฟิลด์เดียวกับ DailyMetricRepository.get_score_aggregates)"""
+    days: int
+    total_views: int
+    total_likes: int
+    total_comments: int
+    avg_view_percentage: Optional[float]
+    index_weighted_views: int
+
+
 class AnalyticsModule:
     """
     โมดูลวิเคราะห์ข้อมูล YouTube
@@ -61,6 +97,9 @@ class AnalyticsModule:
     - การเปรียบเทียบวิดีโอ
     """
     
+    # metrics ที่ analyze_trends เปรียบเทียบ (ชื่อคอลัมน์ของ DailyMetric)
+    TREND_METRICS = ("views", "likes", "comments", "watch_time_minutes")
+    
     def __init__(self, session: Session):
         self.session = session
         self.video_repo = VideoRepository(session)
@@ -90,26 +129,20 @@ class AnalyticsModule:
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        metrics = self.metric_repo.get_video_metrics(video_id, start_date, end_date)
-        if not metrics:
+        # ผลรวม/ค่าเฉลี่ยคำนวณในฐานข้อมูล (query เดียว ไม่ต้องโหลดทุกแถวมาทำ DataFrame)
+        agg = self.metric_repo.get_score_aggregates(video_id, start_date, end_date)
+        if agg is None:
             logger.warning(f"ไม่มี metrics สำหรับวิดีโอ ID: {video_id}")
             return None
         
-        # แปลงเป็น DataFrame
-        df = pd.DataFrame([{
-            "date": m.date,
-            "views": m.views,
-            "likes": m.likes,
-            "comments": m.comments,
-            "watch_time": m.watch_time_minutes,
-            "avg_view_percentage": m.average_view_percentage,
-        } for m in metrics])
-        
-        # คำนวณ scores (0-100)
-        view_score = self._calculate_view_score(df)
-        engagement_score = self._calculate_engagement_score(df)
-        retention_score = self._calculate_retention_score(df)
-        growth_score = self._calculate_growth_score(df)
+        return self._build_performance_score(video_id, agg)
+    
+    def _build_performance_score(self, video_id: int, agg) -> PerformanceScore:
+        """คำนวณ scores (0-100) จากผลรวม/ค่าเฉลี่ย (Row จาก get_score_aggregates หรือ ScoreAggregates)"""
+        view_score = self._calculate_view_score(agg)
+        engagement_score = self._calculate_engagement_score(agg)
+        retention_score = self._calculate_retention_score(agg)
+        growth_score = self._calculate_growth_score(agg)
         
         # Overall score (weighted average)
         overall_score = (
@@ -128,59 +161,87 @@ class AnalyticsModule:
             growth_score=round(growth_score, 2),
         )
     
-    def _calculate_view_score(self, df: pd.DataFrame) -> float:
+    @staticmethod
+    def _aggregate_metrics(metrics: List[DailyMetric]) -> Optional[ScoreAggregates]:
+        """ผลรวม/ค่าเฉลี่ยของ metrics ที่ดึงมาแล้ว (เรียงตามวันที่) - แบบเดียวกับ get_score_aggregates"""
+        if not metrics:
+            return None
+        
+        # ผ่าน metrics รอบเดียว (อ่าน attribute ของแต่ละแถวครั้งเดียว)
+        total_views = total_likes = total_comments = index_weighted_views = 0
+        percentage_sum = 0.0
+        percentage_count = 0
+        for index, metric in enumerate(metrics, start=1):
+            views = metric.views or 0
+            total_views += views
+            index_weighted_views += index * views
+            total_likes += metric.likes or 0
+            total_comments += metric.comments or 0
+            if metric.average_view_percentage is not None:
+                percentage_sum += metric.average_view_percentage
+                percentage_count += 1
+        
+        return ScoreAggregates(
+            days=len(metrics),
+            total_views=total_views,
+            total_likes=total_likes,
+            total_comments=total_comments,
+            avg_view_percentage=percentage_sum / percentage_count if percentage_count else None,
+            index_weighted_views=index_weighted_views,
+        )
+    
+    def _calculate_view_score(self, agg) -> float:
         """คำนวณ view score"""
-        if df.empty or df["views"].sum() == 0:
+        if agg.total_views == 0:
             return 0.0
         
-        total_views = df["views"].sum()
-        avg_daily_views = df["views"].mean()
+        avg_daily_views = agg.total_views / agg.days
         
         # Normalize to 0-100 (ปรับตามขนาด channel)
         # สมมติว่า 10,000 views/day = 100 score
         score = min(100, (avg_daily_views / 10000) * 100)
         return score
     
-    def _calculate_engagement_score(self, df: pd.DataFrame) -> float:
+    def _calculate_engagement_score(self, agg) -> float:
         """คำนวณ engagement score"""
-        if df.empty or df["views"].sum() == 0:
+        if agg.total_views == 0:
             return 0.0
         
-        total_views = df["views"].sum()
-        total_likes = df["likes"].sum()
-        total_comments = df["comments"].sum()
-        
         # Engagement rate
-        engagement_rate = ((total_likes + total_comments) / total_views) * 100
+        engagement_rate = ((agg.total_likes + agg.total_comments) / agg.total_views) * 100
         
         # Normalize to 0-100 (5% engagement = 100 score)
         score = min(100, (engagement_rate / 5) * 100)
         return score
     
-    def _calculate_retention_score(self, df: pd.DataFrame) -> float:
+    def _calculate_retention_score(self, agg) -> float:
         """คำนวณ retention score"""
-        if df.empty:
+        if agg.avg_view_percentage is None:
             return 0.0
         
-        avg_view_percentage = df["avg_view_percentage"].mean()
-        
         # 50% retention = 100 score
-        score = min(100, (avg_view_percentage / 50) * 100)
+        score = min(100, (agg.avg_view_percentage / 50) * 100)
         return score
     
-    def _calculate_growth_score(self, df: pd.DataFrame) -> float:
-        """คำนวณ growth score"""
-        if len(df) < 7:
-            return 50.0  # Neutral score if not enough data
+    def _calculate_growth_score(self, agg) -> float:
+        """
+        คำนวณ growth score จากความชันของเส้นแนวโน้ม views (least squares ทุกวันในช่วง)
         
-        # เปรียบเทียบ 7 วันแรกกับ 7 วันหลัง
-        first_week = df.head(7)["views"].sum()
-        last_week = df.tail(7)["views"].sum()
+        ใช้แค่ผลรวม (n, Σy, Σxy) ที่ได้จาก query - x = ลำดับวัน 1..n จึงหา Σx, Σx² ได้จากสูตร
+        """
+        n = agg.days
+        if n < 7:
+            return 50.0  # Neutral score if not enough data
         
-        if first_week == 0:
+        if agg.total_views == 0:
             return 50.0
         
-        growth_rate = ((last_week - first_week) / first_week) * 100
+        sum_x = n * (n + 1) / 2
+        sum_xx = n * (n + 1) * (2 * n + 1) / 6
+        slope = (n * agg.index_weighted_views - sum_x * agg.total_views) / (n * sum_xx - sum_x ** 2)
+        
+        # % ที่ views เปลี่ยนไปตลอดช่วงตามเส้นแนวโน้ม เทียบกับค่าเฉลี่ยต่อวัน
+        growth_rate = slope * (n - 1) / (agg.total_views / n) * 100
         
         # Normalize: -50% to +50% growth = 0-100 score
         score = 50 + growth_rate
@@ -206,17 +267,47 @@ class AnalyticsModule:
         mid_date = end_date - timedelta(days=period_days)
         start_date = mid_date - timedelta(days=period_days)
         
-        # ดึง metrics สำหรับทั้ง 2 periods
-        current_metrics = self.metric_repo.get_video_metrics(video_id, mid_date, end_date)
-        previous_metrics = self.metric_repo.get_video_metrics(video_id, start_date, mid_date)
+        # ผลรวมของทั้ง 2 periods จาก aggregate query เดียว (ไม่โหลด metrics ทีละแถว)
+        sums = self.metric_repo.get_period_sums(
+            video_id, start_date, mid_date, end_date, self.TREND_METRICS
+        )._mapping
+        return self._build_trends({
+            name: (sums[f"current_{name}"], sums[f"previous_{name}"])
+            for name in self.TREND_METRICS
+        })
+    
+    def _analyze_trends_from_metrics(
+        self,
+        metrics: List[DailyMetric],
+        end_date: date,
+        period_days: int = 7,
+    ) -> List[TrendAnalysis]:
+        """
+        วิเคราะห์ trends จาก metrics ที่ดึงมาแล้ว (เรียงตามวันที่ ครอบคลุมอย่างน้อย period_days * 2 วัน)
+        
+        period ปัจจุบัน = [end_date - period_days, end_date], period ก่อนหน้า = period_days วันก่อนนั้น
+        (รวมวันรอยต่อทั้งสองฝั่งเหมือนการดึงแยก 2 ช่วงแบบเดิม)
+        """
+        mid_date = end_date - timedelta(days=period_days)
+        start_date = mid_date - timedelta(days=period_days)
         
+        dates = [m.date for m in metrics]
+        current_metrics = metrics[bisect_left(dates, mid_date):bisect_right(dates, end_date)]
+        previous_metrics = metrics[bisect_left(dates, start_date):bisect_right(dates, mid_date)]
+        
+        return self._build_trends({
+            name: (
+                sum(getattr(m, name, 0) for m in current_metrics),
+                sum(getattr(m, name, 0) for m in previous_metrics),
+            )
+            for name in self.TREND_METRICS
+        })
+    
+    def _build_trends(self, sums: Dict[str, tuple]) -> List[TrendAnalysis]:
+        """สร้าง TrendAnalysis จากผลรวมของแต่ละ metric: {ชื่อ metric: (period ปัจจุบัน, period ก่อนหน้า)}"""
         trends = []
-        metrics_to_analyze = ["views", "likes", "comments", "watch_time_minutes"]
         
-        for metric_name in metrics_to_analyze:
-            current_sum = sum(getattr(m, metric_name, 0) for m in current_metrics)
-            previous_sum = sum(getattr(m, metric_name, 0) for m in previous_metrics)
-            
+        for metric_name, (current_sum, previous_sum) in sums.items():
             if previous_sum > 0:
                 change_percent = ((current_sum - previous_sum) / previous_sum) * 100
             else:
@@ -253,31 +344,25 @@ class AnalyticsModule:
         """
         self.task_logger.start("กำลังสรุปข้อมูล channel")
         
-        # ดึงวิดีโอ
-        if channel_id:
-            videos = self.video_repo.get_by_channel(channel_id)
-        else:
-            videos = self.video_repo.get_all(limit=1000)
+        # ผลรวมและ top 5 คำนวณในฐานข้อมูล (ไม่ดึงวิดีโอทีละแถวมารวมใน Python)
+        limit = 50 if channel_id else 1000
+        stats = self.video_repo.get_summary_stats(channel_id=channel_id, limit=limit)
         
-        if not videos:
+        if not stats["total_videos"]:
             return {"error": "ไม่พบวิดีโอ"}
         
         # คำนวณสถิติ
-        total_videos = len(videos)
-        total_views = sum(v.view_count for v in videos)
-        total_likes = sum(v.like_count for v in videos)
-        total_comments = sum(v.comment_count for v in videos)
+        total_videos = stats["total_videos"]
+        total_views = stats["total_views"]
+        total_likes = stats["total_likes"]
+        total_comments = stats["total_comments"]
         
         avg_views = total_views / total_videos if total_videos > 0 else 0
         avg_likes = total_likes / total_videos if total_videos > 0 else 0
         
         # Top videos
-        top_by_views = sorted(videos, key=lambda v: v.view_count, reverse=True)[:5]
-        top_by_engagement = sorted(
-            videos,
-            key=lambda v: (v.like_count + v.comment_count) / max(v.view_count, 1),
-            reverse=True
-        )[:5]
+        top_by_views = stats["top_by_views"]
+        top_by_engagement = stats["top_by_engagement"]
         
         self.task_logger.complete("สรุปข้อมูลเสร็จสิ้น")
         
@@ -293,7 +378,7 @@ class AnalyticsModule:
             "top_by_engagement": [{"id": v.id, "title": v.title} for v in top_by_engagement],
         }
     
-    def compare_videos(self, video_ids: List[int]) -> pd.DataFrame:
+    def compare_videos(self, video_ids: List[int]) -> List[VideoComparison]:
         """
         เปรียบเทียบ performance ของหลายวิดีโอ
         
@@ -301,30 +386,39 @@ class AnalyticsModule:
             video_ids: List ของ video IDs
             
         Returns:
-            DataFrame ของการเปรียบเทียบ
+            List ของ VideoComparison ตามลำดับ video_ids (ใช้ to_dataframe() ถ้าต้องการตาราง)
         """
         comparisons = []
+        videos = self.video_repo.get_many_by_id(video_ids)
+        all_stats = self.metric_repo.get_aggregate_stats_many(videos)
+        
+        # score ของทุกวิดีโอจาก aggregate query เดียว (ช่วง 30 วันเหมือน calculate_performance_score)
+        end_date = date.today()
+        all_aggregates = self.metric_repo.get_score_aggregates_many(
+            videos, end_date - timedelta(days=30), end_date
+        )
         
         for video_id in video_ids:
-            video = self.video_repo.get_by_id(video_id)
+            video = videos.get(video_id)
             if not video:
                 continue
             
-            score = self.calculate_performance_score(video_id)
-            stats = self.metric_repo.get_aggregate_stats(video_id)
+            agg = all_aggregates.get(video_id)
+            score = self._build_performance_score(video_id, agg) if agg else None
+            stats = all_stats[video_id]
             
-            comparisons.append({
-                "video_id": video_id,
-                "title": video.title[:50],
-                "view_count": video.view_count,
-                "like_count": video.like_count,
-                "comment_count": video.comment_count,
-                "overall_score": score.overall_score if score else 0,
-                "engagement_score": score.engagement_score if score else 0,
+            comparisons.append(VideoComparison(
+                video_id=video_id,
+                title=video.title[:50],
+                view_count=video.view_count,
+                like_count=video.like_count,
+                comment_count=video.comment_count,
+                overall_score=score.overall_score if score else 0,
+                engagement_score=score.engagement_score if score else 0,
                 **stats,
-            })
+            ))
         
-        return pd.DataFrame(comparisons)
+        return comparisons
     
     def get_best_posting_times(self, days: int = 90) -> Dict[str, List[int]]:
         """
@@ -336,40 +430,20 @@ class AnalyticsModule:
         Returns:
             Dictionary ของวันและชั่วโมงที่ดีที่สุด
         """
-        videos = self.video_repo.get_recent(days=days, limit=100)
+        # ใช้ engagement rate เป็น metric (คำนวณในฐานข้อมูล เฉพาะวิดีโอที่มี views)
+        videos = self.video_repo.list_posting_engagement(days=days, limit=100)
         
         if not videos:
             return {"best_days": [], "best_hours": []}
         
-        # วิเคราะห์ตามวันและเวลา
-        day_performance = {i: [] for i in range(7)}  # 0=Monday
-        hour_performance = {i: [] for i in range(24)}
+        count = len(videos)
+        days_of_week = np.fromiter((v.published_at.weekday() for v in videos), dtype=np.intp, count=count)
+        hours = np.fromiter((v.published_at.hour for v in videos), dtype=np.intp, count=count)
+        engagement = np.fromiter((v.engagement for v in videos), dtype=np.float64, count=count)
         
-        for video in videos:
-            if not video.published_at:
-                continue
-            
-            day = video.published_at.weekday()
-            hour = video.published_at.hour
-            
-            # ใช้ engagement rate เป็น metric
-            if video.view_count > 0:
-                engagement = (video.like_count + video.comment_count) / video.view_count
-                day_performance[day].append(engagement)
-                hour_performance[hour].append(engagement)
-        
-        # หาวันและเวลาที่ดีที่สุด
-        best_days = sorted(
-            day_performance.keys(),
-            key=lambda d: np.mean(day_performance[d]) if day_performance[d] else 0,
-            reverse=True
-        )[:3]
-        
-        best_hours = sorted(
-            hour_performance.keys(),
-            key=lambda h: np.mean(hour_performance[h]) if hour_performance[h] else 0,
-            reverse=True
-        )[:5]
+        # หาวันและเวลาที่ดีที่สุด (ค่าเฉลี่ย engagement ต่อช่อง - ช่องที่ไม่มีวิดีโอ = 0)
+        best_days = self._rank_buckets(days_of_week, engagement, 7)[:3]
+        best_hours = self._rank_buckets(hours, engagement, 24)[:5]
         
         return {
             "best_days": best_days,
@@ -377,6 +451,14 @@ class AnalyticsModule:
             "day_names": ["จันทร์", "อังคาร", "พุธ", "พฤหัส", "ศุกร์", "เสาร์", "อาทิตย์"],
         }
     
+    @staticmethod
+    def _rank_buckets(buckets: np.ndarray, values: np.ndarray, size: int) -> List[int]:
+        """เรียงช่อง (วัน / ชั่วโมง) ตามค่าเฉลี่ยของ values จากมากไปน้อย"""
+        totals = np.bincount(buckets, weights=values, minlength=size)
+        counts = np.bincount(buckets, minlength=size)
+        means = np.divide(totals, counts, out=np.zeros(size), where=counts > 0)
+        return np.argsort(-means, kind="stable").tolist()
+    
     def generate_insights(self, video_id: Optional[int] = None) -> List[str]:
         """
         สร้าง insights อัตโนมัติ
@@ -390,9 +472,12 @@ class AnalyticsModule:
         insights = []
         
         if video_id:
-            # Insights สำหรับวิดีโอเดียว
-            score = self.calculate_performance_score(video_id)
-            trends = self.analyze_trends(video_id)
+            # Insights สำหรับวิดีโอเดียว - ดึง metrics 30 วันครั้งเดียว ใช้ทั้ง score และ trends
+            end_date = date.today()
+            metrics = self.metric_repo.get_video_metrics(video_id, end_date - timedelta(days=30), end_date)
+            agg = self._aggregate_metrics(metrics)
+            score = self._build_performance_score(video_id, agg) if agg else None
+            trends = self._analyze_trends_from_metrics(metrics, end_date)
             
             if score:
                 if score.overall_score >= 70:
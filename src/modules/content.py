@@ -3,6 +3,7 @@ Content Module - จัดการไอเดียเนื้อหาแล
 รองรับการสร้าง, จัดการ, และติดตามไอเดียวิดีโอ
 """
 
+from collections import Counter
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, field
@@ -309,13 +310,10 @@ class ContentModule:
         
         suggestions = []
         
-        # ดึง actionable research items
-        research_items = self.research_repo.get_actionable(limit=count * 2)
+        # ดึง actionable research items (กรอง categories ในฐานข้อมูล ได้ครบ count ถ้ามีพอ)
+        research_items = self.research_repo.get_actionable(limit=count, categories=categories)
         
-        for item in research_items[:count]:
-            if categories and item.category not in categories:
-                continue
-            
+        for item in research_items:
             suggestion = IdeaSuggestion(
                 title=f"วิดีโอเกี่ยวกับ: {item.title}",
                 category=item.category or "general",
@@ -326,13 +324,11 @@ class ContentModule:
             )
             suggestions.append(suggestion)
         
-        # ดึง trending topics
-        trending = self.research_repo.get_trending(min_score=0.7, limit=count)
+        # เติมที่เหลือด้วย trending topics (ไม่ต้อง query ถ้าได้ครบแล้ว)
+        remaining = count - len(suggestions)
+        trending = self.research_repo.get_trending(min_score=0.7, limit=remaining) if remaining > 0 else []
         
         for item in trending:
-            if len(suggestions) >= count:
-                break
-            
             suggestion = IdeaSuggestion(
                 title=f"Trending: {item.title}",
                 category=item.category or "trending",
@@ -354,23 +350,28 @@ class ContentModule:
         Returns:
             Dictionary ของสถิติ
         """
-        all_ideas = self.idea_repo.get_all(limit=1000)
-        
-        status_counts = {}
-        priority_counts = {}
-        category_counts = {}
-        
-        for idea in all_ideas:
-            status_counts[idea.status] = status_counts.get(idea.status, 0) + 1
-            priority_counts[idea.priority] = priority_counts.get(idea.priority, 0) + 1
-            category_counts[idea.category] = category_counts.get(idea.category, 0) + 1
+        # นับในฐานข้อมูล (GROUP BY) แล้วรวมแต่ละมิติ - ไม่โหลด ideas ทีละแถว
+        groups = self.idea_repo.get_stat_groups()
+        
+        status_counts = Counter()
+        priority_counts = Counter()
+        category_counts = Counter()
+        total_ideas = 0
+        total_score = 0.0
+        
+        for group in groups:
+            status_counts[group.status] += group.count
+            priority_counts[group.priority] += group.count
+            category_counts[group.category] += group.count
+            total_ideas += group.count
+            total_score += group.score_sum
         
         return {
-            "total_ideas": len(all_ideas),
-            "by_status": status_counts,
-            "by_priority": priority_counts,
-            "by_category": category_counts,
-            "avg_potential_score": sum(i.potential_score for i in all_ideas) / len(all_ideas) if all_ideas else 0,
+            "total_ideas": total_ideas,
+            "by_status": dict(status_counts),
+            "by_priority": dict(priority_counts),
+            "by_category": dict(category_counts),
+            "avg_potential_score": total_score / total_ideas if total_ideas else 0,
         }
     
     def archive_old_ideas(self, days: int = 90) -> int:
@@ -384,13 +385,7 @@ class ContentModule:
             จำนวนไอเดียที่ถูก archive
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        draft_ideas = self.idea_repo.get_by_status("draft")
-        
-        archived_count = 0
-        for idea in draft_ideas:
-            if idea.created_at < cutoff_date:
-                self.idea_repo.update(idea.id, status="archived")
-                archived_count += 1
+        archived_count = self.idea_repo.archive_drafts_before(cutoff_date)
         
         if archived_count > 0:
             self.session.commit()
@@ -408,20 +403,12 @@ class ContentModule:
         Returns:
             List ของ dictionary
         """
-        if status:
-            ideas = self.idea_repo.get_by_status(status)
-        else:
-            ideas = self.idea_repo.get_all(limit=1000)
+        # อ่านอย่างเดียว - ดึงเฉพาะคอลัมน์ที่ export (ไม่สร้าง ORM object)
+        ideas = self.idea_repo.list_for_export(status, limit=50 if status else 1000)
         
         return [
             {
-                "id": idea.id,
-                "title": idea.title,
-                "category": idea.category,
-                "description": idea.description,
-                "priority": idea.priority,
-                "status": idea.status,
-                "potential_score": idea.potential_score,
+                **idea._asdict(),
                 "scheduled_date": str(idea.scheduled_date) if idea.scheduled_date else None,
                 "created_at": str(idea.created_at),
             }
@@ -3,10 +3,12 @@ Playbook Module - จัดการกฎการปรับปรุงต
 ระบบเรียนรู้จาก patterns และสร้างกฎสำหรับปรับปรุง content strategy
 """
 
+import operator
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from src.db.models import PlaybookRule, Video, DailyMetric
@@ -15,6 +17,18 @@ from src.utils.logger import get_logger, TaskLogger
 
 logger = get_logger()
 
+# operators ของเงื่อนไขกฎ (condition["operator"]) -> ฟังก์ชันเปรียบเทียบ (context_value, rule_value)
+CONDITION_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "lt": operator.lt,
+    "gte": operator.ge,
+    "lte": operator.le,
+    "contains": lambda a, b: b in str(a),
+    "in": lambda a, b: a in b,
+}
+
 
 @dataclass
 class RuleCondition:
@@ -69,6 +83,8 @@ class PlaybookModule:
         self.video_repo = VideoRepository(session)
         self.metric_repo = DailyMetricRepository(session)
         self.task_logger = TaskLogger("Playbook")
+        # rule_id -> (condition ที่ compile, ฟังก์ชันตรวจเงื่อนไข) - ใช้ซ้ำตราบที่ยังเป็น condition object เดิม
+        self._compiled: Dict[int, Tuple[Dict[str, Any], Callable[[Dict[str, Any]], bool]]] = {}
     
     def create_rule(
         self,
@@ -137,6 +153,9 @@ class PlaybookModule:
             if rule:
                 kwargs["version"] = rule.version + 1
         
+        if "condition" in kwargs:
+            self._compiled.pop(rule_id, None)
+        
         rule = self.rule_repo.update(rule_id, **kwargs)
         if rule:
             self.session.commit()
@@ -202,7 +221,7 @@ class PlaybookModule:
         evaluations = []
         
         for rule in rules:
-            is_applicable = self._check_condition(rule.condition, context)
+            is_applicable = self._get_compiled_condition(rule)(context)
             
             if is_applicable:
                 recommendation = rule.action.get("recommendation", "")
@@ -236,32 +255,37 @@ class PlaybookModule:
         Returns:
             True ถ้าเงื่อนไขเป็นจริง
         """
+        return self._compile_condition(condition)(context)
+    
+    def _get_compiled_condition(self, rule: PlaybookRule) -> Callable[[Dict[str, Any]], bool]:
+        """ฟังก์ชันตรวจเงื่อนไขของกฎ (compile ครั้งแรก หรือเมื่อ condition ถูกโหลดใหม่ / เปลี่ยน)"""
+        cached = self._compiled.get(rule.id)
+        if cached is not None and cached[0] is rule.condition:
+            return cached[1]
+        
+        check = self._compile_condition(rule.condition)
+        self._compiled[rule.id] = (rule.condition, check)
+        return check
+    
+    @staticmethod
+    def _compile_condition(condition: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """
+        แปลงเงื่อนไขเป็นฟังก์ชัน check(context) -> bool
+        (อ่าน field / operator / value ครั้งเดียวตอน compile ไม่ต้องอ่านซ้ำทุกครั้งที่ประเมิน)
+        """
         field = condition.get("field")
-        operator = condition.get("operator", "eq")
+        op_func = CONDITION_OPERATORS.get(condition.get("operator", "eq"), operator.eq)
         value = condition.get("value")
         
-        if field not in context:
-            return False
-        
-        context_value = context[field]
-        
-        operators = {
-            "eq": lambda a, b: a == b,
-            "ne": lambda a, b: a != b,
-            "gt": lambda a, b: a > b,
-            "lt": lambda a, b: a < b,
-            "gte": lambda a, b: a >= b,
-            "lte": lambda a, b: a <= b,
-            "contains": lambda a, b: b in str(a),
-            "in": lambda a, b: a in b,
-        }
-        
-        op_func = operators.get(operator, operators["eq"])
+        def check(context: Dict[str, Any]) -> bool:
+            if field not in context:
+                return False
+            try:
+                return op_func(context[field], value)
+            except Exception:
+                return False
         
-        try:
-            return op_func(context_value, value)
-        except Exception:
-            return False
+        return check
     
     def record_rule_application(
         self,
@@ -289,6 +313,7 @@ class PlaybookModule:
                 sample_videos["videos"].append(video_id)
                 sample_videos["videos"] = sample_videos["videos"][-20:]  # Keep last 20
                 self.rule_repo.update(rule_id, sample_videos=sample_videos)
+                self.rule_repo.sync_sample_videos(rule_id, sample_videos["videos"])
         
         if rule:
             self.session.commit()
@@ -348,88 +373,85 @@ class PlaybookModule:
             List ของ patterns
         """
         patterns = []
+        if not videos:
+            return patterns
+        
+        # ดึงค่าที่ใช้เป็น array ครั้งเดียว (hour = -1 / duration = 0 ถ้าไม่มีข้อมูล)
+        count = len(videos)
+        views = np.fromiter((v.view_count or 0 for v in videos), dtype=np.float64, count=count)
+        title_lengths = np.fromiter((len(v.title) for v in videos), dtype=np.int64, count=count)
+        hours = np.fromiter(
+            (v.published_at.hour if v.published_at else -1 for v in videos), dtype=np.int64, count=count
+        )
+        durations = np.fromiter((v.duration_seconds or 0 for v in videos), dtype=np.int64, count=count)
         
         # Pattern 1: Title length
-        title_lengths = [(v, len(v.title)) for v in videos]
-        avg_views_by_length = {}
-        
-        for video, length in title_lengths:
-            bucket = (length // 10) * 10  # Group by 10 characters
-            if bucket not in avg_views_by_length:
-                avg_views_by_length[bucket] = []
-            avg_views_by_length[bucket].append(video.view_count)
-        
-        best_length_bucket = max(
-            avg_views_by_length.keys(),
-            key=lambda k: sum(avg_views_by_length[k]) / len(avg_views_by_length[k])
-            if avg_views_by_length[k] else 0
+        best_length_bucket, sample_count = self._best_bucket(
+            (title_lengths // 10) * 10,  # Group by 10 characters
+            views,
         )
         
-        if len(avg_views_by_length.get(best_length_bucket, [])) >= 5:
+        if sample_count >= 5:
             patterns.append({
                 "type": "title_length",
                 "category": "title_optimization",
                 "condition": {"field": "title_length", "operator": "gte", "value": best_length_bucket},
                 "recommendation": f"ใช้ title ความยาว {best_length_bucket}-{best_length_bucket + 10} ตัวอักษร",
                 "confidence": 0.6,
-                "sample_count": len(avg_views_by_length[best_length_bucket]),
+                "sample_count": sample_count,
             })
         
         # Pattern 2: Publishing time
-        hour_performance = {}
-        for video in videos:
-            if video.published_at:
-                hour = video.published_at.hour
-                if hour not in hour_performance:
-                    hour_performance[hour] = []
-                hour_performance[hour].append(video.view_count)
-        
-        if hour_performance:
-            best_hour = max(
-                hour_performance.keys(),
-                key=lambda h: sum(hour_performance[h]) / len(hour_performance[h])
-                if hour_performance[h] else 0
-            )
+        has_hour = hours >= 0
+        if has_hour.any():
+            best_hour, sample_count = self._best_bucket(hours[has_hour], views[has_hour])
             
-            if len(hour_performance.get(best_hour, [])) >= 3:
+            if sample_count >= 3:
                 patterns.append({
                     "type": "posting_time",
                     "category": "posting_time",
                     "condition": {"field": "publish_hour", "operator": "eq", "value": best_hour},
                     "recommendation": f"โพสต์วิดีโอเวลา {best_hour}:00 น.",
                     "confidence": 0.5,
-                    "sample_count": len(hour_performance[best_hour]),
+                    "sample_count": sample_count,
                 })
         
         # Pattern 3: Video duration
-        duration_performance = {}
-        for video in videos:
-            if video.duration_seconds:
-                # Group by 5-minute buckets
-                bucket = (video.duration_seconds // 300) * 5
-                if bucket not in duration_performance:
-                    duration_performance[bucket] = []
-                duration_performance[bucket].append(video.view_count)
-        
-        if duration_performance:
-            best_duration = max(
-                duration_performance.keys(),
-                key=lambda d: sum(duration_performance[d]) / len(duration_performance[d])
-                if duration_performance[d] else 0
+        has_duration = durations > 0
+        if has_duration.any():
+            best_duration, sample_count = self._best_bucket(
+                (durations[has_duration] // 300) * 5,  # Group by 5-minute buckets
+                views[has_duration],
             )
             
-            if len(duration_performance.get(best_duration, [])) >= 3:
+            if sample_count >= 3:
                 patterns.append({
                     "type": "content_length",
                     "category": "content_length",
                     "condition": {"field": "duration_minutes", "operator": "gte", "value": best_duration},
                     "recommendation": f"สร้างวิดีโอความยาว {best_duration}-{best_duration + 5} นาที",
                     "confidence": 0.55,
-                    "sample_count": len(duration_performance[best_duration]),
+                    "sample_count": sample_count,
                 })
         
         return patterns
     
+    @staticmethod
+    def _best_bucket(buckets: np.ndarray, views: np.ndarray) -> Tuple[int, int]:
+        """
+        หา bucket ที่ค่าเฉลี่ย views สูงสุด (ค่าเท่ากัน -> bucket ที่พบก่อนในรายการ)
+        
+        Returns:
+            (bucket, จำนวนวิดีโอใน bucket นั้น)
+        """
+        keys, first_seen, inverse, counts = np.unique(
+            buckets, return_index=True, return_inverse=True, return_counts=True
+        )
+        means = np.bincount(inverse, weights=views) / counts
+        candidates = np.flatnonzero(means == means.max())
+        best = candidates[np.argmin(first_seen[candidates])]
+        return int(keys[best]), int(counts[best])
+    
     def _create_rule_from_pattern(
         self,
         pattern: Dict[str, Any],
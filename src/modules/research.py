@@ -3,6 +3,7 @@ Research Module - จัดการการวิจัยและติด
 รองรับการเก็บข้อมูลจากหลายแหล่ง
 """
 
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
@@ -287,18 +288,16 @@ class ResearchModule:
             analysis["avg_trend_score"] = sum(i.trend_score for i in competitor_items) / len(competitor_items)
             
             # รวบรวม keywords
+            keyword_counts = Counter()
             for item in competitor_items:
                 keywords = item.keywords.get("keywords", []) if item.keywords else []
-                for kw in keywords:
-                    analysis["top_keywords"][kw] = analysis["top_keywords"].get(kw, 0) + 1
+                keyword_counts.update(keywords)
                 
                 if item.category:
                     analysis["categories"][item.category] = analysis["categories"].get(item.category, 0) + 1
             
-            # Sort keywords by frequency
-            analysis["top_keywords"] = dict(
-                sorted(analysis["top_keywords"].items(), key=lambda x: x[1], reverse=True)[:20]
-            )
+            # Top 20 keywords by frequency (heap - ไม่ต้องเรียงทุก keyword)
+            analysis["top_keywords"] = dict(keyword_counts.most_common(20))
         
         self.task_logger.complete("วิเคราะห์การแข่งขันเสร็จสิ้น")
         
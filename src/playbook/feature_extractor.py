@@ -65,6 +65,12 @@ ANIME_KEYWORDS = [
     "ตัวละคร", "character", "theory", "ทฤษฎี", "พากย์",
 ]
 
+# Features ที่เป็นข้อความและมีค่าไม่กี่แบบ - เก็บใน DataFrame เป็น categorical (ไม่ต้องเก็บ str ทุกแถว)
+CATEGORICAL_FEATURES = ["publish_time_period", "duration_bucket", "format_type", "performance_tier"]
+
+# ลำดับ tier ของ label_performance
+PERFORMANCE_TIERS = ["low", "medium", "high", "viral", "unknown"]
+
 # Brackets patterns
 BRACKET_PATTERNS = [
     (r'\[.*?\]', 'square_bracket'),
@@ -596,7 +602,7 @@ class FeatureExtractor:
             features = self.extract(video, metrics)
             features_list.append(features.to_dict())
         
-        return pd.DataFrame(features_list)
+        return to_categorical(pd.DataFrame(features_list))
     
     def label_performance(
         self,
@@ -624,20 +630,16 @@ class FeatureExtractor:
         # Calculate percentiles
         p25, p75, p95 = np.percentile(df[metric].dropna(), percentiles)
         
-        # Assign tiers
-        def assign_tier(value):
-            if pd.isna(value):
-                return 'unknown'
-            if value >= p95:
-                return 'viral'
-            elif value >= p75:
-                return 'high'
-            elif value >= p25:
-                return 'medium'
-            else:
-                return 'low'
-        
-        df['performance_tier'] = df[metric].apply(assign_tier)
+        # Assign tiers (ทั้ง column ในครั้งเดียว - เงื่อนไขแรกที่ตรงชนะ)
+        values = df[metric]
+        tiers = np.select(
+            [values.isna(), values >= p95, values >= p75, values >= p25],
+            ['unknown', 'viral', 'high', 'medium'],
+            default='low',
+        )
+        
+        df['performance_tier'] = pd.Categorical(tiers, categories=PERFORMANCE_TIERS)
+        df = to_categorical(df)
         df['is_high_performer'] = df['performance_tier'].isin(['high', 'viral'])
         
         console.print(f"[green]✅ ติด label สำเร็จ (metric: {metric})[/green]")
@@ -652,3 +654,11 @@ class FeatureExtractor:
         """คืนค่ารายชื่อ features ทั้งหมด"""
         sample = VideoFeatures()
         return list(sample.to_feature_vector().keys())
+
+
+def to_categorical(df: pd.DataFrame) -> pd.DataFrame:
+    """แปลง CATEGORICAL_FEATURES ที่มีใน DataFrame เป็น category dtype (แก้ df ที่ส่งมา)"""
+    for column in CATEGORICAL_FEATURES:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
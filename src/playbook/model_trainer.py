@@ -13,6 +13,7 @@ Output:
 - Decision rules (for tree models)
 """
 
+import heapq
 import json
 import pickle
 from datetime import datetime
@@ -398,12 +399,12 @@ class PlaybookModelTrainer:
     def get_top_positive_features(self, n: int = 5) -> List[Tuple[str, float]]:
         """คืนค่า top positive features"""
         positive = [(k, v) for k, v in self.feature_importance.items() if v > 0]
-        return sorted(positive, key=lambda x: x[1], reverse=True)[:n]
+        return heapq.nlargest(n, positive, key=lambda x: x[1])
     
     def get_top_negative_features(self, n: int = 5) -> List[Tuple[str, float]]:
         """คืนค่า top negative features"""
         negative = [(k, v) for k, v in self.feature_importance.items() if v < 0]
-        return sorted(negative, key=lambda x: x[1])[:n]
+        return heapq.nsmallest(n, negative, key=lambda x: x[1])
     
     def extract_tree_rules(self) -> str:
         """ดึง rules จาก Decision Tree"""
@@ -12,10 +12,10 @@ from threading import Lock
 
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-from sqlalchemy import text
+from sqlalchemy import select, text
 
 from src.db.connection import session_scope, get_engine
-from src.db.models import Video, DailyMetric, ResearchItem, PlaybookRule, RunLog
+from src.db.models import Video, DailyMetric, ResearchItem, PlaybookRule, RunLog, utcnow
 from src.db.repository import (
     VideoRepository,
     DailyMetricRepository,
@@ -103,12 +103,14 @@ def _upsert_video(session: Session, video_data: Dict[str, Any]) -> str:
     youtube_id = video_data.get("youtube_id")
     
     # ตรวจสอบว่ามีอยู่แล้วหรือไม่
-    existing = session.query(Video).filter(Video.youtube_id == youtube_id).first()
+    existing = session.scalar(Video._select_by_youtube_id, {"youtube_id": youtube_id})
     
     if existing:
         # Update existing
         existing.title = video_data.get("title", existing.title)
-        existing.description = video_data.get("description", existing.description)
+        if "description" in video_data:
+            # description เป็น deferred column - ไม่โหลดค่าเดิมถ้าไม่มีค่าใหม่
+            existing.description = video_data["description"]
         existing.thumbnail_url = video_data.get("thumbnail_url", existing.thumbnail_url)
         existing.tags = video_data.get("tags", existing.tags)
         existing.duration_seconds = video_data.get("duration_seconds", existing.duration_seconds)
@@ -116,7 +118,6 @@ def _upsert_video(session: Session, video_data: Dict[str, Any]) -> str:
         existing.like_count = video_data.get("like_count", existing.like_count)
         existing.comment_count = video_data.get("comment_count", existing.comment_count)
         existing.published_at = video_data.get("published_at", existing.published_at)
-        existing.updated_at = datetime.now()
         return "updated"
     else:
         # Insert new
@@ -139,6 +140,66 @@ def _upsert_video(session: Session, video_data: Dict[str, Any]) -> str:
         return "inserted"
 
 
+# คอลัมน์ที่อัพเดทเมื่อ youtube_id ซ้ำ (เหมือน _upsert_video - ไม่แตะ channel/category)
+_VIDEO_UPSERT_COLUMNS = (
+    "title", "description", "thumbnail_url", "tags", "duration_seconds",
+    "view_count", "like_count", "comment_count", "published_at",
+)
+
+
+def _upsert_videos(session: Session, videos: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    UPSERT หลายวิดีโอด้วย INSERT ... ON CONFLICT (youtube_id) DO UPDATE statement เดียว
+    แทน SELECT + INSERT/UPDATE ทีละรายการ
+    
+    Args:
+        session: SQLAlchemy session
+        videos: list ของ dict ข้อมูลวิดีโอ (youtube_id ไม่ซ้ำกัน)
+        
+    Returns:
+        {"inserted": ..., "updated": ...}
+    """
+    if not videos:
+        return {"inserted": 0, "updated": 0}
+    
+    # นับ inserted/updated จาก youtube_id ที่มีอยู่ก่อน upsert
+    existing = set(session.scalars(
+        select(Video.youtube_id).where(Video.youtube_id.in_([v["youtube_id"] for v in videos]))
+    ))
+    
+    rows = [
+        {
+            "youtube_id": v["youtube_id"],
+            "title": v.get("title", ""),
+            "description": v.get("description", ""),
+            "channel_id": v.get("channel_id", ""),
+            "channel_name": v.get("channel_name", ""),
+            "published_at": v.get("published_at"),
+            "duration_seconds": v.get("duration_seconds", 0),
+            "tags": v.get("tags", {}),
+            "category": v.get("category"),
+            "thumbnail_url": v.get("thumbnail_url"),
+            "view_count": v.get("view_count", 0),
+            "like_count": v.get("like_count", 0),
+            "comment_count": v.get("comment_count", 0),
+        }
+        for v in videos
+    ]
+    
+    stmt = sqlite_insert(Video)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Video.youtube_id],
+        set_={
+            **{name: stmt.excluded[name] for name in _VIDEO_UPSERT_COLUMNS},
+            # ON CONFLICT DO UPDATE ไม่ใช้ onupdate ของ column - ตั้งเอง
+            "updated_at": utcnow(),
+        },
+    )
+    session.execute(stmt, rows)
+    
+    return {"inserted": len(videos) - len(existing), "updated": len(existing)}
+
+
 def sync_youtube_videos(
     progress_callback: Optional[Callable[[str, float], None]] = None
 ) -> TaskResult:
@@ -235,8 +296,19 @@ def sync_youtube_videos(
                 if progress_callback:
                     progress_callback(f"กำลังบันทึก {result.unique_after_dedupe} รายการลงฐานข้อมูล...", 0.7)
                 
-                # UPSERT ทีละรายการ
-                for i, video_data in enumerate(videos_unique):
+                # UPSERT ทั้งหมดใน statement เดียว - ถ้าล้มเหลวค่อยถอยไปทำทีละรายการ
+                # เพื่อข้ามเฉพาะ record ที่มีปัญหา
+                try:
+                    with session.begin_nested():
+                        counts = _upsert_videos(session, videos_unique)
+                    result.inserted_new += counts["inserted"]
+                    result.updated_existing += counts["updated"]
+                    videos_pending = []
+                except Exception as e:
+                    logger.warning(f"Batch upsert ล้มเหลว บันทึกทีละรายการแทน: {e}")
+                    videos_pending = videos_unique
+                
+                for i, video_data in enumerate(videos_pending):
                     try:
                         action = _upsert_video(session, video_data)
                         if action == "inserted":
@@ -248,8 +320,14 @@ def sync_youtube_videos(
                         logger.warning(f"ไม่สามารถบันทึกวิดีโอ {video_data.get('youtube_id')}: {e}")
                     
                     if progress_callback and i % 10 == 0:
-                        progress = 0.7 + (0.25 * i / len(videos_unique))
-                        progress_callback(f"บันทึกแล้ว {i+1}/{len(videos_unique)} รายการ", progress)
+                        progress = 0.7 + (0.25 * i / len(videos_pending))
+                        progress_callback(f"บันทึกแล้ว {i+1}/{len(videos_pending)} รายการ", progress)
+                
+                # อัพเดท video_tags ของทุกวิดีโอในครั้งเดียว
+                VideoRepository(session).sync_tags({
+                    v["youtube_id"]: (v.get("tags") or {}).get("tags", [])
+                    for v in videos_unique
+                })
                 
                 session.commit()
                 
@@ -422,28 +500,24 @@ def fetch_anime_research(
                     from src.anime.anilist import AniListClient
                     anilist = AniListClient()
                     
-                    # ดึง trending anime
-                    trending = anilist.fetch_trending(limit=50)
-                    for item in trending:
-                        # ตรวจสอบว่ามีอยู่แล้วหรือไม่
-                        existing = research_repo.get_by_anilist_id(item.get("anilist_id"))
-                        if not existing:
-                            research_repo.create(**item)
-                            result.inserted_new += 1
-                        else:
-                            result.updated_existing += 1
-                        total_items += 1
-                    
-                    # ดึง seasonal anime
-                    seasonal = anilist.fetch_seasonal(limit=50)
-                    for item in seasonal:
-                        existing = research_repo.get_by_anilist_id(item.get("anilist_id"))
-                        if not existing:
-                            research_repo.create(**item)
-                            result.inserted_new += 1
-                        else:
-                            result.updated_existing += 1
-                        total_items += 1
+                    # ดึง trending แล้ว seasonal anime
+                    for fetch_anime in (anilist.fetch_trending, anilist.fetch_seasonal):
+                        anime_items = fetch_anime(limit=50)
+                        
+                        # ตรวจสอบว่ามีอยู่แล้วหรือไม่ - query เดียว แล้ว insert รายการใหม่ในครั้งเดียว
+                        seen_ids = research_repo.get_existing_anilist_ids(
+                            item.get("anilist_id") for item in anime_items
+                        )
+                        new_rows = []
+                        for item in anime_items:
+                            if item.get("anilist_id") not in seen_ids:
+                                seen_ids.add(item.get("anilist_id"))
+                                new_rows.append(item)
+                                result.inserted_new += 1
+                            else:
+                                result.updated_existing += 1
+                            total_items += 1
+                        research_repo.bulk_create(new_rows)
                     
                 except Exception as e:
                     logger.warning(f"ไม่สามารถดึงข้อมูลจาก AniList: {e}")
@@ -457,15 +531,20 @@ def fetch_anime_research(
                     from src.anime.rss_parser import fetch_all_sources
                     rss_items = fetch_all_sources()
                     
+                    # ตรวจสอบว่ามีอยู่แล้วหรือไม่ (ด้วย source_url) - query เดียว
+                    seen_urls = research_repo.get_existing_source_urls(
+                        item.get("source_url") for item in rss_items
+                    )
+                    new_rows = []
                     for item in rss_items:
-                        # ตรวจสอบว่ามีอยู่แล้วหรือไม่ (ด้วย source_url)
-                        existing = research_repo.get_by_source_url(item.get("source_url"))
-                        if not existing:
-                            research_repo.create(**item)
+                        if item.get("source_url") not in seen_urls:
+                            seen_urls.add(item.get("source_url"))
+                            new_rows.append(item)
                             result.inserted_new += 1
                         else:
                             result.updated_existing += 1
                         total_items += 1
+                    research_repo.bulk_create(new_rows)
                     
                 except Exception as e:
                     logger.warning(f"ไม่สามารถดึงข้อมูลจาก RSS: {e}")
@@ -618,16 +697,17 @@ def train_playbook(
                     
                     rule_repo = PlaybookRuleRepository(session)
                     
-                    for rule in train_result.get("rules", []):
-                        rule_repo.create(
-                            rule_name=rule.get("name", "Auto-generated rule"),
-                            category="auto",
-                            condition_json=rule.get("condition", {}),
-                            action_json=rule.get("action", {}),
-                            confidence_score=rule.get("confidence", 0.5),
-                            is_auto_generated=True,
-                        )
-                        rules_created += 1
+                    with rule_repo.batch():
+                        for rule in train_result.get("rules", []):
+                            rule_repo.create(
+                                rule_name=rule.get("name", "Auto-generated rule"),
+                                category="auto",
+                                condition_json=rule.get("condition", {}),
+                                action_json=rule.get("action", {}),
+                                confidence_score=rule.get("confidence", 0.5),
+                                is_auto_generated=True,
+                            )
+                            rules_created += 1
                     
                     session.commit()
                 
@@ -490,13 +490,18 @@ class YouTubeClient:
         result = FetchResult(success=True)
         
         video_repo = VideoRepository(session)
+        new_tags = {}
         
         try:
-            for video_data in self.fetch_all_videos(max_results=max_results):
-                result.videos_fetched += 1
-                
+            videos_data = list(self.fetch_all_videos(max_results=max_results))
+            result.videos_fetched = len(videos_data)
+            
+            # ดึงวิดีโอที่มีอยู่แล้วทั้งหมดใน query เดียว
+            existing_videos = video_repo.get_by_youtube_ids(v.youtube_id for v in videos_data)
+            
+            for video_data in videos_data:
                 # ตรวจสอบว่ามีอยู่แล้วหรือไม่
-                existing = video_repo.get_by_youtube_id(video_data.youtube_id)
+                existing = existing_videos.get(video_data.youtube_id)
                 
                 if existing:
                     # อัพเดทข้อมูล
@@ -506,7 +511,6 @@ class YouTubeClient:
                     existing.like_count = video_data.like_count
                     existing.comment_count = video_data.comment_count
                     existing.thumbnail_url = video_data.thumbnail_url
-                    existing.updated_at = datetime.now()
                     result.videos_updated += 1
                 else:
                     # สร้างใหม่
@@ -526,8 +530,11 @@ class YouTubeClient:
                         comment_count=video_data.comment_count,
                     )
                     session.add(video)
+                    existing_videos[video_data.youtube_id] = video
+                    new_tags[video_data.youtube_id] = video_data.tags
                     result.videos_created += 1
             
+            video_repo.sync_tags(new_tags)
             session.commit()
             result.duration_seconds = time.time() - start_time
             
@@ -586,6 +593,7 @@ class YouTubeClient:
             videos = video_repo.get_all(limit=10000)
             task_logger.step(f"พบวิดีโอในฐานข้อมูล {len(videos)} รายการ")
             
+            new_metrics = []
             for video in videos:
                 # ถ้า incremental ให้ดึงตั้งแต่วันที่ล่าสุด
                 video_start_date = start_date
@@ -625,26 +633,27 @@ class YouTubeClient:
                     )
                     
                     if not existing:
-                        metric = DailyMetric(
-                            video_id=video.id,
-                            date=metric_data.date,
-                            views=metric_data.views,
-                            watch_time_minutes=metric_data.estimated_minutes_watched,
-                            average_view_duration=metric_data.average_view_duration,
-                            average_view_percentage=metric_data.average_view_percentage,
-                            likes=metric_data.likes,
-                            comments=metric_data.comments,
-                            shares=metric_data.shares,
-                            subscribers_gained=metric_data.subscribers_gained,
-                            impressions=metric_data.impressions,
-                            impressions_ctr=metric_data.impressions_ctr,
-                        )
-                        session.add(metric)
+                        new_metrics.append({
+                            "video_id": video.id,
+                            "date": metric_data.date,
+                            "views": metric_data.views,
+                            "watch_time_minutes": metric_data.estimated_minutes_watched,
+                            "average_view_duration": metric_data.average_view_duration,
+                            "average_view_percentage": metric_data.average_view_percentage,
+                            "likes": metric_data.likes,
+                            "comments": metric_data.comments,
+                            "shares": metric_data.shares,
+                            "subscribers_gained": metric_data.subscribers_gained,
+                            "impressions": metric_data.impressions,
+                            "impressions_ctr": metric_data.impressions_ctr,
+                        })
                         result.metrics_created += 1
                 
                 # Rate limiting
                 time.sleep(self.rate_limit_delay)
             
+            # insert metrics ใหม่ทั้งหมดใน statement เดียว
+            DailyMetric.bulk_insert(session, new_metrics)
             session.commit()
             result.duration_seconds = time.time() - start_time
             